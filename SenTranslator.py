@@ -21,26 +21,131 @@ License: MIT License
 Version: 1.0.0
 """
 
-import RPi.GPIO as GPIO
 import time
 import os
 import re
-from gpiozero import Button
+import sys
+import json
+import bisect
+import queue
+import random
+import asyncio
+import argparse
+import io
+import mmap
+import wave
+import array
+import struct
+import codecs
+import zipfile
+import posixpath
+import hashlib
+import tempfile
+import urllib.parse
+import xml.etree.ElementTree as ElementTree
+import threading
+import shutil
+import functools
+import itertools
+import statistics
+import warnings
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html.parser import HTMLParser
 from pypinyin import pinyin, Style
-from aip import AipSpeech
-import requests
-from bs4 import BeautifulSoup
-import pytesseract
-from PIL import Image
 import subprocess
 
+# Hardware, cloud and input libraries are optional so that the translator can
+# also run headless (e.g. command-line batch conversion on a server)
+try:
+    import RPi.GPIO as GPIO
+    from gpiozero import Button
+except ImportError:
+    GPIO = None
+    Button = None
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+try:
+    from PIL import Image, ImageChops, ImageFilter, ImageOps, ImageSequence
+except ImportError:
+    Image = ImageChops = ImageFilter = ImageOps = ImageSequence = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+# OCR runs in parallel as one worker process per core, each with a single
+# tesseract thread; extra OpenMP threads would only compete for the cores.
+# OpenMP reads the limit when the library is loaded, and forked workers
+# inherit it, so it is set before tesserocr is imported (an explicit
+# setting in the environment is kept)
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# Fast resampling and mixing; audioop is deprecated and gone from Python 3.13,
+# where the slower pure-Python loops are used instead
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        import audioop
+except ImportError:
+    audioop = None
+
 
 # Global variable for audio process control
 audio_process = None
 
+# Global variables for text-to-speech playback control
+tts_process = None      # Playback handle of the current utterance
+tts_thread = None       # Background thread synthesizing and playing it
+tts_generation = 0      # Incremented to cancel the current utterance
+tts_lock = threading.Lock()
+
+# Persistent audio output (started on first use) and the fixed audio,
+# decoded once in the background (result None if it cannot be decoded)
+audio_output = None
+audio_output_failed = False
+fixed_audio_decode = None
+
+# Pre-rendered voice prompt bundle (loaded on first prompt)
+prompt_bundle = None
+prompt_bundle_loaded = False
+prompt_thread = None    # Thread playing a prompt started without waiting
+
+# Per-character pronunciation bank (loaded on first frame) and the clip of
+# the frame being spoken
+pronunciation_bank = None
+pronunciation_bank_loaded = False
+frame_speech_clip = None
+
 # Initialize GPIO settings
-GPIO.setmode(GPIO.BCM)
-GPIO.setwarnings(False)
+if GPIO is not None:
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setwarnings(False)
 
 # Hardware Configuration - Two groups of servo motors
 SERVO_PINS_GROUP1 = [17, 22, 24, 12, 6, 25]  # First group (left Braille cell)
@@ -59,9 +164,203 @@ BAIDU_APP_ID = 'YOUR_APP_ID'
 BAIDU_API_KEY = 'YOUR_API_KEY'
 BAIDU_SECRET_KEY = 'YOUR_SECRET_KEY'
 
+# Baidu Speech REST endpoints used by the long-lived TTS client
+BAIDU_TOKEN_URL = 'https://aip.baidubce.com/oauth/2.0/token'
+BAIDU_TTS_URL = 'https://tsn.baidu.com/text2audio'
+TTS_TIMEOUT = (5, 30)          # Connect and read timeouts in seconds
+TTS_TOKEN_REFRESH_MARGIN = 60  # Refresh the access token this many seconds before it expires
+
+# Baidu TTS voice options: volume, speed, pitch, speaker (0-15 / 0-9) and
+# audio format (6 = 16 kHz WAV, which the audio output plays without a decoder)
+TTS_OPTIONS = {'vol': 5, 'spd': 5, 'pit': 5, 'per': 4, 'aue': 6}
+
+# TTS Request Limits
+# Identical requests already in flight are shared, transient Baidu errors are
+# retried with jittered exponential backoff and cloud requests are rate limited
+TTS_RATE_LIMIT = 5.0       # Cloud requests per second
+TTS_RATE_BURST = 5         # Requests allowed back to back before limiting starts
+TTS_RETRY_ATTEMPTS = 3     # Attempts per request, including the first
+TTS_RETRY_BACKOFF = 0.25   # Seconds; retry n waits a random time up to BACKOFF * 2**n
+TTS_TRANSIENT_ERRORS = {'network', 2, 18, 503, 429}  # Baidu err_no / HTTP status worth retrying
+
+# TTS Backend Selection
+# 'cloud' uses Baidu only, 'local' uses espeak-ng only. 'fallback' starts the
+# local engine when Baidu fails or has not answered within the latency
+# threshold; 'race' always runs both and uses whichever finishes first.
+# 'fallback' races straight away while Baidu's recent latency is over the threshold.
+TTS_BACKEND_POLICY = 'fallback'
+TTS_CLOUD_LATENCY_THRESHOLD = 1.5  # Seconds
+TTS_LOCAL_COMMANDS = [             # First installed engine is used
+    ['espeak-ng', '-v', 'cmn', '--stdout'],
+    ['espeak', '-v', 'zh', '--stdout']
+]
+TTS_CLOUD_WORKERS = 4              # Concurrent cloud requests
+TTS_LOCAL_WORKERS = 2              # Concurrent local syntheses (separate threads, so a hung cloud cannot delay them)
+
+# Long texts are spoken sentence by sentence: the next sentence is synthesized
+# while the current one plays. Baidu accepts at most 1024 GBK bytes per request.
+TTS_MAX_CHUNK_CHARS = 120
+
+# TTS Audio Cache Configuration
+# Synthesized speech is kept on disk so repeated prompts play instantly and offline
+TTS_CACHE_DIR = os.path.expanduser("~/.cache/sentranslator/tts")
+TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Least recently used clips are evicted above this
+
+# Web Page Cache Configuration
+# Text extracted from a page is kept with the page's ETag/Last-Modified
+# validators; revisits send a conditional GET and a 304 reuses the text
+WEB_CACHE_DIR = os.path.expanduser("~/.cache/sentranslator/web")
+WEB_CACHE_MAX_BYTES = 10 * 1024 * 1024  # Least recently used pages are evicted above this
+WEB_EXTRACTOR_VERSION = 2               # Bump when extraction changes, so cached text is extracted again
+WEB_TIMEOUT = (5, 10)                   # Connect and read timeouts in seconds
+WEB_USER_AGENT = 'Mozilla/5.0 (compatible; SenTranslator/1.0)'
+WEB_TEXT_LIMIT = None                   # Characters of page text to extract (None: whole article)
+WEB_CHUNK_BYTES = 16 * 1024             # Download and parse pages in chunks of this size
+WEB_MAX_DOWNLOAD_BYTES = 8 * 1024 * 1024  # Stop reading a page after this many bytes
+
+# Reading List Configuration
+# Several URLs, or the entries of an RSS/Atom feed, are fetched concurrently
+# and handed to translation in the order they finish
+FETCH_CONCURRENCY = 8      # Pages fetched at once
+FETCH_PER_HOST = 4         # Pages fetched at once from any one host
+FETCH_TIMEOUT = 20.0       # Seconds allowed per page, including extraction
+FEED_MAX_ENTRIES = 50      # Feed entries fetched per feed
+
+# Document Paging Configuration
+# Texts of any length (whole books) are read page by page: a page is only
+# translated when the reader reaches it, with the next page(s) translated
+# in the background, so memory use and time to the first frame stay constant
+DOCUMENT_PAGE_CHARS = 2000     # Source characters per page (pages end at a sentence break if possible)
+DOCUMENT_PREFETCH_PAGES = 1    # Pages translated ahead of the reader
+
+# Bookmark Configuration
+# The reading position in each document is saved under a hash of its
+# content, with a sparse index of page starts and translator state, so
+# reading resumes there without re-reading the document from the start
+BOOKMARKS_PATH = os.path.expanduser("~/.local/share/sentranslator/bookmarks.json")
+BOOKMARK_CHECKPOINT_PAGES = 16   # Page starts kept in a bookmark: every Nth page, plus the current one
+BOOKMARK_MAX_DOCUMENTS = 500     # Oldest bookmarks are dropped beyond this
+BOOKMARK_IDENTITY_BYTES = 65536  # Bytes hashed from each end of a file to identify it
+
+# OCR Configuration
+# Camera images are cleaned up before recognition: tesseract is much faster
+# (and usually more accurate) on a small, straight, black-on-white crop of
+# the text than on a full-resolution photo. Steps run in the order listed;
+# remove a step to skip it.
+OCR_LANGUAGES = 'chi_sim+eng'
+OCR_PREPROCESS_STEPS = ('grayscale', 'downscale', 'deskew', 'binarize', 'crop')
+OCR_TARGET_DPI = 300              # Downscale images that record a higher DPI
+OCR_TARGET_TEXT_HEIGHT = 24       # Otherwise downscale until the core of a text line (about the x-height) is this tall
+OCR_BINARIZE_WINDOW = 25          # Neighbourhood compared against in adaptive thresholding (pixels)
+OCR_BINARIZE_OFFSET = 12          # How much darker than its neighbourhood a pixel must be to count as ink
+OCR_DESKEW_MAX_ANGLE = 6.0        # Largest skew corrected (degrees)
+OCR_DESKEW_STEP = 0.5             # Skew angles tried (degrees)
+OCR_CROP_MARGIN = 16              # Margin kept around the text when cropping (pixels)
+OCR_ANALYSIS_SIZE = 1000          # Longest side of the thumbnail used to measure text and skew
+# With tesserocr installed the models are loaded once and kept in memory;
+# otherwise pytesseract runs the tesseract binary (reloading them) per image
+OCR_ENGINE_BACKEND = 'auto'       # 'auto' (tesserocr if installed), 'tesserocr' or 'pytesseract'
+OCR_TESSDATA_PATH = None          # Directory holding the .traineddata models (None: tesseract's default)
+# Multi-page scans are recognized a page per worker process, and large
+# pages are split between the workers at the gaps between columns and
+# text lines. Each worker keeps its own copy of the models in memory.
+OCR_WORKERS = os.cpu_count() or 1 # OCR worker processes (1: recognize in this process)
+OCR_REGION_MIN_LINES = 12         # Fewest text lines given to a worker (smaller pages are not split)
+OCR_SCAN_DPI = 300                # Resolution PDF scans are rendered at by pdftoppm
+OCR_PAGES_AHEAD = 2               # Pages loaded ahead per worker (the rest of a scan is read as workers finish)
+
+# Text File Configuration
+# Files are memory-mapped and decoded on demand; the encoding (UTF-8,
+# UTF-16, GB18030/GBK) is detected from a sample at the start of the file
+FILE_ENCODING_SAMPLE_BYTES = 16384  # Bytes examined to detect the encoding
+FILE_RESYNC_BYTES = 4096            # How far back to search for a GB18030 character boundary
+
+# Main Content Extraction Configuration
+# Paragraphs are scored readability-style (length, punctuation, link density,
+# class/id hints) and the text of the best-scoring container is read, so the
+# reader gets the article body rather than menus, footers and ads
+WEB_PARSER_BACKEND = 'auto'      # 'auto' (fastest installed), 'lxml', 'selectolax' (non-streaming) or 'html.parser'
+WEB_CONTENT_SCAN_CHARS = 20000   # With a text limit, stop downloading after this much paragraph text
+WEB_BUFFERED_PARSE_BYTES = 1024 * 1024  # With a text limit, bytes selectolax (which cannot stream) buffers
+CONTENT_MIN_PARAGRAPH_CHARS = 10 # Shorter paragraphs do not vote for a container
+CONTENT_MAX_LINK_DENSITY = 0.5   # Paragraphs that are mostly links are left out
+CONTENT_PUNCTUATION = "，。、；！？,;"
+CONTENT_SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'head', 'svg',
+                        'iframe', 'button', 'select', 'textarea'}
+CONTENT_BLOCK_TAGS = {'html', 'body', 'div', 'p', 'article', 'section', 'main', 'header',
+                      'footer', 'nav', 'aside', 'form', 'table', 'tr', 'td', 'th', 'ul',
+                      'ol', 'li', 'dl', 'dt', 'dd', 'pre', 'blockquote', 'figure',
+                      'figcaption', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+CONTENT_TAG_WEIGHTS = {'article': 25, 'main': 25, 'pre': 3, 'td': 3, 'blockquote': 3,
+                       'header': -25, 'form': -25, 'nav': -50, 'footer': -50, 'aside': -50}
+CONTENT_POSITIVE_NAMES = re.compile(
+    r'^(article\w*|content\w*|main|post\w*|text|body|entry\w*|story|detail\w*|news\w*|blog\w*)$')
+CONTENT_NEGATIVE_NAMES = re.compile(
+    r'^(ad|ads|advert\w*|banner\w*|breadcrumbs?|comments?|copyright|foot\w*|login|menu\w*|'
+    r'nav\w*|popup|promo\w*|related|recommend\w*|share\w*|sidebar|side|social|sponsor\w*|'
+    r'widget\w*|hot|rank\w*|header|masthead|tags?)$')
+
+# Voice Prompt Bundle Configuration
+# Every fixed voice prompt is rendered into one packed audio file at install
+# time (python3 SenTranslator.py --build-prompt-bundle) and played from there
+PROMPT_BUNDLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "voice_prompts.bundle")
+PROMPT_BUNDLE_MAGIC = b"STPB1\n"
+
+# Pronunciation Bank Configuration
+# Every character the translator handles (CJK U+4E00-U+9FA5, letters and
+# digits) is pre-rendered to a short PCM clip at install time
+# (python3 SenTranslator.py --build-pronunciation-bank) so it can be spoken
+# as its frame is displayed. Characters with the same pinyin share one clip.
+PRONUNCIATION_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pronunciation.bank")
+PRONUNCIATION_BANK_MAGIC = b"STPC1\n"
+PRONUNCIATION_CJK_FIRST = 0x4E00
+PRONUNCIATION_CJK_LAST = 0x9FA5
+PRONUNCIATION_ASCII = "0123456789abcdefghijklmnopqrstuvwxyz"  # Upper case uses the lower-case clip
+PRONUNCIATION_SILENCE_LEVEL = 300  # Leading/trailing samples below this are trimmed
+FRAME_SPEECH_ENABLED = True        # Speak each frame's characters as it is displayed
+
+# Fixed voice prompts spoken by the device
+VOICE_PROMPTS = {
+    'welcome': "Welcome to SenTranslator. Please select input method. Button 1 for keyboard input, Button 2 for web extraction, Button 3 for image recognition",
+    'selected_keyboard': "You selected keyboard input",
+    'selected_web': "You selected web extraction",
+    'selected_ocr': "You selected image recognition",
+    'enter_text': "Please enter text in the terminal",
+    'enter_url': "Please enter webpage URL in the terminal",
+    'enter_image': "Please enter image path in the terminal",
+    'conversion_successful': "Conversion successful. The first Braille group is now raised. Press button 1 for the next group, hold button 1 for auto advance, button 2 to play audio description, button 3 to read input text content",
+    'conversion_failed': "Conversion failed, please try again",
+    'auto_advance_on': "Auto advance on. Press button 1 to pause",
+    'auto_advance_off': "Auto advance off",
+    'beginning_of_text': "Beginning of text",
+    'end_of_text': "End of text",
+    'display_complete': "Display complete",
+    'bookmark_resumed': "Continuing from where you stopped reading. That Braille group is now raised. Press button 1 for the next group",
+    'continue': "Welcome to continue using SenTranslator",
+    'error': "An error occurred, please try again",
+    'goodbye': "Thank you for using SenTranslator. See you next time!",
+    'interrupted': "Program interrupted"
+}
+
 # Fixed audio file path (replace with your audio file)
 FIXED_AUDIO_PATH = "/home/pi/demo_audio.m4a"
 
+# Audio Output Configuration
+# All sound goes through one long-lived ALSA stream (aplay reading raw PCM)
+# instead of starting mplayer for every clip. Clips are mixed in-process;
+# while a higher-priority clip plays, lower-priority clips are ducked.
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_BLOCK_SAMPLES = 320       # 20 ms mixing blocks
+AUDIO_MAX_LEAD = 0.06           # Seconds of audio written ahead of real time
+AUDIO_OUTPUT_COMMAND = ['aplay', '-q', '-t', 'raw', '-f', 'S16_LE', '-c', '1',
+                        '-r', str(AUDIO_SAMPLE_RATE), '--buffer-time=100000', '-']
+AUDIO_DECODER_COMMAND = ['ffmpeg', '-v', 'quiet', '-i', 'pipe:0', '-f', 's16le',
+                         '-ac', '1', '-ar', str(AUDIO_SAMPLE_RATE), 'pipe:1']
+AUDIO_PRIORITY_MEDIA = 0        # Fixed audio description
+AUDIO_PRIORITY_SPEECH = 1       # Text-to-speech of the input text
+AUDIO_PRIORITY_PROMPT = 2       # Voice prompts
+AUDIO_DUCK_GAIN = 0.25          # Volume of clips under a higher-priority clip
+
 # Chinese Braille Initial Consonant Mapping
 # Each number represents a Braille dot position (1-6)
 initial_map = {
@@ -157,6 +456,11 @@ punctuation_map = {
     "、": {"dots": [3, 4]}          # Chinese comma
 }
 
+# Navigation boundary marks (punctuation_map marks plus their ASCII equivalents)
+# A sentence or clause starts at the first character after one of these marks
+SENTENCE_END_MARKS = {"。", "？", "！", ".", "?", "!"}
+CLAUSE_END_MARKS = SENTENCE_END_MARKS | {"，", "；", "：", "、", ",", ";", ":"}
+
 # Number system mapping
 number_prefix = {"dots": [3, 4, 5, 6]}  # Number indicator prefix
 number_map = {
@@ -229,6 +533,29 @@ SERVO_RESPONSE_TIME = {
     # Other GPIOs use default 0.5 seconds
 }
 
+# Button Gesture Configuration
+LONG_PRESS_TIME = 1.0  # Seconds a button must be held to count as a long press
+
+# Auto-advance Reading Configuration
+# In auto-advance mode frames are shown on a timer that adapts to the pace
+# of the reader's recent manual advances
+AUTO_ADVANCE_DEFAULT_INTERVAL = 3.0  # Seconds per frame before any manual advances
+AUTO_ADVANCE_MIN_INTERVAL = 0.8      # Fastest allowed pace
+AUTO_ADVANCE_MAX_INTERVAL = 10.0     # Slowest allowed pace
+AUTO_ADVANCE_HISTORY = 8             # Number of recent manual advances to learn from
+
+# Command-line Translation Configuration
+# BRF uses North American ASCII Braille, indexed by the same dot bit pattern
+# as Unicode Braille (dot 1 = bit 0 ... dot 6 = bit 5)
+BRF_CHARACTERS = " A1B'K2L@CIF/MSP\"E3H9O6R^DJG>NTQ,*5<-U8V.%[$+X!&;:4\\0Z7(_?W]#Y)="
+PROGRESS_REPORT_INTERVAL = 2.0  # Seconds between progress reports on stderr
+
+# Translation Service Configuration
+SERVICE_HOST = '127.0.0.1'               # Local only by default
+SERVICE_PORT = 8765
+SERVICE_WORKERS = os.cpu_count() or 1    # Translation worker processes
+SERVICE_MAX_REQUEST_BYTES = 1024 * 1024  # Largest accepted request body
+
 
 class LinearServo:
     """
@@ -443,220 +770,1862 @@ def reset_all_servos_batch(servos_group1, servos_group2):
     print("All servos reset")
 
 
-def text_to_speech(text):
+def decode_audio(data):
     """
-    Convert text to speech using Baidu TTS API
+    Decode audio to 16-bit mono PCM at AUDIO_SAMPLE_RATE
+    
+    WAV is decoded in-process; other formats (MP3, M4A, ...) need ffmpeg.
     
     Args:
-        text (str): Text to convert to speech
+        data (bytes): Encoded audio (bytes or memoryview)
+    
+    Returns:
+        array: Signed 16-bit samples, or None if the audio cannot be decoded
     """
-    try:
-        client = AipSpeech(BAIDU_APP_ID, BAIDU_API_KEY, BAIDU_SECRET_KEY)
-        result = client.synthesis(text, 'zh', 1, {
-            'vol': 5, 'spd': 5, 'pit': 5, 'per': 4
-        })
-
-        if not isinstance(result, dict):
-            with open('/tmp/tts_temp.wav', 'wb') as f:
-                f.write(result)
-            os.system('mplayer /tmp/tts_temp.wav >/dev/null 2>&1')
-            print("TTS playback completed")
+    samples = array.array('h')
+    
+    if bytes(data[:4]) == b'RIFF':
+        try:
+            with wave.open(io.BytesIO(data), 'rb') as wav:
+                channels = wav.getnchannels()
+                rate = wav.getframerate()
+                if wav.getsampwidth() != 2:
+                    return None
+                frames = wav.readframes(wav.getnframes())
+        except (wave.Error, EOFError):
+            return None
+        samples.frombytes(frames[:len(frames) - len(frames) % 2])
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        if channels == 2 and audioop is not None:
+            samples = array.array('h', audioop.tomono(samples.tobytes(), 2, 0.5, 0.5))
+        elif channels == 2:
+            samples = array.array('h', ((left + right) // 2 for left, right
+                                        in zip(samples[0::2], samples[1::2])))
+        if rate != AUDIO_SAMPLE_RATE:
+            samples = resample_audio(samples, rate, AUDIO_SAMPLE_RATE)
+        return samples
+    
+    if shutil.which(AUDIO_DECODER_COMMAND[0]) is None:
+        return None
+    result = subprocess.run(AUDIO_DECODER_COMMAND, input=data, capture_output=True, timeout=60)
+    if result.returncode != 0 or not result.stdout:
+        return None
+    samples.frombytes(result.stdout[:len(result.stdout) - len(result.stdout) % 2])
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return samples
+
+
+def resample_audio(samples, source_rate, target_rate):
+    """
+    Resample audio with linear interpolation (audioop.ratecv when available)
+    
+    Args:
+        samples (array): Signed 16-bit samples
+        source_rate (int): Sample rate of samples
+        target_rate (int): Wanted sample rate
+    
+    Returns:
+        array: Resampled signed 16-bit samples
+    """
+    if not samples:
+        return samples
+    if audioop is not None:
+        converted, _ = audioop.ratecv(samples.tobytes(), 2, 1, source_rate, target_rate, None)
+        return array.array('h', converted)
+    step = source_rate / target_rate
+    last = len(samples) - 1
+    result = array.array('h', bytes(2 * int(len(samples) / step)))
+    for i in range(len(result)):
+        position = i * step
+        index = int(position)
+        if index >= last:
+            result[i] = samples[last]
         else:
-            print("TTS error:", result)
-    except Exception as e:
-        print("TTS failed:", str(e))
+            fraction = position - index
+            result[i] = int(samples[index] + (samples[index + 1] - samples[index]) * fraction)
+    return result
 
 
-def play_fixed_audio():
+class AudioClip:
     """
-    Play fixed audio file (can be interrupted)
+    Handle of a clip playing on the persistent audio output
+    
+    Offers the same poll/wait/terminate calls as subprocess.Popen, so code
+    that managed an mplayer process can manage a clip the same way.
     """
-    global audio_process
     
-    if audio_process and audio_process.poll() is None:
-        # If already playing, stop it
-        audio_process.terminate()
-        audio_process = None
-        print("Audio stopped")
-        return
+    def __init__(self, samples, priority):
+        """
+        Initialize the clip
+        
+        Args:
+            samples (array): Signed 16-bit mono samples at AUDIO_SAMPLE_RATE
+                             (an array or a memoryview cast to 'h')
+            priority (int): AUDIO_PRIORITY_* value
+        """
+        self.samples = samples
+        self.priority = priority
+        self.position = 0
+        self.stopped = False
+        self.done = threading.Event()
+        self.requested_time = time.perf_counter()
+        self.start_latency = None  # Seconds from play request to first output block
     
-    if os.path.exists(FIXED_AUDIO_PATH):
-        try:
-            audio_process = subprocess.Popen(
-                ['mplayer', FIXED_AUDIO_PATH],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            print("Fixed audio playback started")
-        except Exception as e:
-            print(f"Failed to play fixed audio: {str(e)}")
-    else:
-        print(f"Error: Fixed audio file not found at {FIXED_AUDIO_PATH}")
+    def poll(self):
+        """Return None while playing, 0 when finished or -15 when stopped"""
+        if not self.done.is_set():
+            return None
+        return -15 if self.stopped else 0
+    
+    def wait(self, timeout=None):
+        """Wait for the clip to finish and return poll()"""
+        self.done.wait(timeout)
+        return self.poll()
+    
+    def terminate(self):
+        """Stop the clip"""
+        self.stopped = True
+        self.done.set()
 
 
-def split_pinyin(py):
+class AudioOutput:
     """
-    Split pinyin into initial consonant and final vowel with special rules
+    Persistent audio output with in-process mixing
     
-    Args:
-        py (str): Pinyin string
-    
-    Returns:
-        tuple: (initial, final) - Initial consonant and final vowel
+    One aplay process stays open for the lifetime of the program and a
+    mixer thread feeds it 20 ms blocks of PCM, so starting a clip costs no
+    process start-up. Writes are paced to stay at most AUDIO_MAX_LEAD ahead
+    of real time, so new clips are heard quickly.
     """
-    if not py:
-        return None, py
     
-    # Sort initials by length (longest first) to match correctly
-    initials_list = sorted(initial_map.keys(), key=lambda x: -len(x))
+    def __init__(self, command=AUDIO_OUTPUT_COMMAND):
+        """
+        Start the output stream and mixer thread
+        
+        Args:
+            command (list): Command line of the raw PCM player
+        """
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.clips = []
+        self.lock = threading.Lock()
+        self.running = True
+        self.start_latencies = deque(maxlen=200)
+        self.thread = threading.Thread(target=self.run_mixer, daemon=True)
+        self.thread.start()
     
-    # Match longest initial first (zh, ch, sh)
-    for ini in initials_list:
-        if py.startswith(ini):
-            initial = ini
-            final = py[len(ini):]
-            
-            # Apply special pronunciation rules
-            # 1. g/k/h change to j/q/x before i/u/ü
-            if initial == 'g' and final and final[0] in ['i', 'u', 'ü', 'v']:
-                initial = 'j'
-            elif initial == 'k' and final and final[0] in ['i', 'u', 'ü', 'v']:
-                initial = 'q'
-            elif initial == 'h' and final and final[0] in ['i', 'u', 'ü', 'v']:
-                initial = 'x'
-            
-            # 2. Standalone 'i' is omitted after z/c/s/zh/ch/sh/r
-            if initial in ['z', 'c', 's', 'zh', 'ch', 'sh', 'r']:
-                if final == 'i':
-                    final = ''  # Omit standalone i
-            
-            return initial, final
+    def play(self, samples, priority=AUDIO_PRIORITY_SPEECH):
+        """
+        Queue decoded samples for playback
+        
+        Args:
+            samples (array): Signed 16-bit mono samples at AUDIO_SAMPLE_RATE
+            priority (int): AUDIO_PRIORITY_* value
+        
+        Returns:
+            AudioClip: Handle of the playing clip
+        """
+        clip = AudioClip(samples, priority)
+        if not samples or not self.running:
+            clip.done.set()
+            return clip
+        with self.lock:
+            self.clips.append(clip)
+        return clip
     
-    # No initial consonant found
-    return None, py
+    def stop_all(self, priority=None):
+        """Stop every clip, or only clips of one priority"""
+        with self.lock:
+            for clip in self.clips:
+                if priority is None or clip.priority == priority:
+                    clip.terminate()
+    
+    def mix_block(self):
+        """
+        Mix the next block of all playing clips
+        
+        Returns:
+            bytes: One block of 16-bit PCM
+        """
+        with self.lock:
+            self.clips = [clip for clip in self.clips if not clip.done.is_set()]
+            clips = list(self.clips)
+        if not clips:
+            return bytes(2 * AUDIO_BLOCK_SAMPLES)
+        
+        now = time.perf_counter()
+        top_priority = max(clip.priority for clip in clips)
+        blocks = []
+        for clip in clips:
+            if clip.position == 0:
+                clip.start_latency = now - clip.requested_time
+                self.start_latencies.append(clip.start_latency)
+            block = clip.samples[clip.position:clip.position + AUDIO_BLOCK_SAMPLES]
+            clip.position += AUDIO_BLOCK_SAMPLES
+            if clip.position >= len(clip.samples):
+                clip.done.set()
+            gain = 1.0 if clip.priority == top_priority else AUDIO_DUCK_GAIN
+            blocks.append((block, gain))
+        
+        if len(blocks) == 1 and blocks[0][1] == 1.0:
+            mixed = array.array('h', blocks[0][0].tobytes())
+            mixed.frombytes(bytes(2 * (AUDIO_BLOCK_SAMPLES - len(mixed))))
+        elif audioop is not None:
+            # Scale and add whole blocks; audioop clips on overflow
+            total = bytes(2 * AUDIO_BLOCK_SAMPLES)
+            for block, gain in blocks:
+                data = block.tobytes()
+                data += bytes(len(total) - len(data))
+                if gain != 1.0:
+                    data = audioop.mul(data, 2, gain)
+                total = audioop.add(total, data, 2)
+            mixed = array.array('h', total)
+        else:
+            totals = [0.0] * AUDIO_BLOCK_SAMPLES
+            for block, gain in blocks:
+                for i, sample in enumerate(block):
+                    totals[i] += sample * gain
+            mixed = array.array('h', (max(-32768, min(32767, int(total))) for total in totals))
+        
+        if sys.byteorder == 'big':
+            mixed.byteswap()
+        return mixed.tobytes()
+    
+    def run_mixer(self):
+        """Feed mixed blocks to the output stream (runs on the mixer thread)"""
+        start = time.monotonic()
+        written = 0.0  # Seconds of audio written
+        try:
+            while self.running:
+                ahead = written - (time.monotonic() - start)
+                if ahead > AUDIO_MAX_LEAD:
+                    time.sleep(ahead - AUDIO_MAX_LEAD)
+                elif ahead < -AUDIO_MAX_LEAD:
+                    # Fell behind (e.g. the stream stalled): restart the clock
+                    start = time.monotonic()
+                    written = 0.0
+                self.process.stdin.write(self.mix_block())
+                self.process.stdin.flush()
+                written += AUDIO_BLOCK_SAMPLES / AUDIO_SAMPLE_RATE
+        except (BrokenPipeError, OSError, ValueError) as e:
+            print(f"Audio output stopped: {str(e)}")
+        finally:
+            self.running = False
+            self.stop_all()
+    
+    def stats(self):
+        """
+        Get clip start latency statistics
+        
+        Returns:
+            dict: Number of clips started and start latency in milliseconds
+        """
+        latencies = sorted(self.start_latencies)
+        result = {'clips': len(latencies)}
+        if latencies:
+            result.update({
+                'start_latency_p50_ms': latencies[len(latencies) // 2] * 1000,
+                'start_latency_max_ms': latencies[-1] * 1000
+            })
+        return result
+    
+    def close(self):
+        """Stop the mixer and close the output stream"""
+        self.running = False
+        self.thread.join(timeout=1)
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.terminate()
 
 
-def convert_chinese_char_to_braille_units(char):
+def get_audio_output():
     """
-    Convert a single Chinese character to Braille unit sequence
-    
-    Args:
-        char (str): Single character to convert
+    Get the persistent audio output, starting it on first use
     
     Returns:
-        tuple: (char_type, braille_units, descriptions)
+        AudioOutput: The output, or None if aplay is unavailable
     """
-    # Handle punctuation marks
-    if char in punctuation_map:
-        units = [punctuation_map[char]["dots"]] if punctuation_map[char]["dots"] else []
-        return ('punctuation', units, [char])
-
-    # Handle digits
-    if char.isdigit():
-        units = []
-        descs = []
-        units.append(number_prefix["dots"])  # Number indicator
-        descs.append('#')
-        if char in number_map:
-            units.append(number_map[char])
-            descs.append(char)
-        return ('number', units, descs)
-
-    # Handle English letters
-    if char.isalpha() and ord(char) < 128:
-        lower_char = char.lower()
-        if lower_char in english_map:
-            return ('english', [english_map[lower_char]], [char])
-        return ('other', [], [])
-
-    # Handle Chinese characters
-    if '\u4e00' <= char <= '\u9fa5':
-        # Get pinyin using pypinyin
-        py_list = pinyin(char, style=Style.NORMAL, errors=lambda x: [[x]])
-        if py_list and py_list[0]:
-            py = py_list[0][0].lower()
+    global audio_output, audio_output_failed
+    
+    if audio_output is not None and not audio_output.running:
+        audio_output = None
+        audio_output_failed = True
+    if audio_output is None and not audio_output_failed:
+        if shutil.which(AUDIO_OUTPUT_COMMAND[0]) is None:
+            audio_output_failed = True
         else:
-            return ('other', [], [])
-
-        # Validate pinyin format
-        if re.match(r'^[a-z]+$', py) is None:
-            return ('other', [], [])
-
-        # Split into initial and final
-        initial, final = split_pinyin(py)
-
-        # Generate Braille unit sequence and descriptions
-        braille_units = []
-        descs = []
-
-        # 1. Initial consonant unit (if exists)
-        if initial and initial in initial_map:
-            braille_units.append(initial_map[initial])
-            descs.append(f"{char}-{initial}")
+            try:
+                audio_output = AudioOutput()
+            except OSError as e:
+                print(f"Audio output unavailable: {str(e)}")
+                audio_output_failed = True
+    return audio_output
 
-        # 2. Final vowel unit (if exists)
-        if final and final in final_map:
-            braille_units.append(final_map[final])
-            descs.append(f"{char}-{final}")
 
-        return ('chinese', braille_units, descs)
+def play_audio(audio=None, path=None, priority=AUDIO_PRIORITY_SPEECH, samples=None, decode=True):
+    """
+    Play audio on the persistent output, falling back to mplayer
     
-    # Other characters
-    return ('other', [], [])
+    Args:
+        audio (bytes): Encoded audio held in memory (bytes or memoryview)
+        path (str): Audio file path (used when audio is not given)
+        priority (int): AUDIO_PRIORITY_* value
+        samples (array): Already decoded samples (skips decoding)
+        decode (bool): False to go straight to mplayer when no samples are given
+    
+    Returns:
+        AudioClip or subprocess.Popen: Playback handle (poll/wait/terminate)
+    """
+    output = get_audio_output()
+    if output is not None and (decode or samples is not None):
+        if samples is None:
+            if audio is None:
+                with open(path, 'rb') as f:
+                    audio = f.read()
+            samples = decode_audio(audio)
+        if samples is not None:
+            return output.play(samples, priority)
+    
+    # No persistent output or no decoder for this format
+    if path is not None:
+        return subprocess.Popen(['mplayer', path],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    process = subprocess.Popen(['mplayer', '-really-quiet', '-cache', '64', '-'],
+                               stdin=subprocess.PIPE,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        process.stdin.write(audio)
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+    return process
 
 
-def convert_text_to_display_sequence(text):
+def evict_lru_files(directory, suffix, max_bytes, keep=None):
     """
-    Convert text to display sequence with optimized display logic
+    Remove the least recently used files of a disk cache until it fits its size limit
+    
+    The caches refresh a file's modification time whenever it is read, so
+    the oldest files are the least recently used.
     
     Args:
-        text (str): Input text to convert
+        directory (str): Cache directory
+        suffix (str): Extension of the cached files (other files are ignored)
+        max_bytes (int): Size limit for all cached files
+        keep (str): Path of a file never to remove (the one just written)
     
     Returns:
-        tuple: (display_sequence, char_data) - Display sequence and character data
+        int: Number of files removed
     """
-    # First convert all characters to Braille units
-    char_data = []
-    in_number_mode = False
+    entries = []
+    total = 0
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(suffix):
+                info = entry.stat()
+                entries.append((info.st_mtime, info.st_size, entry.path))
+                total += info.st_size
     
-    for i, ch in enumerate(text):
-        char_type, units, descs = convert_chinese_char_to_braille_units(ch)
+    removed = 0
+    for mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+class TTSAudioCache:
+    """
+    Content-addressed disk cache for synthesized speech
+    
+    Each clip is stored under a hash of its text and voice options. Reads
+    refresh the file's modification time, so the oldest files are the least
+    recently used and are evicted first when the cache grows too large.
+    Files are written to a temporary name and renamed into place, so a clip
+    is never seen half-written.
+    """
+    
+    def __init__(self, directory=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES):
+        """
+        Initialize the cache (the directory is created on first write)
         
-        # Handle consecutive numbers (share number indicator)
-        if char_type == 'number':
-            if not in_number_mode:
-                in_number_mode = True
-                char_data.append((char_type, ch, units, descs))
-            else:
-                # Consecutive number, only need the digit itself
-                if len(units) > 1:
-                    char_data.append((char_type, ch, [units[1]], [descs[1]]))
-                else:
-                    char_data.append((char_type, ch, [], []))
-        else:
-            in_number_mode = False
-            char_data.append((char_type, ch, units, descs))
+        Args:
+            directory (str): Cache directory
+            max_bytes (int): Size limit for all cached clips
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
     
-    # Generate display sequence
-    display_sequence = []
-    i = 0
+    def key(self, text, options):
+        """Get the cache key for a text and its voice options"""
+        identity = json.dumps({'text': text, 'options': options}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
     
-    while i < len(char_data):
-        char_type, char, units, descs = char_data[i]
+    def path(self, key):
+        """Get the file path of a cached clip"""
+        return os.path.join(self.directory, key + '.wav')
+    
+    def get(self, text, options):
+        """
+        Look up a cached clip
         
-        if char_type == 'chinese':
-            # Chinese characters: initial on first group, final on second group
-            if len(units) >= 2:
-                display_sequence.append((units[0], units[1], descs[0], descs[1]))
-            elif len(units) == 1:
-                display_sequence.append((units[0], None, descs[0], None))
-            i += 1
-            
-        elif char_type in ['english', 'number']:
-            # English and numbers: check if can be paired for display
-            if i + 1 < len(char_data):
-                next_type, next_char, next_units, next_descs = char_data[i + 1]
-                
+        Args:
+            text (str): Spoken text
+            options (dict): Voice options used for synthesis
+        
+        Returns:
+            str: Path of the cached audio file, or None on a miss
+        """
+        path = self.path(self.key(text, options))
+        with self.lock:
+            try:
+                os.utime(path)  # Mark as recently used
+            except OSError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return path
+    
+    def put(self, text, options, audio):
+        """
+        Store a clip atomically and evict old clips if over the size limit
+        
+        Args:
+            text (str): Spoken text
+            options (dict): Voice options used for synthesis
+            audio (bytes): Synthesized audio
+        
+        Returns:
+            str: Path of the cached audio file
+        """
+        path = self.path(self.key(text, options))
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(audio)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self.evictions += evict_lru_files(self.directory, '.wav', self.max_bytes, keep=path)
+        return path
+    
+    def stats(self):
+        """
+        Get cache counters
+        
+        Returns:
+            dict: Hits, misses, evictions and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+# Shared TTS audio cache
+tts_cache = TTSAudioCache()
+
+
+class BaiduTTSClient:
+    """
+    Long-lived Baidu TTS client
+    
+    Keeps one pooled HTTP session, so TLS connections are reused between
+    requests, and caches the OAuth access token until shortly before it
+    expires. Latency of every synthesis request is recorded.
+    """
+    
+    def __init__(self, api_key, secret_key, token_url=BAIDU_TOKEN_URL,
+                 tts_url=BAIDU_TTS_URL, cuid='sentranslator', timeout=TTS_TIMEOUT):
+        """
+        Initialize the client (no network access until the first request)
+        
+        Args:
+            api_key (str): Baidu API key
+            secret_key (str): Baidu secret key
+            token_url (str): OAuth token endpoint
+            tts_url (str): Speech synthesis endpoint
+            cuid (str): Device identifier sent with each request
+            timeout (tuple): Connect and read timeouts in seconds
+        """
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.token_url = token_url
+        self.tts_url = tts_url
+        self.cuid = cuid
+        self.timeout = timeout
+        
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self.token = None
+        self.token_expiry = 0.0
+        self.lock = threading.Lock()
+        
+        self.request_count = 0
+        self.error_count = 0
+        self.token_fetches = 0
+        self.latencies = deque(maxlen=200)  # Seconds per synthesis request
+    
+    def access_token(self, refresh=False):
+        """
+        Get a valid access token, fetching a new one only when needed
+        
+        Args:
+            refresh (bool): Fetch a new token even if the cached one is valid
+        
+        Returns:
+            str: Access token
+        
+        Raises:
+            requests.RequestException: If the token endpoint cannot be reached
+            RuntimeError: If no token is returned
+        """
+        with self.lock:
+            if refresh or self.token is None or time.time() >= self.token_expiry:
+                response = self.session.post(self.token_url, params={
+                    'grant_type': 'client_credentials',
+                    'client_id': self.api_key,
+                    'client_secret': self.secret_key
+                }, timeout=self.timeout)
+                response.raise_for_status()
+                try:
+                    result = response.json()
+                except ValueError:
+                    result = {'error_msg': response.text[:200]}
+                if 'access_token' not in result:
+                    raise RuntimeError(f"Token request failed: {result}")
+                self.token = result['access_token']
+                expires_in = int(result.get('expires_in', 0))
+                self.token_expiry = time.time() + expires_in - TTS_TOKEN_REFRESH_MARGIN
+                self.token_fetches += 1
+            return self.token
+    
+    def synthesis(self, text, lang='zh', ctp=1, options=None):
+        """
+        Synthesize speech (same call and results as AipSpeech.synthesis)
+        
+        Args:
+            text (str): Text to speak
+            lang (str): Language
+            ctp (int): Client type
+            options (dict): Voice options (vol, spd, pit, per, ...)
+        
+        Returns:
+            bytes: Audio data on success, or dict: error returned by the service
+                   (token failures included)
+        """
+        refreshed = False
+        while True:
+            try:
+                token = self.access_token(refresh=refreshed)
+            except requests.HTTPError as e:
+                self.error_count += 1
+                return {'error_code': e.response.status_code, 'error_msg': f"Token request failed: {e}"}
+            except requests.RequestException as e:
+                self.error_count += 1
+                return {'error_code': 'network', 'error_msg': f"Token request failed: {e}"}
+            except RuntimeError as e:
+                self.error_count += 1
+                return {'error_code': 'token', 'error_msg': str(e)}
+            
+            data = {
+                'tex': urllib.parse.quote_plus(text),  # Baidu expects the text URL-encoded twice
+                'tok': token,
+                'cuid': self.cuid,
+                'ctp': ctp,
+                'lan': lang
+            }
+            data.update(options or {})
+            
+            start = time.perf_counter()
+            try:
+                response = self.session.post(self.tts_url, data=data, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.error_count += 1
+                return {'error_code': 'network', 'error_msg': str(e)}
+            self.latencies.append(time.perf_counter() - start)
+            self.request_count += 1
+            
+            if response.headers.get('Content-Type', '').startswith('audio'):
+                return response.content
+            
+            try:
+                result = response.json()
+            except ValueError:
+                result = {'error_code': response.status_code, 'error_msg': response.text[:200]}
+            
+            # Token rejected or expired early: refresh it once and retry
+            if result.get('err_no') in (502, 110, 111) and not refreshed:
+                refreshed = True
+                continue
+            self.error_count += 1
+            return result
+    
+    def metrics(self):
+        """
+        Get request counters and latency statistics
+        
+        Returns:
+            dict: Request, error and token fetch counts, and latency in milliseconds
+        """
+        latencies = sorted(self.latencies)
+        result = {
+            'requests': self.request_count,
+            'errors': self.error_count,
+            'token_fetches': self.token_fetches
+        }
+        if latencies:
+            result.update({
+                'latency_last_ms': self.latencies[-1] * 1000,
+                'latency_mean_ms': statistics.mean(latencies) * 1000,
+                'latency_p50_ms': latencies[len(latencies) // 2] * 1000,
+                'latency_max_ms': latencies[-1] * 1000
+            })
+        return result
+
+
+# Shared TTS client (created on first use)
+tts_client = None
+
+
+def get_tts_client():
+    """
+    Get the shared long-lived TTS client
+    
+    Returns:
+        BaiduTTSClient: The client, or None if requests is not installed
+    """
+    global tts_client
+    
+    if tts_client is None and requests is not None:
+        tts_client = BaiduTTSClient(BAIDU_API_KEY, BAIDU_SECRET_KEY)
+    return tts_client
+
+
+class TTSError(Exception):
+    """Raised when a TTS backend cannot synthesize speech"""
+
+
+class TransientTTSError(TTSError):
+    """Raised for TTS failures that may succeed when retried"""
+
+
+class TTSRequestLayer:
+    """
+    Coalescing, retry and rate limiting for TTS requests
+    
+    Requests for text that is already being synthesized wait for that
+    request instead of starting another. Transient errors are retried with
+    jittered exponential backoff, and a token bucket keeps cloud requests
+    under TTS_RATE_LIMIT.
+    """
+    
+    def __init__(self, rate=TTS_RATE_LIMIT, burst=TTS_RATE_BURST,
+                 attempts=TTS_RETRY_ATTEMPTS, backoff=TTS_RETRY_BACKOFF):
+        """
+        Initialize the request layer
+        
+        Args:
+            rate (float): Requests per second allowed by throttle
+            burst (int): Requests allowed back to back
+            attempts (int): Attempts per call, including the first
+            backoff (float): Base retry delay in seconds
+        """
+        self.rate = rate
+        self.burst = burst
+        self.attempts = attempts
+        self.backoff = backoff
+        
+        self.in_flight = {}  # Key -> Future of the running request
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        
+        self.requests = 0
+        self.coalesced = 0
+        self.retried = 0
+        self.throttled = 0
+    
+    def coalesce(self, key, call):
+        """
+        Run call, or wait for an identical call already in flight
+        
+        Args:
+            key: Identity of the request (e.g. the text)
+            call (callable): Performs the request
+        
+        Returns:
+            The result of call (shared by every coalesced caller)
+        """
+        with self.lock:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.in_flight[key] = future
+                self.requests += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        
+        try:
+            result = call()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+    
+    def throttle(self):
+        """Wait until the request rate allows another request"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1  # Reserve a slot, even if it is in the future
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+            if delay:
+                self.throttled += 1
+        if delay:
+            time.sleep(delay)
+    
+    def retry(self, call):
+        """
+        Run call, retrying TransientTTSError with jittered backoff
+        
+        Args:
+            call (callable): Performs one attempt
+        
+        Returns:
+            The result of call
+        
+        Raises:
+            TTSError: From the last attempt, or any non-transient failure
+        """
+        for attempt in range(self.attempts):
+            try:
+                return call()
+            except TransientTTSError:
+                if attempt + 1 >= self.attempts:
+                    raise
+                with self.lock:
+                    self.retried += 1
+                time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+    
+    def stats(self):
+        """
+        Get request counters
+        
+        Returns:
+            dict: Requests started, and calls coalesced, retried and throttled
+        """
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'coalesced': self.coalesced,
+                'retried': self.retried,
+                'throttled': self.throttled
+            }
+
+
+# Shared TTS request layer
+tts_requests = TTSRequestLayer()
+
+
+class TTSBackend:
+    """
+    Base class for speech synthesis backends
+    
+    Subclasses implement _synthesize; synthesize records the latency and
+    outcome of every call so the selection policy can be tuned.
+    """
+    
+    name = 'backend'
+    
+    def __init__(self):
+        self.latencies = deque(maxlen=200)  # Seconds per successful synthesis
+        self.successes = 0
+        self.failures = 0
+        self.last_failed = False
+        self.lock = threading.Lock()
+    
+    def synthesize(self, text):
+        """
+        Synthesize speech
+        
+        Args:
+            text (str): Text to speak
+        
+        Returns:
+            bytes: Audio data
+        
+        Raises:
+            TTSError: If synthesis failed
+        """
+        start = time.perf_counter()
+        try:
+            audio = self._synthesize(text)
+        except Exception:
+            with self.lock:
+                self.failures += 1
+                self.last_failed = True
+            raise
+        with self.lock:
+            self.latencies.append(time.perf_counter() - start)
+            self.successes += 1
+            self.last_failed = False
+        return audio
+    
+    def _synthesize(self, text):
+        raise NotImplementedError
+    
+    def recent_latency(self):
+        """
+        Get the median latency of recent successful requests
+        
+        Returns:
+            float: Seconds, or None if there have been none
+        """
+        with self.lock:
+            return statistics.median(self.latencies) if self.latencies else None
+    
+    def stats(self):
+        """
+        Get latency statistics
+        
+        Returns:
+            dict: Success and failure counts, and latency in milliseconds
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+            result = {'successes': self.successes, 'failures': self.failures}
+        if latencies:
+            result.update({
+                'latency_p50_ms': latencies[len(latencies) // 2] * 1000,
+                'latency_p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+                'latency_max_ms': latencies[-1] * 1000
+            })
+        return result
+
+
+class BaiduTTSBackend(TTSBackend):
+    """Cloud speech from Baidu TTS through the shared long-lived client"""
+    
+    name = 'baidu'
+    
+    def _synthesize(self, text):
+        client = get_tts_client()
+        if client is None:
+            raise TTSError("requests is not installed")
+        return tts_requests.retry(lambda: self.request(client, text))
+    
+    def request(self, client, text):
+        """Make one rate-limited synthesis request"""
+        tts_requests.throttle()
+        result = client.synthesis(text, 'zh', 1, TTS_OPTIONS)
+        if isinstance(result, dict):
+            code = result.get('err_no', result.get('error_code'))
+            # error_code holds the HTTP status when the reply was not JSON
+            server_error = isinstance(result.get('error_code'), int) and result['error_code'] >= 500
+            if code in TTS_TRANSIENT_ERRORS or server_error:
+                raise TransientTTSError(f"Baidu TTS error: {result}")
+            raise TTSError(f"Baidu TTS error: {result}")
+        return result
+
+
+class EspeakTTSBackend(TTSBackend):
+    """Offline speech from a local espeak-ng (or espeak) engine"""
+    
+    name = 'espeak'
+    
+    def __init__(self, commands=TTS_LOCAL_COMMANDS):
+        """
+        Initialize the backend
+        
+        Args:
+            commands (list): Candidate command lines; the first installed one is used
+        """
+        super().__init__()
+        self.command = next((command for command in commands if shutil.which(command[0])), None)
+    
+    def _synthesize(self, text):
+        if self.command is None:
+            raise TTSError("espeak-ng is not installed")
+        result = subprocess.run(self.command + [text], capture_output=True, timeout=30)
+        if result.returncode != 0 or not result.stdout:
+            raise TTSError(f"{self.command[0]} failed: {result.stderr.decode(errors='replace').strip()}")
+        return result.stdout
+
+
+class TTSBackendSelector:
+    """
+    Chooses between the cloud and local TTS backends
+    
+    See TTS_BACKEND_POLICY for the available policies.
+    """
+    
+    def __init__(self, cloud, local, policy=TTS_BACKEND_POLICY,
+                 threshold=TTS_CLOUD_LATENCY_THRESHOLD):
+        """
+        Initialize the selector
+        
+        Args:
+            cloud (TTSBackend): Preferred (higher quality) backend
+            local (TTSBackend): Offline backend
+            policy (str): 'cloud', 'local', 'fallback' or 'race'
+            threshold (float): Cloud latency in seconds before the local backend is used
+        """
+        self.cloud = cloud
+        self.local = local
+        self.policy = policy
+        self.threshold = threshold
+        # Each backend has its own threads: a cloud request can hang for the
+        # read timeout on every retry, and the local fallback must not queue
+        # behind abandoned cloud requests
+        self.executors = {cloud: ThreadPoolExecutor(max_workers=TTS_CLOUD_WORKERS),
+                          local: ThreadPoolExecutor(max_workers=TTS_LOCAL_WORKERS)}
+    
+    def submit(self, backend, text):
+        """Start synthesis on a backend's own threads, returning a Future"""
+        return self.executors[backend].submit(backend.synthesize, text)
+    
+    def cloud_degraded(self):
+        """True while the cloud backend is failing or slower than the threshold"""
+        recent = self.cloud.recent_latency()
+        return self.cloud.last_failed or (recent is not None and recent > self.threshold)
+    
+    def local_acceptable(self, policy=None):
+        """
+        Whether speech from the local backend may be used right now
+        
+        Args:
+            policy (str): Policy to apply instead of the selector's own
+        
+        Returns:
+            bool: True if the policy would use (or race) the local backend
+        """
+        policy = policy or self.policy
+        if policy == 'cloud':
+            return False
+        return policy in ('local', 'race') or self.cloud_degraded()
+    
+    def cache_options(self, backend):
+        """
+        Get the cache options audio from a backend is stored under
+        
+        Local speech has its own key so it never shadows cloud speech.
+        
+        Args:
+            backend (TTSBackend): Backend that produced the audio
+        
+        Returns:
+            dict: Options for TTSAudioCache
+        """
+        return TTS_OPTIONS if backend is self.cloud else dict(TTS_OPTIONS, backend=backend.name)
+    
+    def synthesize(self, text, policy=None):
+        """
+        Synthesize speech according to the selection policy
+        
+        Args:
+            text (str): Text to speak
+            policy (str): Policy to apply instead of the selector's own
+        
+        Returns:
+            tuple: (backend, audio) - the TTSBackend used and its audio data
+        
+        Raises:
+            TTSError: If every backend tried failed
+        """
+        policy = policy or self.policy
+        if policy in ('cloud', 'local'):
+            backend = self.cloud if policy == 'cloud' else self.local
+            return backend, backend.synthesize(text)
+        
+        # Race immediately when asked to, or when the cloud is currently slow or failing
+        race = policy == 'race' or self.cloud_degraded()
+        
+        pending = {self.submit(self.cloud, text): self.cloud}
+        if race:
+            pending[self.submit(self.local, text)] = self.local
+        timeout = None if race else self.threshold
+        errors = []
+        
+        while pending:
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            timeout = None
+            for future in done:
+                backend = pending.pop(future)
+                try:
+                    return backend, future.result()
+                except Exception as e:
+                    errors.append(f"{backend.name}: {str(e)}")
+            
+            # Cloud failed or is too slow: bring in the local engine
+            if self.local not in pending.values() and not any(
+                    error.startswith(self.local.name + ':') for error in errors):
+                pending[self.submit(self.local, text)] = self.local
+        
+        raise TTSError("; ".join(errors))
+    
+    def stats(self):
+        """
+        Get per-backend latency statistics
+        
+        Returns:
+            dict: Backend name -> statistics
+        """
+        return {backend.name: backend.stats() for backend in (self.cloud, self.local)}
+
+
+# Shared TTS backend selector
+tts_selector = TTSBackendSelector(BaiduTTSBackend(), EspeakTTSBackend())
+
+
+def get_speech_audio(text, policy=None):
+    """
+    Get synthesized speech for text, from the cache or from a TTS backend
+    
+    Cloud speech is looked up in the cache first. Speech from the local
+    engine is stored under its own cache key so it never shadows cloud
+    speech, and is used from the cache whenever the policy would use the
+    local engine anyway (e.g. while the cloud is failing). With the cloud
+    healthy again, the phrase is synthesized in the cloud once more.
+    
+    Args:
+        text (str): Text to convert to speech
+        policy (str): Backend policy to apply instead of TTS_BACKEND_POLICY
+                      ('cloud' to accept only cloud speech)
+    
+    Returns:
+        str: Path of the audio file, or None if synthesis failed
+    """
+    audio_path = tts_cache.get(text, TTS_OPTIONS)
+    if audio_path is not None:
+        return audio_path
+    if tts_selector.local_acceptable(policy):
+        audio_path = tts_cache.get(text, tts_selector.cache_options(tts_selector.local))
+        if audio_path is not None:
+            return audio_path
+    return tts_requests.coalesce((text, policy), lambda: synthesize_to_cache(text, policy))
+
+
+def synthesize_to_cache(text, policy=None):
+    """
+    Synthesize speech with the backend selector and store it in the cache
+    
+    Args:
+        text (str): Text to convert to speech
+        policy (str): Backend policy to apply instead of TTS_BACKEND_POLICY
+    
+    Returns:
+        str: Path of the audio file, or None if synthesis failed
+    """
+    try:
+        backend, audio = tts_selector.synthesize(text, policy)
+    except TTSError as e:
+        print("TTS error:", str(e))
+        return None
+    
+    return tts_cache.put(text, tts_selector.cache_options(backend), audio)
+
+
+def speak_text(text):
+    """
+    Speak text and wait until playback has finished
+    
+    Args:
+        text (str): Text to convert to speech
+    """
+    try:
+        audio_path = get_speech_audio(text)
+        if audio_path is None:
+            return
+        
+        play_audio(path=audio_path, priority=AUDIO_PRIORITY_PROMPT).wait()
+        print("TTS playback completed")
+    except Exception as e:
+        print("TTS failed:", str(e))
+
+
+def ends_unit(text, i, marks=SENTENCE_END_MARKS):
+    """
+    Check whether the character at i ends a sentence (or clause)
+    
+    Chinese marks always do. ASCII marks only do at the end of the text or
+    before whitespace, so numbers like 3.14 or 1,000 and names like
+    example.com stay whole.
+    
+    Args:
+        text (str): Text
+        i (int): Index of the character
+        marks (set): SENTENCE_END_MARKS or CLAUSE_END_MARKS
+    
+    Returns:
+        bool: True if a sentence (or clause) ends after text[i]
+    """
+    ch = text[i]
+    return ch in marks and (ord(ch) > 127 or i + 1 == len(text) or text[i + 1].isspace())
+
+
+def split_text_for_speech(text, max_chars=TTS_MAX_CHUNK_CHARS):
+    """
+    Split text into sentence chunks for pipelined speech
+    
+    Sentences end at SENTENCE_END_MARKS (see ends_unit). Sentences longer than
+    max_chars are split at the last clause mark within the limit, or at the
+    limit itself.
+    
+    Args:
+        text (str): Text to speak
+        max_chars (int): Longest chunk sent in one synthesis request
+    
+    Returns:
+        list: Chunks of text, in order, skipping ones with nothing to say
+    """
+    sentences = []
+    start = 0
+    for i in range(len(text)):
+        if ends_unit(text, i):
+            sentences.append(text[start:i + 1])
+            start = i + 1
+    sentences.append(text[start:])
+    
+    chunks = []
+    for sentence in sentences:
+        while len(sentence) > max_chars:
+            cut = max(sentence.rfind(mark, 0, max_chars) for mark in CLAUSE_END_MARKS) + 1
+            if cut <= 0:
+                cut = max_chars
+            chunks.append(sentence[:cut])
+            sentence = sentence[cut:]
+        chunks.append(sentence)
+    
+    return [chunk.strip() for chunk in chunks if any(ch.isalnum() for ch in chunk)]
+
+
+def play_speech_in_background(text, generation):
+    """
+    Synthesize and play text unless the utterance is cancelled (runs on tts_thread)
+    
+    The text is spoken sentence by sentence. A helper thread synthesizes the
+    next sentence while the current one plays, so the first sound only waits
+    for the first sentence and there is no synthesis pause between sentences.
+    
+    Args:
+        text (str): Text to convert to speech
+        generation (int): Value of tts_generation when the utterance started
+    """
+    global tts_process
+    
+    start_time = time.monotonic()
+    chunks = split_text_for_speech(text)
+    ready = queue.Queue(maxsize=1)  # Synthesized chunk waiting to be played
+    
+    def cancelled():
+        return generation != tts_generation
+    
+    def hand_over(audio_path):
+        while not cancelled():
+            try:
+                ready.put(audio_path, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def synthesize_chunks():
+        try:
+            for chunk in chunks:
+                if cancelled():
+                    return
+                audio_path = get_speech_audio(chunk)
+                if audio_path is None or not hand_over(audio_path):
+                    return
+        except Exception as e:
+            print("TTS failed:", str(e))
+        finally:
+            hand_over(None)  # No more chunks
+    
+    threading.Thread(target=synthesize_chunks, daemon=True).start()
+    
+    try:
+        played = 0
+        while not cancelled():
+            try:
+                audio_path = ready.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if audio_path is None:
+                break
+            
+            with tts_lock:
+                if cancelled():
+                    return
+                tts_process = play_audio(path=audio_path, priority=AUDIO_PRIORITY_SPEECH)
+                process = tts_process
+            
+            if played == 0:
+                print(f"TTS first audio after {time.monotonic() - start_time:.2f}s")
+            played += 1
+            process.wait()
+        
+        if played and not cancelled():
+            print(f"TTS playback completed ({played} sentences in "
+                  f"{time.monotonic() - start_time:.1f}s)")
+    except Exception as e:
+        print("TTS failed:", str(e))
+
+
+def stop_text_to_speech():
+    """
+    Cancel the current utterance, whether it is being synthesized or played
+    
+    Returns:
+        bool: True if an utterance was in progress
+    """
+    global tts_process, tts_generation
+    
+    with tts_lock:
+        active = tts_thread is not None and tts_thread.is_alive()
+        tts_generation += 1
+        if tts_process and tts_process.poll() is None:
+            tts_process.terminate()
+        tts_process = None
+    return active
+
+
+def text_to_speech(text):
+    """
+    Convert text to speech using Baidu TTS API (can be interrupted)
+    
+    Synthesis and playback run in the background so the display loop keeps
+    running. Pressing again while speaking stops the current utterance.
+    
+    Args:
+        text (str): Text to convert to speech
+    """
+    global tts_thread
+    
+    if stop_text_to_speech():
+        print("TTS stopped")
+        return
+    
+    with tts_lock:
+        generation = tts_generation
+        tts_thread = threading.Thread(
+            target=play_speech_in_background,
+            args=(text, generation),
+            daemon=True
+        )
+        tts_thread.start()
+    print("TTS started")
+
+
+class PromptBundle:
+    """
+    Packed audio bundle of pre-rendered voice prompts
+    
+    File layout: PROMPT_BUNDLE_MAGIC, a 4-byte big-endian index length, a
+    JSON index ({"options": TTS_OPTIONS, "clips": {text: [offset, length]}})
+    and then the concatenated audio clips. The file is memory-mapped, so
+    clips are slices of the mapping and nothing is written to disk when a
+    prompt is played.
+    """
+    
+    def __init__(self, path):
+        """
+        Open a prompt bundle
+        
+        Args:
+            path (str): Bundle file path
+        
+        Raises:
+            ValueError: If the file is not a valid prompt bundle
+        """
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        header_length = len(PROMPT_BUNDLE_MAGIC) + 4
+        if self.data[:len(PROMPT_BUNDLE_MAGIC)] != PROMPT_BUNDLE_MAGIC:
+            raise ValueError("not a voice prompt bundle")
+        (index_length,) = struct.unpack_from('>I', self.data, len(PROMPT_BUNDLE_MAGIC))
+        index = json.loads(self.data[header_length:header_length + index_length].decode('utf-8'))
+        
+        self.options = index['options']
+        self.clips = index['clips']
+        self.data_start = header_length + index_length
+    
+    def get(self, text):
+        """
+        Get a pre-rendered prompt
+        
+        Args:
+            text (str): Prompt text
+        
+        Returns:
+            memoryview: Audio data, or None if the prompt is not in the bundle
+        """
+        clip = self.clips.get(text)
+        if clip is None:
+            return None
+        offset, length = clip
+        start = self.data_start + offset
+        return memoryview(self.data)[start:start + length]
+    
+    @staticmethod
+    def build(path, texts):
+        """
+        Render prompts with TTS and pack them into a bundle file
+        
+        Only cloud speech is used, so the bundle really has the voice of
+        the TTS_OPTIONS it is stamped with; prompts the cloud cannot
+        render are left out and spoken live.
+        
+        Args:
+            path (str): Bundle file path to write
+            texts (list): Prompt texts to render
+        
+        Returns:
+            int: Number of prompts written to the bundle
+        """
+        clips = {}
+        chunks = []
+        offset = 0
+        for text in texts:
+            audio_path = get_speech_audio(text, policy='cloud')
+            if audio_path is None:
+                print(f"Skipped prompt: {text}")
+                continue
+            with open(audio_path, 'rb') as f:
+                audio = f.read()
+            clips[text] = [offset, len(audio)]
+            chunks.append(audio)
+            offset += len(audio)
+        
+        index = json.dumps({'options': TTS_OPTIONS, 'clips': clips}, ensure_ascii=False).encode('utf-8')
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(PROMPT_BUNDLE_MAGIC)
+                f.write(struct.pack('>I', len(index)))
+                f.write(index)
+                for audio in chunks:
+                    f.write(audio)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return len(clips)
+
+
+def get_prompt_bundle():
+    """
+    Load the voice prompt bundle on first use
+    
+    Returns:
+        PromptBundle: The bundle, or None if it is missing, invalid or was
+                      rendered with different voice options
+    """
+    global prompt_bundle, prompt_bundle_loaded
+    
+    if not prompt_bundle_loaded:
+        prompt_bundle_loaded = True
+        try:
+            bundle = PromptBundle(PROMPT_BUNDLE_PATH)
+            if bundle.options == TTS_OPTIONS:
+                prompt_bundle = bundle
+            else:
+                print("Voice prompt bundle is out of date, rebuild it with --build-prompt-bundle")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Voice prompt bundle unusable: {str(e)}")
+    return prompt_bundle
+
+
+class PronunciationBank:
+    """
+    Memory-mapped bank of per-character pronunciation clips
+    
+    File layout: PRONUNCIATION_BANK_MAGIC, a header of three 4-byte
+    big-endian counts (slots, clips, metadata length), JSON metadata
+    ({"options": TTS_OPTIONS, "sample_rate": ...}), a slot table with one
+    2-byte clip number per character (0xFFFF = no clip), a clip table of
+    4-byte (offset, length) pairs and then little-endian 16-bit PCM. Only
+    the small header is parsed on open; a lookup reads two table entries
+    and returns a slice of the mapping, so opening the bank costs nothing
+    and no clip is ever copied.
+    """
+    
+    SLOT_COUNT = PRONUNCIATION_CJK_LAST - PRONUNCIATION_CJK_FIRST + 1 + len(PRONUNCIATION_ASCII)
+    NO_CLIP = 0xFFFF
+    
+    def __init__(self, path):
+        """
+        Open a pronunciation bank
+        
+        Args:
+            path (str): Bank file path
+        
+        Raises:
+            ValueError: If the file is not a valid pronunciation bank
+        """
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if self.data[:len(PRONUNCIATION_BANK_MAGIC)] != PRONUNCIATION_BANK_MAGIC:
+            raise ValueError("not a pronunciation bank")
+        header_end = len(PRONUNCIATION_BANK_MAGIC) + 12
+        slot_count, self.clip_count, meta_length = struct.unpack_from(
+            '>III', self.data, len(PRONUNCIATION_BANK_MAGIC))
+        if slot_count != self.SLOT_COUNT:
+            raise ValueError("pronunciation bank covers a different character set")
+        meta = json.loads(self.data[header_end:header_end + meta_length].decode('utf-8'))
+        
+        self.options = meta['options']
+        self.sample_rate = meta['sample_rate']
+        self.slot_table = header_end + meta_length
+        self.clip_table = self.slot_table + 2 * slot_count
+        self.data_start = self.clip_table + 8 * self.clip_count
+    
+    @staticmethod
+    def slot(char):
+        """
+        Get the slot table position of a character
+        
+        Args:
+            char (str): Single character
+        
+        Returns:
+            int: Slot number, or None if the bank cannot hold the character
+        """
+        code = ord(char)
+        if PRONUNCIATION_CJK_FIRST <= code <= PRONUNCIATION_CJK_LAST:
+            return code - PRONUNCIATION_CJK_FIRST
+        index = PRONUNCIATION_ASCII.find(char.lower()) if char.isascii() else -1
+        if index < 0:
+            return None
+        return PRONUNCIATION_CJK_LAST - PRONUNCIATION_CJK_FIRST + 1 + index
+    
+    def get(self, char):
+        """
+        Get the pronunciation of a character
+        
+        Args:
+            char (str): Single character
+        
+        Returns:
+            memoryview: 16-bit samples (cast to 'h'), or None if the
+                        character has no clip
+        """
+        slot = self.slot(char)
+        if slot is None:
+            return None
+        (clip,) = struct.unpack_from('>H', self.data, self.slot_table + 2 * slot)
+        if clip == self.NO_CLIP:
+            return None
+        offset, length = struct.unpack_from('>II', self.data, self.clip_table + 8 * clip)
+        start = self.data_start + offset
+        samples = memoryview(self.data)[start:start + length].cast('h')
+        if sys.byteorder == 'big':
+            samples = array.array('h', samples.tobytes())
+            samples.byteswap()
+        return samples
+    
+    @staticmethod
+    def build(path):
+        """
+        Render every character with TTS and pack the clips into a bank file
+        
+        Characters are grouped by their pinyin with tone; each group is
+        rendered once, using its first character, and shares the clip.
+        Only cloud speech is used, so the bank matches the TTS_OPTIONS it
+        is stamped with.
+        
+        Args:
+            path (str): Bank file path to write
+        
+        Returns:
+            tuple: (characters covered, clips written)
+        """
+        groups = {}  # Pinyin (or the character itself) -> slots
+        for code in range(PRONUNCIATION_CJK_FIRST, PRONUNCIATION_CJK_LAST + 1):
+            char = chr(code)
+            syllable = pinyin(char, style=Style.TONE3)[0][0]
+            if syllable != char:
+                groups.setdefault(syllable, []).append(char)
+        for char in PRONUNCIATION_ASCII:
+            groups.setdefault(char, []).append(char)
+        
+        slots = array.array('H', [PronunciationBank.NO_CLIP]) * PronunciationBank.SLOT_COUNT
+        clips = []
+        chunks = []
+        offset = 0
+        for number, (syllable, chars) in enumerate(groups.items(), 1):
+            audio_path = get_speech_audio(chars[0], policy='cloud')
+            samples = None
+            if audio_path is not None:
+                with open(audio_path, 'rb') as f:
+                    samples = decode_audio(f.read())
+            if not samples:
+                print(f"Skipped pronunciation: {syllable}")
+                continue
+            
+            # Trim silence so the clip starts with the dots
+            loud = [i for i, sample in enumerate(samples) if abs(sample) >= PRONUNCIATION_SILENCE_LEVEL]
+            if loud:
+                samples = samples[loud[0]:loud[-1] + 1]
+            if sys.byteorder == 'big':
+                samples.byteswap()
+            audio = samples.tobytes()
+            
+            for char in chars:
+                slots[PronunciationBank.slot(char)] = len(clips)
+            clips.append((offset, len(audio)))
+            chunks.append(audio)
+            offset += len(audio)
+            if number % 100 == 0:
+                print(f"Rendered {number}/{len(groups)} pronunciations")
+        
+        meta = json.dumps({'options': TTS_OPTIONS, 'sample_rate': AUDIO_SAMPLE_RATE}).encode('utf-8')
+        if sys.byteorder == 'little':
+            slots.byteswap()  # Slot table is big-endian like the other tables
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(PRONUNCIATION_BANK_MAGIC)
+                f.write(struct.pack('>III', len(slots), len(clips), len(meta)))
+                f.write(meta)
+                f.write(slots.tobytes())
+                for clip in clips:
+                    f.write(struct.pack('>II', *clip))
+                for audio in chunks:
+                    f.write(audio)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        covered = sum(1 for clip in slots if clip != PronunciationBank.NO_CLIP)
+        return covered, len(clips)
+
+
+def get_pronunciation_bank():
+    """
+    Load the pronunciation bank on first use
+    
+    Returns:
+        PronunciationBank: The bank, or None if it is missing, invalid or
+                           was rendered with different voice options
+    """
+    global pronunciation_bank, pronunciation_bank_loaded
+    
+    if not pronunciation_bank_loaded:
+        pronunciation_bank_loaded = True
+        try:
+            bank = PronunciationBank(PRONUNCIATION_BANK_PATH)
+            if bank.options == TTS_OPTIONS and bank.sample_rate == AUDIO_SAMPLE_RATE:
+                pronunciation_bank = bank
+            else:
+                print("Pronunciation bank is out of date, rebuild it with --build-pronunciation-bank")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Pronunciation bank unusable: {str(e)}")
+    return pronunciation_bank
+
+
+def speak_frame(chars):
+    """
+    Speak the characters of a display frame from the pronunciation bank
+    
+    The clip of the previous frame is cut off, so speech keeps pace with
+    the dots however fast the reader advances.
+    
+    Args:
+        chars (str): Source characters covered by the frame
+    """
+    global frame_speech_clip
+    
+    if frame_speech_clip is not None:
+        frame_speech_clip.terminate()
+        frame_speech_clip = None
+    
+    bank = get_pronunciation_bank()
+    output = get_audio_output() if bank is not None else None
+    if output is None:
+        return
+    
+    clips = [clip for clip in map(bank.get, chars) if clip is not None]
+    if not clips:
+        return
+    if len(clips) == 1:
+        samples = clips[0]
+    else:
+        # Several letters or digits in one frame: play them one after another
+        samples = array.array('h')
+        for clip in clips:
+            samples.frombytes(clip.tobytes())
+    frame_speech_clip = output.play(samples, AUDIO_PRIORITY_SPEECH)
+
+
+def start_fixed_audio_decode():
+    """
+    Decode the fixed audio file in the background, once
+    
+    Returns:
+        Future: Decoded samples, or None if the file cannot be decoded
+                (the failure is remembered, so it is not retried)
+    """
+    global fixed_audio_decode
+    
+    if fixed_audio_decode is None:
+        fixed_audio_decode = Future()
+        
+        def decode():
+            try:
+                with open(FIXED_AUDIO_PATH, 'rb') as f:
+                    samples = decode_audio(f.read())
+            except Exception as e:
+                print(f"Fixed audio cannot be decoded: {str(e)}")
+                samples = None
+            fixed_audio_decode.set_result(samples)
+        
+        threading.Thread(target=decode, daemon=True).start()
+    return fixed_audio_decode
+
+
+def play_fixed_audio():
+    """
+    Play fixed audio file (can be interrupted)
+    
+    Plays from memory once the background decode has finished; until then,
+    or if the file cannot be decoded, mplayer plays the file.
+    """
+    global audio_process
+    
+    if audio_process and audio_process.poll() is None:
+        # If already playing, stop it
+        audio_process.terminate()
+        audio_process = None
+        print("Audio stopped")
+        return
+    
+    if os.path.exists(FIXED_AUDIO_PATH):
+        try:
+            samples = None
+            if get_audio_output() is not None:
+                decoded = start_fixed_audio_decode()
+                samples = decoded.result() if decoded.done() else None
+            audio_process = play_audio(path=FIXED_AUDIO_PATH, priority=AUDIO_PRIORITY_MEDIA,
+                                       samples=samples, decode=False)
+            print("Fixed audio playback started")
+        except Exception as e:
+            print(f"Failed to play fixed audio: {str(e)}")
+    else:
+        print(f"Error: Fixed audio file not found at {FIXED_AUDIO_PATH}")
+
+
+def split_pinyin(py):
+    """
+    Split pinyin into initial consonant and final vowel with special rules
+    
+    Args:
+        py (str): Pinyin string
+    
+    Returns:
+        tuple: (initial, final) - Initial consonant and final vowel
+    """
+    if not py:
+        return None, py
+    
+    # Sort initials by length (longest first) to match correctly
+    initials_list = sorted(initial_map.keys(), key=lambda x: -len(x))
+    
+    # Match longest initial first (zh, ch, sh)
+    for ini in initials_list:
+        if py.startswith(ini):
+            initial = ini
+            final = py[len(ini):]
+            
+            # Apply special pronunciation rules
+            # 1. g/k/h change to j/q/x before i/u/ü
+            if initial == 'g' and final and final[0] in ['i', 'u', 'ü', 'v']:
+                initial = 'j'
+            elif initial == 'k' and final and final[0] in ['i', 'u', 'ü', 'v']:
+                initial = 'q'
+            elif initial == 'h' and final and final[0] in ['i', 'u', 'ü', 'v']:
+                initial = 'x'
+            
+            # 2. Standalone 'i' is omitted after z/c/s/zh/ch/sh/r
+            if initial in ['z', 'c', 's', 'zh', 'ch', 'sh', 'r']:
+                if final == 'i':
+                    final = ''  # Omit standalone i
+            
+            return initial, final
+    
+    # No initial consonant found
+    return None, py
+
+
+@functools.lru_cache(maxsize=32768)
+def convert_chinese_char_to_braille_units(char):
+    """
+    Convert a single Chinese character to Braille unit sequence
+    
+    Args:
+        char (str): Single character to convert
+    
+    Returns:
+        tuple: (char_type, braille_units, descriptions) - results are cached
+               and shared between calls, so they must not be modified
+    """
+    # Handle punctuation marks
+    if char in punctuation_map:
+        units = [punctuation_map[char]["dots"]] if punctuation_map[char]["dots"] else []
+        return ('punctuation', units, [char])
+
+    # Handle digits
+    if char.isdigit():
+        units = []
+        descs = []
+        units.append(number_prefix["dots"])  # Number indicator
+        descs.append('#')
+        if char in number_map:
+            units.append(number_map[char])
+            descs.append(char)
+        return ('number', units, descs)
+
+    # Handle English letters
+    if char.isalpha() and ord(char) < 128:
+        lower_char = char.lower()
+        if lower_char in english_map:
+            return ('english', [english_map[lower_char]], [char])
+        return ('other', [], [])
+
+    # Handle Chinese characters
+    if '\u4e00' <= char <= '\u9fa5':
+        # Get pinyin using pypinyin
+        py_list = pinyin(char, style=Style.NORMAL, errors=lambda x: [[x]])
+        if py_list and py_list[0]:
+            py = py_list[0][0].lower()
+        else:
+            return ('other', [], [])
+
+        # Validate pinyin format
+        if re.match(r'^[a-z]+$', py) is None:
+            return ('other', [], [])
+
+        # Split into initial and final
+        initial, final = split_pinyin(py)
+
+        # Generate Braille unit sequence and descriptions
+        braille_units = []
+        descs = []
+
+        # 1. Initial consonant unit (if exists)
+        if initial and initial in initial_map:
+            braille_units.append(initial_map[initial])
+            descs.append(f"{char}-{initial}")
+
+        # 2. Final vowel unit (if exists)
+        if final and final in final_map:
+            braille_units.append(final_map[final])
+            descs.append(f"{char}-{final}")
+
+        return ('chinese', braille_units, descs)
+    
+    # Other characters
+    return ('other', [], [])
+
+
+def convert_text_to_display_sequence(text, frame_offsets=None, number_mode=False):
+    """
+    Convert text to display sequence with optimized display logic
+    
+    Args:
+        text (str): Input text to convert
+        frame_offsets (list): Optional list that receives, for each display
+            group, the index in text of the first character it shows
+        number_mode (bool): The text continues a number (from the previous
+            page), so its first digit needs no number indicator
+    
+    Returns:
+        tuple: (display_sequence, char_data) - Display sequence and character data
+    """
+    # First convert all characters to Braille units
+    char_data = []
+    in_number_mode = number_mode
+    
+    for i, ch in enumerate(text):
+        char_type, units, descs = convert_chinese_char_to_braille_units(ch)
+        
+        # Handle consecutive numbers (share number indicator)
+        if char_type == 'number':
+            if not in_number_mode:
+                in_number_mode = True
+                char_data.append((char_type, ch, units, descs))
+            else:
+                # Consecutive number, only need the digit itself
+                if len(units) > 1:
+                    char_data.append((char_type, ch, [units[1]], [descs[1]]))
+                else:
+                    char_data.append((char_type, ch, [], []))
+        else:
+            in_number_mode = False
+            char_data.append((char_type, ch, units, descs))
+    
+    # Generate display sequence
+    display_sequence = []
+    i = 0
+    
+    while i < len(char_data):
+        char_type, char, units, descs = char_data[i]
+        start_index, start_length = i, len(display_sequence)
+        
+        if char_type == 'chinese':
+            # Chinese characters: initial on first group, final on second group
+            if len(units) >= 2:
+                display_sequence.append((units[0], units[1], descs[0], descs[1]))
+            elif len(units) == 1:
+                display_sequence.append((units[0], None, descs[0], None))
+            i += 1
+            
+        elif char_type in ['english', 'number']:
+            # English and numbers: check if can be paired for display
+            if i + 1 < len(char_data):
+                next_type, next_char, next_units, next_descs = char_data[i + 1]
+                
                 # If next is also English or number, can pair them
                 if next_type in ['english', 'number'] and len(units) > 0 and len(next_units) > 0:
                     # Display two characters together
@@ -676,105 +2645,2967 @@ def convert_text_to_display_sequence(text):
                         ))
                     i += 1
             else:
-                # Last character, display alone
-                if len(units) > 0:
-                    display_sequence.append((
-                        units[0], None, 
-                        descs[0] if descs else char, 
-                        None
-                    ))
-                i += 1
-                
+                # Last character, display alone
+                if len(units) > 0:
+                    display_sequence.append((
+                        units[0], None, 
+                        descs[0] if descs else char, 
+                        None
+                    ))
+                i += 1
+                
+        else:
+            # Other types, display individually
+            for j, unit in enumerate(units):
+                display_sequence.append((
+                    unit, None, 
+                    descs[j] if j < len(descs) else char, 
+                    None
+                ))
+            i += 1
+        
+        # Every group added in this step starts at the same source character
+        if frame_offsets is not None:
+            frame_offsets.extend([start_index] * (len(display_sequence) - start_length))
+    
+    return display_sequence, char_data
+
+
+class NavigationIndex:
+    """
+    Sentence, clause and word boundaries of a display sequence
+    
+    Maps each boundary in the source text to a display group offset, and each
+    display group to the sentence, clause and word it belongs to, so that
+    jumping backward or forward is a constant-time lookup.
+    """
+    
+    LEVELS = ('sentence', 'clause', 'word')
+    
+    def __init__(self, text, frame_offsets):
+        """
+        Build the index for a translated text
+        
+        Args:
+            text (str): Source text
+            frame_offsets (list): Start character index of each display group,
+                as filled in by convert_text_to_display_sequence
+        """
+        self.frame_count = len(frame_offsets)
+        self.starts = {}   # level -> display group where each unit starts
+        self.unit_of = {}  # level -> unit number of each display group
+        
+        boundaries = {level: [0] for level in self.LEVELS}
+        for i, ch in enumerate(text):
+            if ends_unit(text, i, SENTENCE_END_MARKS):
+                boundaries['sentence'].append(i + 1)
+            if ends_unit(text, i, CLAUSE_END_MARKS):
+                boundaries['clause'].append(i + 1)
+            if i > 0 and self._starts_word(text[i - 1], ch):
+                boundaries['word'].append(i)
+        
+        for level, char_positions in boundaries.items():
+            starts = []
+            for position in char_positions:
+                frame = bisect.bisect_left(frame_offsets, position)
+                if frame < self.frame_count and (not starts or frame > starts[-1]):
+                    starts.append(frame)
+            
+            unit_of = []
+            unit = 0
+            for frame in range(self.frame_count):
+                while unit + 1 < len(starts) and starts[unit + 1] <= frame:
+                    unit += 1
+                unit_of.append(unit)
+            
+            self.starts[level] = starts
+            self.unit_of[level] = unit_of
+    
+    @staticmethod
+    def _starts_word(previous, ch):
+        """Check whether ch begins a new word after previous"""
+        if ch.isspace() or ch in CLAUSE_END_MARKS:
+            return False
+        if previous.isspace() or previous in CLAUSE_END_MARKS:
+            return True
+        # Each Chinese character is its own word; runs of letters or digits are one word
+        return '\u4e00' <= ch <= '\u9fa5' or (ch.isalnum() != previous.isalnum())
+    
+    def jump(self, level, last_shown, step):
+        """
+        Find the display group to jump to
+        
+        Jumping back goes to the start of the unit containing the group last
+        shown, so a missed sentence can be re-read; pressing again goes further
+        back. Jumping forward goes to the start of the following unit.
+        
+        Args:
+            level (str): 'sentence', 'clause' or 'word'
+            last_shown (int): Index of the group last shown, or -1 if none
+            step (int): -1 to jump back, 1 to jump forward
+        
+        Returns:
+            int: Display group index, or None if there is nowhere to jump
+        """
+        starts = self.starts[level]
+        if not starts:
+            return None
+        if last_shown < 0:
+            return starts[0] if step > 0 else None
+        
+        unit = self.unit_of[level][last_shown]
+        if step < 0 and last_shown == starts[unit]:
+            unit -= 1  # Already at the start of this unit: go to the one before
+        target_unit = unit if step < 0 else unit + step
+        if not 0 <= target_unit < len(starts):
+            return None
+        return starts[target_unit]
+
+
+def dots_to_bits(dots):
+    """
+    Convert a list of dot positions to a bit pattern
+    
+    Args:
+        dots (list): Dot positions (1-6)
+    
+    Returns:
+        int: Bit pattern with bit (dot - 1) set for each raised dot
+    """
+    bits = 0
+    for dot in dots or []:
+        if 1 <= dot <= 6:
+            bits |= 1 << (dot - 1)
+    return bits
+
+
+def dots_to_unicode(dots):
+    """Convert dot positions to a Unicode Braille character (U+2800 block)"""
+    return chr(0x2800 + dots_to_bits(dots))
+
+
+def dots_to_brf(dots):
+    """Convert dot positions to a Braille Ready Format (ASCII Braille) character"""
+    return BRF_CHARACTERS[dots_to_bits(dots)]
+
+
+def display_group_record(index, group, offset):
+    """
+    Describe a display group as a JSON-serializable dictionary
+    
+    Args:
+        index (int): Display group index
+        group (tuple): (unit1, unit2, desc1, desc2) display group
+        offset (int): Character offset of the group in the source text
+    
+    Returns:
+        dict: Group index, character offset, cell dots and descriptions
+    """
+    unit1, unit2, desc1, desc2 = group
+    return {
+        'group': index,
+        'offset': offset,
+        'cells': [unit1, unit2],
+        'desc': [desc1, desc2]
+    }
+
+
+def format_display_sequence(display_sequence, output_format, frame_offsets=None,
+                            line_number=0, char_base=0):
+    """
+    Format a display sequence for command-line output
+    
+    Args:
+        display_sequence (list): Display groups from convert_text_to_display_sequence
+        output_format (str): 'unicode', 'brf' or 'json'
+        frame_offsets (list): Start character index of each display group
+        line_number (int): Input line number (JSON output only)
+        char_base (int): Character offset of the line in the input (JSON output only)
+    
+    Returns:
+        str: Formatted output for the line, ending with a newline
+    """
+    if output_format == 'json':
+        records = []
+        for i, group in enumerate(display_sequence):
+            offset = char_base + (frame_offsets[i] if frame_offsets else 0)
+            record = dict(line=line_number, **display_group_record(i, group, offset))
+            records.append(json.dumps(record, ensure_ascii=False))
+        return ''.join(record + '\n' for record in records)
+    
+    convert_cell = dots_to_unicode if output_format == 'unicode' else dots_to_brf
+    cells = []
+    for unit1, unit2, desc1, desc2 in display_sequence:
+        cells.append(convert_cell(unit1))
+        if unit2 is not None:
+            cells.append(convert_cell(unit2))
+    return ''.join(cells) + '\n'
+
+
+def iter_input_lines(paths):
+    """
+    Read input lines from files, or from stdin when no files are given
+    
+    EPUB, DOCX and PDF files are extracted section by section. Other
+    files are decoded in the encoding detected for them, as in the reader
+    (see open_text_file).
+    
+    Args:
+        paths (list): File paths ('-' means stdin)
+    
+    Yields:
+        str: Input lines without line endings
+    """
+    for path in paths or ['-']:
+        extractor = DOCUMENT_EXTRACTORS.get(os.path.splitext(path)[1].lower())
+        if extractor is not None:
+            # EPUB, DOCX and PDF files are extracted section by section
+            for section in extractor(path):
+                yield from section.splitlines()
+            continue
+        if path == '-':
+            stream = sys.stdin
+        else:
+            stream = open_text_file(path)
+        try:
+            for line in stream:
+                yield line.rstrip('\r\n')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def translate_stream(lines, output_format='unicode', out=None, progress=False):
+    """
+    Translate lines of text to Braille and write them out as they are converted
+    
+    Args:
+        lines (iterable): Lines of input text
+        output_format (str): 'unicode', 'brf' or 'json'
+        out (file): Output stream (default stdout)
+        progress (bool): Report progress and throughput on stderr
+    
+    Returns:
+        dict: Totals - lines, characters, groups and seconds
+    """
+    out = out or sys.stdout
+    stats = {'lines': 0, 'characters': 0, 'groups': 0, 'seconds': 0.0}
+    start = last_report = time.monotonic()
+    
+    for line_number, line in enumerate(lines):
+        frame_offsets = []
+        display_sequence, char_data = convert_text_to_display_sequence(line, frame_offsets)
+        out.write(format_display_sequence(
+            display_sequence, output_format, frame_offsets,
+            line_number, stats['characters']
+        ))
+        
+        stats['lines'] += 1
+        stats['characters'] += len(line) + 1
+        stats['groups'] += len(display_sequence)
+        
+        now = time.monotonic()
+        if progress and now - last_report >= PROGRESS_REPORT_INTERVAL:
+            out.flush()
+            report_throughput(stats, now - start)
+            last_report = now
+    
+    out.flush()
+    stats['seconds'] = time.monotonic() - start
+    if progress:
+        report_throughput(stats, stats['seconds'], final=True)
+    return stats
+
+
+def report_throughput(stats, elapsed, final=False):
+    """
+    Print translation progress and throughput to stderr
+    
+    Args:
+        stats (dict): Running totals from translate_stream
+        elapsed (float): Seconds since translation started
+        final (bool): Whether this is the final report
+    """
+    rate = stats['characters'] / elapsed if elapsed > 0 else 0.0
+    group_rate = stats['groups'] / elapsed if elapsed > 0 else 0.0
+    label = "Done" if final else "Progress"
+    print(f"{label}: {stats['lines']} lines, {stats['characters']} characters, "
+          f"{stats['groups']} groups in {elapsed:.2f}s "
+          f"({rate:.0f} chars/s, {group_rate:.0f} groups/s)",
+          file=sys.stderr, flush=True)
+
+
+def translate_for_service(text):
+    """
+    Translate one text for the translation service (runs in a worker process)
+    
+    Args:
+        text (str): Text to translate
+    
+    Returns:
+        dict: Display groups plus Unicode Braille and BRF renderings
+    """
+    frame_offsets = []
+    display_sequence, char_data = convert_text_to_display_sequence(text, frame_offsets)
+    return {
+        'characters': len(text),
+        'groups': [
+            display_group_record(i, group, frame_offsets[i])
+            for i, group in enumerate(display_sequence)
+        ],
+        'unicode': format_display_sequence(display_sequence, 'unicode').rstrip('\n'),
+        'brf': format_display_sequence(display_sequence, 'brf').rstrip('\n')
+    }
+
+
+class TranslationRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler for the local translation service
+    
+    Endpoints:
+        GET  /health            - service status
+        POST /translate         - {"text": "..."} -> one translation
+        POST /translate/batch   - {"texts": [...]} -> {"results": [...]}
+        POST /translate/stream  - {"text": ...} or {"texts": [...]} -> one JSON
+                                  display group per line, streamed as each
+                                  text is translated (chunked encoding); a
+                                  failure part way through ends the stream
+                                  with an {"error": ...} line
+    
+    HTTP/1.1 is used so clients can keep connections alive between requests.
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    server_version = 'SenTranslator/1.0'
+    # Headers and body are written separately; without TCP_NODELAY a
+    # keep-alive client waits on delayed ACKs for every response
+    disable_nagle_algorithm = True
+    
+    def log_message(self, format, *args):
+        """Only log requests when the server runs in verbose mode"""
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def send_json(self, status, payload):
+        """Send a complete JSON response with a Content-Length for keep-alive"""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_chunk(self, data):
+        """Send one chunk of a chunked response"""
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+    
+    def read_json(self):
+        """
+        Read the JSON request body
+        
+        Returns:
+            dict: Parsed body, or None after an error response has been sent
+        """
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > SERVICE_MAX_REQUEST_BYTES:
+            self.send_json(413, {'error': 'Request body missing or too large'})
+            self.close_connection = True
+            return None
+        try:
+            payload = json.loads(self.rfile.read(length).decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            self.send_json(400, {'error': f"Invalid JSON: {str(e)}"})
+            return None
+        if not isinstance(payload, dict):
+            self.send_json(400, {'error': 'Request body must be a JSON object'})
+            return None
+        return payload
+    
+    def read_texts(self, payload, allow_single=True):
+        """
+        Get the list of texts from a request payload
+        
+        Returns:
+            list: Texts to translate, or None after an error response has been sent
+        """
+        if allow_single and isinstance(payload.get('text'), str):
+            return [payload['text']]
+        texts = payload.get('texts')
+        if isinstance(texts, list) and all(isinstance(text, str) for text in texts):
+            return texts
+        self.send_json(400, {'error': 'Expected "text" (string) or "texts" (list of strings)'})
+        return None
+    
+    def do_GET(self):
+        """Handle GET requests"""
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok', 'workers': self.server.workers})
+        else:
+            self.send_json(404, {'error': 'Not found'})
+    
+    def do_POST(self):
+        """Handle POST requests"""
+        if self.path not in ('/translate', '/translate/batch', '/translate/stream'):
+            self.send_json(404, {'error': 'Not found'})
+            self.close_connection = True
+            return
+        
+        payload = self.read_json()
+        if payload is None:
+            return
+        
+        try:
+            if self.path == '/translate':
+                if not isinstance(payload.get('text'), str):
+                    self.send_json(400, {'error': 'Expected "text" (string)'})
+                    return
+                result = self.server.executor.submit(translate_for_service, payload['text']).result()
+                self.send_json(200, result)
+            
+            elif self.path == '/translate/batch':
+                texts = self.read_texts(payload, allow_single=False)
+                if texts is not None:
+                    results = list(self.server.executor.map(translate_for_service, texts))
+                    self.send_json(200, {'results': results})
+            
+            else:
+                texts = self.read_texts(payload)
+                if texts is not None:
+                    self.stream_translations(texts)
+        
+        except Exception as e:
+            self.send_json(500, {'error': f"Translation failed: {str(e)}"})
+    
+    def stream_translations(self, texts):
+        """
+        Stream display groups of each text, in order, as soon as it is translated
+        
+        The 200 status is already sent when a translation fails, so the
+        error is reported as the last line of the stream and the
+        connection is closed.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        
+        futures = [self.server.executor.submit(translate_for_service, text) for text in texts]
+        try:
+            for text_index, future in enumerate(futures):
+                result = future.result()
+                lines = [
+                    json.dumps(dict(text=text_index, **group), ensure_ascii=False) + '\n'
+                    for group in result['groups']
+                ]
+                if lines:
+                    self.send_chunk(''.join(lines).encode('utf-8'))
+                    self.wfile.flush()
+        except OSError:
+            # Client went away: nothing more can be sent
+            self.close_connection = True
+            return
+        except Exception as e:
+            for future in futures:
+                future.cancel()
+            error = json.dumps({'error': f"Translation failed: {str(e)}"}, ensure_ascii=False) + '\n'
+            self.send_chunk(error.encode('utf-8'))
+            self.close_connection = True
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def run_translation_service(host=SERVICE_HOST, port=SERVICE_PORT,
+                            workers=SERVICE_WORKERS, verbose=False):
+    """
+    Run the local HTTP translation service until interrupted
+    
+    Requests are handled on threads and translation runs in a pool of
+    worker processes, so several texts are translated in parallel.
+    
+    Args:
+        host (str): Address to listen on
+        port (int): Port to listen on
+        workers (int): Number of translation worker processes
+        verbose (bool): Log every request
+    """
+    server = ThreadingHTTPServer((host, port), TranslationRequestHandler)
+    server.daemon_threads = True
+    server.workers = workers
+    server.verbose = verbose
+    server.executor = ProcessPoolExecutor(max_workers=workers)
+    
+    print(f"Translation service listening on http://{host}:{port} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nTranslation service stopped")
+    finally:
+        server.server_close()
+        server.executor.shutdown(cancel_futures=True)
+
+
+class WebPageCache:
+    """
+    Disk cache of text extracted from web pages
+    
+    Each page is stored as a JSON file named by a hash of its URL, holding
+    the extracted text and the ETag/Last-Modified validators the server
+    sent. Like TTSAudioCache, reads refresh the modification time and the
+    least recently used pages are evicted above the size limit.
+    
+    Entries also record how the text was extracted (extraction_settings())
+    and whether the download was cut short. Text extracted differently,
+    or from a truncated download, is not reused: the page is fetched again.
+    """
+    
+    def __init__(self, directory=WEB_CACHE_DIR, max_bytes=WEB_CACHE_MAX_BYTES):
+        """
+        Initialize the cache (the directory is created on first write)
+        
+        Args:
+            directory (str): Cache directory
+            max_bytes (int): Size limit for all cached pages
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+        self.lock = threading.Lock()
+    
+    def path(self, url):
+        """Get the file path of a cached page"""
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+    
+    def get(self, url):
+        """
+        Look up a cached page
+        
+        Args:
+            url (str): Page URL
+        
+        Returns:
+            dict: Entry with url, etag, last_modified, size and text, or None
+                  if there is no complete entry extracted with the current settings
+        """
+        path = self.path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+        if (entry.get('url') != url or entry.get('truncated', True)
+                or entry.get('extraction') != extraction_settings()):
+            return None
+        return entry
+    
+    def validators(self, entry):
+        """
+        Get conditional request headers for a cached page
+        
+        Args:
+            entry (dict): Cached entry, or None
+        
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def put(self, url, response, text, size, truncated=False):
+        """
+        Store the text of a page if the response has validators
+        
+        Args:
+            url (str): Page URL
+            response (requests.Response): Full (200) response for the page
+            text (str): Text extracted from the page
+            size (int): Bytes downloaded to extract the text
+            truncated (bool): The download stopped at WEB_MAX_DOWNLOAD_BYTES
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+        entry = {'url': url, 'etag': etag, 'last_modified': last_modified,
+                 'size': size, 'text': text, 'truncated': truncated,
+                 'extraction': extraction_settings()}
+        path = self.path(url)
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            evict_lru_files(self.directory, '.json', self.max_bytes, keep=path)
+    
+    def record(self, entry, response, size=0):
+        """
+        Count a request and the bytes it transferred or saved
+        
+        Args:
+            entry (dict): Cached entry the request was validated against, or None
+            response (requests.Response): Server response
+            size (int): Bytes downloaded
+        """
+        with self.lock:
+            self.requests += 1
+            if response.status_code == 304 and entry is not None:
+                self.not_modified += 1
+                self.bytes_saved += entry['size']
+            else:
+                self.bytes_downloaded += size
+    
+    def stats(self):
+        """
+        Get cache counters
+        
+        Returns:
+            dict: Requests, 304 hits, hit rate, and bytes downloaded and saved
+        """
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'not_modified': self.not_modified,
+                'hit_rate': self.not_modified / self.requests if self.requests else 0.0,
+                'bytes_downloaded': self.bytes_downloaded,
+                'bytes_saved': self.bytes_saved
+            }
+
+
+# Shared web page cache and HTTP session (created on first use)
+web_cache = WebPageCache()
+web_session = None
+
+
+def get_web_session():
+    """
+    Get the shared HTTP session for web extraction
+    
+    Connections are pooled, so revisiting a site reuses its TCP/TLS connection.
+    
+    Returns:
+        requests.Session: The session, or None if requests is not installed
+    """
+    global web_session
+    
+    if web_session is None and requests is not None:
+        web_session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        web_session.mount('http://', adapter)
+        web_session.mount('https://', adapter)
+        web_session.headers['User-Agent'] = WEB_USER_AGENT
+    return web_session
+
+
+class ContentScorer:
+    """
+    Readability-style main content extractor
+    
+    Receives parser events (start, end, data, close - the lxml parser
+    target interface) and splits the page into paragraphs, each remembering
+    its enclosing block elements. Once parsing is done every paragraph
+    votes for its parent (full score), grandparent (half) and great-
+    grandparent (third); the container with the best score, adjusted for
+    class/id hints and link density, is taken as the article body.
+    """
+    
+    def __init__(self, scan_chars=WEB_CONTENT_SCAN_CHARS):
+        """
+        Initialize the scorer
+        
+        Args:
+            scan_chars (int): Paragraph text after which done becomes True
+                              (None to always read the whole page)
+        """
+        self.scan_chars = scan_chars
+        self.stack = []       # Open block elements: (tag, node id)
+        self.weights = [0]    # Class/id/tag weight by node id
+        self.skip_depth = 0
+        self.link_depth = 0
+        self.buffer = []
+        self.link_chars = 0
+        self.paragraphs = []  # (text, link characters, ancestor node ids, nearest first)
+        self.scanned = 0
+    
+    @property
+    def done(self):
+        """True once enough of the page has been seen to pick the content"""
+        return self.scan_chars is not None and self.scanned >= self.scan_chars
+    
+    def start(self, tag, attrib):
+        if tag in CONTENT_SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif self.skip_depth:
+            return
+        elif tag == 'a':
+            self.link_depth += 1
+        elif tag == 'br':
+            self.buffer.append(' ')
+        elif tag in CONTENT_BLOCK_TAGS:
+            self.flush()
+            self.stack.append((tag, len(self.weights)))
+            self.weights.append(self.weight(tag, attrib))
+    
+    def end(self, tag):
+        if tag in CONTENT_SKIPPED_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif self.skip_depth:
+            return
+        elif tag == 'a':
+            self.link_depth = max(0, self.link_depth - 1)
+        elif tag in CONTENT_BLOCK_TAGS:
+            self.flush()
+            # Close the element, and any left open inside it
+            for i in range(len(self.stack) - 1, -1, -1):
+                if self.stack[i][0] == tag:
+                    del self.stack[i:]
+                    break
+    
+    def data(self, data):
+        if self.skip_depth:
+            return
+        self.buffer.append(data)
+        if self.link_depth:
+            self.link_chars += len(data.strip())
+    
+    def close(self):
+        self.flush()
+    
+    def flush(self):
+        """End the current paragraph"""
+        text = ' '.join(''.join(self.buffer).split())
+        if text:
+            ancestors = tuple(node for tag, node in reversed(self.stack))
+            self.paragraphs.append((text, min(self.link_chars, len(text)), ancestors))
+            self.scanned += len(text)
+        self.buffer = []
+        self.link_chars = 0
+    
+    @staticmethod
+    def weight(tag, attrib):
+        """
+        Get the prior weight of an element from its tag, class and id
+        
+        Args:
+            tag (str): Tag name
+            attrib (dict): Attributes
+        
+        Returns:
+            int: Positive for likely content, negative for likely boilerplate
+        """
+        weight = CONTENT_TAG_WEIGHTS.get(tag, 0)
+        names = f"{attrib.get('class') or ''} {attrib.get('id') or ''}".lower()
+        for name in re.split(r'[^a-z0-9]+', names):
+            if CONTENT_NEGATIVE_NAMES.match(name):
+                weight -= 25
+            elif CONTENT_POSITIVE_NAMES.match(name):
+                weight += 25
+        return weight
+    
+    def best_container(self):
+        """
+        Pick the container holding the main content
+        
+        Returns:
+            int: Node id of the best container, or None if no paragraph
+                 was long enough to vote
+        """
+        scores = {}
+        text_chars = {}
+        link_chars = {}
+        for text, links, ancestors in self.paragraphs:
+            for node in ancestors:
+                text_chars[node] = text_chars.get(node, 0) + len(text)
+                link_chars[node] = link_chars.get(node, 0) + links
+            if len(text) < CONTENT_MIN_PARAGRAPH_CHARS:
+                continue
+            score = 1 + sum(text.count(mark) for mark in CONTENT_PUNCTUATION) + min(len(text) // 100, 3)
+            for level, node in enumerate(ancestors[:3]):
+                scores[node] = scores.get(node, 0) + score / (level + 1)
+        
+        best, best_score = None, None
+        for node, score in scores.items():
+            score = (score + self.weights[node]) * (1 - link_chars[node] / text_chars[node])
+            if best_score is None or score > best_score:
+                best, best_score = node, score
+        return best
+    
+    def text(self, limit=None, main_only=True):
+        """
+        Get the extracted text
+        
+        Args:
+            limit (int): Maximum characters to return (None for no limit)
+            main_only (bool): Only the main content, rather than all text
+        
+        Returns:
+            str: Paragraphs joined by spaces (all text if no main content was found)
+        """
+        best = self.best_container() if main_only else None
+        parts = []
+        length = 0
+        for text, links, ancestors in self.paragraphs:
+            if best is not None and (best not in ancestors or links > len(text) * CONTENT_MAX_LINK_DENSITY):
+                continue
+            parts.append(text)
+            length += len(text) + 1
+            if limit is not None and length > limit:
+                break
+        text = ' '.join(parts)
+        return text[:limit] if limit is not None else text
+
+
+class HTMLParserFeed(HTMLParser):
+    """Drives a parser target (e.g. ContentScorer) from the standard library HTMLParser"""
+    
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+    
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+    
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+    
+    def handle_data(self, data):
+        self.target.data(data)
+    
+    def close(self):
+        super().close()
+        self.target.close()
+
+
+class SelectolaxFeed:
+    """
+    Drives a parser target from selectolax (lexbor)
+    
+    Non-streaming backend: selectolax only parses whole documents, so
+    chunks are collected and the tree is walked on close. The target sees
+    nothing until then and cannot end the download early, so
+    stream_page_text caps how much is buffered instead
+    (WEB_BUFFERED_PARSE_BYTES with a text limit, WEB_MAX_DOWNLOAD_BYTES
+    otherwise).
+    """
+    
+    def __init__(self, target):
+        self.target = target
+        self.chunks = []
+    
+    def feed(self, data):
+        self.chunks.append(data)
+    
+    def close(self):
+        root = LexborHTMLParser(''.join(self.chunks)).root
+        self.chunks = []
+        if root is not None:
+            # Depth-first walk without recursion (pages can nest deeply)
+            pending = [(root, False)]
+            while pending:
+                node, closing = pending.pop()
+                if closing:
+                    self.target.end(node.tag)
+                elif node.tag == '-text':
+                    self.target.data(node.text(deep=False))
+                elif not node.tag.startswith('-'):
+                    self.target.start(node.tag, node.attributes)
+                    pending.append((node, True))
+                    pending.extend((child, False) for child in reversed(list(node.iter(include_text=True))))
+        self.target.close()
+
+
+def available_parser_backends():
+    """
+    List the installed HTML parser backends, fastest first
+    
+    Returns:
+        list: Backend names ('lxml', 'selectolax', 'html.parser')
+    """
+    backends = []
+    if lxml_etree is not None:
+        backends.append('lxml')
+    if LexborHTMLParser is not None:
+        backends.append('selectolax')
+    backends.append('html.parser')
+    return backends
+
+
+def create_content_parser(target, backend=WEB_PARSER_BACKEND):
+    """
+    Create an incremental HTML parser that sends its events to target
+    
+    Args:
+        target: Parser target with start/end/data/close methods
+        backend (str): 'auto', 'lxml', 'selectolax' or 'html.parser'
+    
+    Returns:
+        Parser with feed(text) and close() methods
+    
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if backend == 'auto':
+        backend = available_parser_backends()[0]
+    if backend not in available_parser_backends():
+        raise ValueError(f"HTML parser backend not available: {backend}")
+    if backend == 'lxml':
+        return lxml_etree.HTMLParser(target=target)
+    if backend == 'selectolax':
+        return SelectolaxFeed(target)
+    return HTMLParserFeed(target)
+
+
+def detect_html_encoding(response, head):
+    """
+    Choose the text encoding of an HTML response
+    
+    Uses the charset from the Content-Type header, then a <meta> charset
+    in the first chunk, then UTF-8. GB2312 and GBK are read as GB18030,
+    their superset, since pages labelled GB2312 often use GBK characters.
+    
+    Args:
+        response (requests.Response): Streaming response
+        head (bytes): First chunk of the body
+    
+    Returns:
+        str: Codec name
+    """
+    encoding = None
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        encoding = response.encoding
+    else:
+        match = re.search(rb'<meta[^>]+charset\s*=\s*["\']?([\w-]+)', head, re.IGNORECASE)
+        if match:
+            encoding = match.group(1).decode('ascii')
+    try:
+        encoding = codecs.lookup(encoding or 'utf-8').name
+    except LookupError:
+        encoding = 'utf-8'
+    return 'gb18030' if encoding in ('gb2312', 'gbk') else encoding
+
+
+def extraction_settings():
+    """
+    Describe how page text is extracted, for checking cached text
+    
+    Returns:
+        dict: Extractor version, text limit and parser backend
+    """
+    backend = WEB_PARSER_BACKEND
+    if backend == 'auto':
+        backend = available_parser_backends()[0]
+    return {'version': WEB_EXTRACTOR_VERSION, 'limit': WEB_TEXT_LIMIT, 'backend': backend}
+
+
+def check_deadline(deadline):
+    """
+    Give up on a download that has run past its deadline
+    
+    Args:
+        deadline (float): time.monotonic() value, or None for no deadline
+    
+    Raises:
+        TimeoutError: If the deadline has passed
+    """
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError("download took too long")
+
+
+def stream_page_text(response, limit=WEB_TEXT_LIMIT, deadline=None):
+    """
+    Extract the main text of a streaming response
+    
+    The page is parsed as it downloads. With a limit, the download stops
+    once enough of the page has been seen to pick the main content, or
+    for the non-streaming selectolax backend once WEB_BUFFERED_PARSE_BYTES
+    have been buffered.
+    
+    Args:
+        response (requests.Response): Response opened with stream=True
+        limit (int): Characters of text wanted (None for the whole article)
+        deadline (float): time.monotonic() by which the download must finish
+    
+    Returns:
+        tuple: (text, size, truncated) - extracted text, bytes downloaded,
+               and whether the download stopped before the main content
+               had been seen (at WEB_MAX_DOWNLOAD_BYTES or the buffer limit)
+    
+    Raises:
+        TimeoutError: If the deadline passes during the download
+    """
+    scorer = ContentScorer(WEB_CONTENT_SCAN_CHARS if limit is not None else None)
+    parser = create_content_parser(scorer)
+    max_bytes = WEB_MAX_DOWNLOAD_BYTES
+    if limit is not None and isinstance(parser, SelectolaxFeed):
+        max_bytes = min(max_bytes, WEB_BUFFERED_PARSE_BYTES)
+    decoder = None
+    size = 0
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size=WEB_CHUNK_BYTES):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(detect_html_encoding(response, chunk))('replace')
+            size += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            check_deadline(deadline)
+            if scorer.done:
+                break
+            if size >= max_bytes:
+                truncated = True
+                break
+        else:
+            if decoder is not None:
+                parser.feed(decoder.decode(b'', final=True))
+        if decoder is not None:
+            parser.close()  # Nothing to close for an empty page
+    finally:
+        response.close()  # Drops the rest of the download if we stopped early
+    return scorer.text(limit), size, truncated
+
+
+def parse_feed(data, base_url=''):
+    """
+    Parse an RSS or Atom feed
+    
+    Args:
+        data (bytes): Feed document
+        base_url (str): Feed URL, for resolving relative entry links
+    
+    Returns:
+        list: (title, link) of each entry, in feed order
+    
+    Raises:
+        ValueError: If the document is not a feed
+    """
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError as e:
+        raise ValueError(f"invalid feed: {str(e)}")
+    
+    entries = []
+    for element in root.iter():
+        if element.tag.rsplit('}', 1)[-1] not in ('item', 'entry'):
+            continue
+        title, link = '', None
+        for child in element:
+            name = child.tag.rsplit('}', 1)[-1]
+            if name == 'title':
+                title = ' '.join((child.text or '').split())
+            elif name == 'link' and link is None:
+                # RSS puts the URL in the text, Atom in href (skip non-alternate Atom links)
+                if child.get('href') and child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href')
+                elif child.text and child.text.strip():
+                    link = child.text.strip()
+        if link:
+            entries.append((title, urllib.parse.urljoin(base_url, link)))
+    
+    if not entries and root.tag.rsplit('}', 1)[-1] not in ('rss', 'feed', 'RDF'):
+        raise ValueError("not an RSS or Atom feed")
+    return entries
+
+
+def fetch_url(url, timeout=None):
+    """
+    Fetch the main text of a page, or the entries of a feed
+    
+    Pages are parsed as they download and only their main content (the
+    article body, not menus or footers) is kept. Pages seen before are
+    revalidated with a conditional GET; if the server answers 304 Not
+    Modified the stored text is reused without downloading or parsing.
+    Text stored by other extraction settings, or from a download cut off
+    at WEB_MAX_DOWNLOAD_BYTES, is not reused and the page is fetched again.
+    Responses with an RSS/Atom/XML content type are parsed as feeds.
+    
+    The timeout is enforced here, in the thread doing the download, so an
+    abandoned fetch does not keep a worker busy: no socket read waits past
+    the deadline, and the download stops between chunks once it has passed.
+    
+    Args:
+        url (str): Page or feed URL
+        timeout (float): Seconds allowed for the whole page, or None for
+                         only the per-read WEB_TIMEOUT
+    
+    Returns:
+        tuple: (text, entries) - the page text and None, or None and the
+               feed's (title, link) entries
+    
+    Raises:
+        RuntimeError: If requests is not installed
+        requests.RequestException: If the download failed
+        TimeoutError: If the page took longer than the timeout
+        ValueError: If a feed could not be parsed
+    """
+    session = get_web_session()
+    if session is None:
+        raise RuntimeError("requests is required")
+    
+    deadline = None
+    socket_timeout = WEB_TIMEOUT
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        socket_timeout = tuple(min(limit, timeout) for limit in WEB_TIMEOUT)
+    
+    entry = web_cache.get(url)
+    response = session.get(url, headers=web_cache.validators(entry),
+                           timeout=socket_timeout, stream=True)
+    if response.status_code == 304 and entry is not None:
+        response.close()
+        web_cache.record(entry, response)
+        return entry['text'], None
+    
+    if response.status_code >= 400:
+        response.close()
+        web_cache.record(entry, response)
+        response.raise_for_status()
+    
+    content_type = response.headers.get('Content-Type', '').lower()
+    if 'rss' in content_type or 'atom' in content_type or (
+            'xml' in content_type and 'html' not in content_type):
+        data = bytearray()
+        try:
+            for chunk in response.iter_content(chunk_size=WEB_CHUNK_BYTES):
+                data += chunk
+                check_deadline(deadline)
+                if len(data) >= WEB_MAX_DOWNLOAD_BYTES:
+                    break
+        finally:
+            response.close()
+        data = bytes(data[:WEB_MAX_DOWNLOAD_BYTES])
+        web_cache.record(None, response, len(data))
+        return None, parse_feed(data, response.url)
+    
+    text, size, truncated = stream_page_text(response, WEB_TEXT_LIMIT, deadline)
+    web_cache.record(entry, response, size)
+    if response.status_code == 200:
+        web_cache.put(url, response, text, size, truncated)
+    return text, None
+
+
+def extract_text_from_url(url):
+    """
+    Extract text content from a webpage (or from every entry of a feed)
+    
+    Args:
+        url (str): URL to extract text from
+    
+    Returns:
+        str: Extracted text
+    """
+    try:
+        text, entries = fetch_url(url)
+        if entries is not None:
+            return extract_text_from_urls([link for title, link in entries])
+        return text
+    except Exception as e:
+        return f"Extraction failed: {str(e)}"
+
+
+class ReadingListFetcher:
+    """
+    Concurrent fetcher for reading lists and feeds
+    
+    Pages are fetched on a thread pool driven by asyncio, with a limit on
+    pages in flight overall and per host and a timeout per page. Feeds are
+    expanded into their entries. Results are produced as each page finishes,
+    so translation can start on the first page while the rest download.
+    """
+    
+    def __init__(self, concurrency=FETCH_CONCURRENCY, per_host=FETCH_PER_HOST,
+                 timeout=FETCH_TIMEOUT, max_entries=FEED_MAX_ENTRIES):
+        """
+        Initialize the fetcher
+        
+        Args:
+            concurrency (int): Pages fetched at once
+            per_host (int): Pages fetched at once from one host
+            timeout (float): Seconds allowed per page
+            max_entries (int): Entries fetched per feed
+        """
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_entries = max_entries
+        
+        self.fetched = 0
+        self.failed = 0
+        self.feeds = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def fetch(self, urls):
+        """
+        Fetch pages and feeds concurrently
+        
+        Args:
+            urls (list): Page or feed URLs
+        
+        Yields:
+            dict: Result of each page (url, title, text, error, seconds), in
+                  the order the pages finish
+        """
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self.limit = asyncio.Semaphore(self.concurrency)
+        self.host_limits = {}
+        tasks = {asyncio.ensure_future(self.fetch_one(url, '', expand=True)) for url in urls}
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result, entries = task.result()
+                    if entries is None:
+                        yield result
+                        continue
+                    self.feeds += 1
+                    for title, link in entries[:self.max_entries]:
+                        tasks.add(asyncio.ensure_future(self.fetch_one(link, title)))
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.executor.shutdown(wait=False)
+    
+    async def fetch_one(self, url, title, expand=False):
+        """
+        Fetch one URL within the concurrency limits
+        
+        Args:
+            url (str): Page or feed URL
+            title (str): Title from the feed, if any
+            expand (bool): Return feed entries instead of treating a feed as an error
+        
+        Returns:
+            tuple: (result, entries) - entries is None unless the URL was a
+                   feed and expand is True
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        host_limit = self.host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+        result = {'url': url, 'title': title, 'text': None, 'error': None, 'seconds': 0.0}
+        
+        # Take the host slot first, so a busy host never holds global slots
+        async with host_limit, self.limit:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            start = time.perf_counter()
+            try:
+                # The timeout is applied inside the worker thread: cancelling
+                # an await here would leave the thread busy with the download
+                loop = asyncio.get_running_loop()
+                text, entries = await loop.run_in_executor(self.executor, fetch_url, url, self.timeout)
+                if entries is not None:
+                    if expand:
+                        return result, entries
+                    raise ValueError("feed entry is itself a feed")
+                result['text'] = text
+                self.fetched += 1
+            except Exception as e:
+                timed_out = isinstance(e, TimeoutError) or (requests is not None and isinstance(e, requests.Timeout))
+                result['error'] = f"timed out after {self.timeout:.0f}s" if timed_out else str(e)
+                self.failed += 1
+            finally:
+                result['seconds'] = time.perf_counter() - start
+                self.in_flight -= 1
+        return result, None
+    
+    def stats(self):
+        """
+        Get fetch counters
+        
+        Returns:
+            dict: Pages fetched and failed, feeds expanded and peak pages in flight
+        """
+        return {
+            'fetched': self.fetched,
+            'failed': self.failed,
+            'feeds': self.feeds,
+            'max_in_flight': self.max_in_flight
+        }
+
+
+def fetch_reading_list(urls, fetcher=None):
+    """
+    Fetch pages and feeds concurrently, yielding each page as it finishes
+    
+    The asyncio loop runs on a background thread, so this can be consumed
+    from ordinary (blocking) code.
+    
+    Args:
+        urls (list): Page or feed URLs
+        fetcher (ReadingListFetcher): Fetcher to use (default settings if None)
+    
+    Yields:
+        dict: Result of each page (url, title, text, error, seconds)
+    """
+    fetcher = fetcher or ReadingListFetcher()
+    results = queue.Queue()
+    
+    async def collect():
+        async for result in fetcher.fetch(urls):
+            results.put(result)
+    
+    def run():
+        try:
+            asyncio.run(collect())
+        finally:
+            results.put(None)
+    
+    threading.Thread(target=run, daemon=True).start()
+    while True:
+        result = results.get()
+        if result is None:
+            break
+        yield result
+
+
+def extract_text_from_urls(urls):
+    """
+    Extract the text of several pages and feeds, fetched concurrently
+    
+    Args:
+        urls (list): Page or feed URLs
+    
+    Returns:
+        str: Text of every page that could be fetched, in the order they finished
+    """
+    texts = []
+    errors = []
+    for result in fetch_reading_list(urls):
+        if result['error']:
+            print(f"Skipped {result['url']}: {result['error']}")
+            errors.append(result['error'])
+        elif result['text']:
+            texts.append(f"{result['title']}：{result['text']}" if result['title'] else result['text'])
+    if not texts:
+        return f"Extraction failed: {errors[0] if errors else 'no pages found'}"
+    return ' '.join(texts)
+
+
+def iter_fetched_lines(urls, progress=False):
+    """
+    Fetch pages and feeds and yield each page's text as one input line
+    
+    Args:
+        urls (list): Page or feed URLs
+        progress (bool): Report each page and the fetch totals on stderr
+    
+    Yields:
+        str: Text of each page, in the order the pages finish
+    """
+    fetcher = ReadingListFetcher()
+    for result in fetch_reading_list(urls, fetcher):
+        if result['error']:
+            print(f"Skipped {result['url']}: {result['error']}", file=sys.stderr, flush=True)
+            continue
+        if progress:
+            print(f"Fetched {result['url']} in {result['seconds']:.2f}s", file=sys.stderr, flush=True)
+        yield ' '.join(result['text'].split())
+    if progress:
+        print(f"Fetch: {fetcher.stats()}", file=sys.stderr, flush=True)
+
+
+def iter_epub_chapters(path, start=0):
+    """
+    Stream the chapters of an EPUB book in reading order
+    
+    Chapters are read from the archive one at a time as the generator
+    advances, following the spine of the package document.
+    
+    Args:
+        path (str): EPUB file path
+        start (int): Number of chapters to skip (they are not read)
+    
+    Yields:
+        str: Text of each chapter (empty for chapters without text)
+    """
+    with zipfile.ZipFile(path) as archive:
+        container = ElementTree.fromstring(archive.read('META-INF/container.xml'))
+        package_path = container.find('.//{*}rootfile').get('full-path')
+        package = ElementTree.fromstring(archive.read(package_path))
+        base = posixpath.dirname(package_path)
+        manifest = {item.get('id'): item for item in package.findall('.//{*}item')}
+        
+        chapters = [manifest.get(itemref.get('idref')) for itemref in package.findall('.//{*}itemref')]
+        chapters = [item for item in chapters if item is not None and 'html' in item.get('media-type', '')]
+        
+        for item in chapters[start:]:
+            name = posixpath.normpath(posixpath.join(base, urllib.parse.unquote(item.get('href'))))
+            scorer = ContentScorer(None)
+            parser = create_content_parser(scorer)
+            parser.feed(archive.read(name).decode('utf-8', errors='replace'))
+            parser.close()
+            yield scorer.text(main_only=False)
+
+
+def iter_docx_paragraphs(path, start=0):
+    """
+    Stream the paragraphs of a Word (.docx) document
+    
+    document.xml is parsed incrementally and each finished paragraph or
+    table is dropped from the tree, so memory use does not grow with the
+    length of the document.
+    
+    Args:
+        path (str): DOCX file path
+        start (int): Number of paragraphs to skip
+    
+    Yields:
+        str: Text of each paragraph (empty for blank paragraphs)
+    """
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as stream:
+        parts = []
+        open_elements = []
+        count = 0
+        for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                open_elements.append(element)
+                continue
+            open_elements.pop()
+            tag = element.tag.rpartition('}')[2]
+            if tag == 't':
+                parts.append(element.text or '')
+            elif tag == 'tab':
+                parts.append(' ')
+            elif tag in ('br', 'cr'):
+                parts.append('\n')
+            elif tag == 'p':
+                text = ''.join(parts)
+                parts = []
+                count += 1
+                if count > start:
+                    yield text
+            # Children of <w:body> are finished paragraphs and tables
+            if len(open_elements) == 2:
+                open_elements[-1].remove(element)
+
+
+def iter_pdf_pages(path, start=0):
+    """
+    Stream the pages of a PDF document
+    
+    Uses pypdf when installed, otherwise reads the output of pdftotext
+    (poppler-utils) as it is produced.
+    
+    Args:
+        path (str): PDF file path
+        start (int): Number of pages to skip
+    
+    Yields:
+        str: Text of each page (empty for pages without text)
+    
+    Raises:
+        RuntimeError: If neither pypdf nor pdftotext is available
+    """
+    if PdfReader is not None:
+        # Given a path, pypdf reads the whole file into memory; given an open
+        # file, it reads each object when a page needs it
+        with open(path, 'rb') as f:
+            pages = PdfReader(f).pages
+            for number in range(start, len(pages)):
+                yield pages[number].extract_text() or ''
+        return
+    
+    if shutil.which('pdftotext') is None:
+        raise RuntimeError("PDF support needs pypdf (pip3 install pypdf) or pdftotext (poppler-utils)")
+    process = subprocess.Popen(['pdftotext', '-enc', 'UTF-8', '-f', str(start + 1), path, '-'],
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        # Pages are separated by form feeds
+        page = []
+        for line in io.TextIOWrapper(process.stdout, encoding='utf-8', errors='replace'):
+            *finished, rest = line.split('\f')
+            for part in finished:
+                page.append(part)
+                yield ''.join(page)
+                page = []
+            page.append(rest)
+        text = ''.join(page)
+        if text.strip():
+            yield text
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+# Streaming extractors by file extension
+DOCUMENT_EXTRACTORS = {
+    '.epub': iter_epub_chapters,
+    '.docx': iter_docx_paragraphs,
+    '.pdf': iter_pdf_pages,
+}
+
+
+def extract_text_from_file(filepath):
+    """
+    Extract text from a file
+    
+    Args:
+        filepath (str): Path to a text, EPUB, DOCX or PDF file
+    
+    Returns:
+        str: Extracted text (use open_document to read long files page by page)
+    """
+    try:
+        extractor = DOCUMENT_EXTRACTORS.get(os.path.splitext(filepath)[1].lower())
+        if extractor is not None:
+            return '\n'.join(section for section in extractor(filepath) if section.strip())
+        text_file = MappedTextFile(filepath)
+        try:
+            return text_file.read(0)[0]
+        finally:
+            text_file.close()
+    except Exception as e:
+        return f"File read failed: {str(e)}"
+
+
+def ink_mask(image, window=OCR_BINARIZE_WINDOW, offset=OCR_BINARIZE_OFFSET):
+    """
+    Adaptive threshold: mark pixels clearly darker than their neighbourhood
+    
+    Comparing each pixel with the mean of its surroundings, rather than one
+    global threshold, copes with the uneven lighting of camera photos.
+    
+    Args:
+        image (PIL.Image): Grayscale image
+        window (int): Neighbourhood size in pixels
+        offset (int): Required difference from the neighbourhood mean
+    
+    Returns:
+        PIL.Image: Mask with ink 255 and background 0
+    """
+    local_mean = image.filter(ImageFilter.BoxBlur(window // 2))
+    darkness = ImageChops.subtract(local_mean, image)
+    return darkness.point(lambda value: 255 if value > offset else 0)
+
+
+def row_profile(mask):
+    """Fraction of ink in each row of a mask (0-255 per row)"""
+    return list(mask.resize((1, mask.height), Image.BOX).getdata())
+
+
+def text_runs(profile, threshold):
+    """Runs of profile values above a threshold, as (start, end) pairs"""
+    runs, start = [], None
+    for i, value in enumerate(profile + [0]):
+        if value > threshold and start is None:
+            start = i
+        elif value <= threshold and start is not None:
+            runs.append((start, i))
+            start = None
+    return runs
+
+
+def measure_text(image):
+    """
+    Measure the skew and line height of the text in an image
+    
+    Works on a thumbnail: the ink mask is rotated through the angles up to
+    OCR_DESKEW_MAX_ANGLE and the angle whose row profile is sharpest (has
+    the largest sum of squares) is taken: when lines are level, rows are
+    either full of ink or empty. The image is only taken to be skewed if
+    that profile is sharper than the one at 0 degrees, so a blank page or
+    one without lines is left as it is.
+    Text lines are then the runs of inked rows in that profile.
+    
+    Args:
+        image (PIL.Image): Image to measure
+    
+    Returns:
+        tuple: (angle, text_height) - rotation that levels the lines in
+               degrees, and the height of a text line in image pixels
+               (None if no lines were found)
+    """
+    thumbnail = image.convert('L')
+    thumbnail.thumbnail((OCR_ANALYSIS_SIZE, OCR_ANALYSIS_SIZE))
+    mask = ink_mask(thumbnail)
+    steps = int(OCR_DESKEW_MAX_ANGLE / OCR_DESKEW_STEP)
+    profiles = {i * OCR_DESKEW_STEP: row_profile(mask.rotate(i * OCR_DESKEW_STEP, Image.NEAREST, expand=True))
+                for i in range(-steps, steps + 1)}
+    scores = {angle: sum(value * value for value in profile) for angle, profile in profiles.items()}
+    angle = max(scores, key=scores.get)
+    if scores[angle] <= scores[0]:
+        angle = 0
+    
+    # Rows with a fifth of the ink of the fullest row are text (page edges
+    # and specks add a little ink to every row)
+    profile = profiles[angle]
+    runs = [end - start for start, end in text_runs(profile, max(profile) / 5)]
+    text_height = statistics.median(runs) * image.height / thumbnail.height if runs else None
+    return angle, text_height
+
+
+def measured_text(image):
+    """
+    measure_text(image), measured once per image
+    
+    The measurement is kept in image.info, which Pillow copies to converted
+    and resized images, so the downscale and deskew steps share it. The line
+    height is kept relative to the image height and so still applies after
+    downscaling.
+    
+    Args:
+        image (PIL.Image): Image to measure
+    
+    Returns:
+        tuple: (angle, text_height), as returned by measure_text
+    """
+    measurement = image.info.get('text_measurement')
+    if measurement is None:
+        angle, text_height = measure_text(image)
+        measurement = (angle, text_height / image.height if text_height else None)
+        image.info['text_measurement'] = measurement
+    angle, relative_height = measurement
+    return angle, relative_height * image.height if relative_height else None
+
+
+def preprocess_grayscale(image):
+    """Drop colour: tesseract only uses luminance"""
+    return image.convert('L')
+
+
+def preprocess_downscale(image):
+    """
+    Shrink the image to the resolution tesseract works best at
+    
+    Uses the DPI recorded in the image when there is one (scans), otherwise
+    the measured height of the text lines (camera photos). Images are
+    never enlarged.
+    """
+    dpi = image.info.get('dpi')
+    if dpi and dpi[0] > OCR_TARGET_DPI:
+        scale = OCR_TARGET_DPI / dpi[0]
+    else:
+        text_height = measured_text(image)[1]
+        if text_height is None:
+            return image
+        scale = OCR_TARGET_TEXT_HEIGHT / text_height
+    if scale >= 0.9:
+        return image
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(size, Image.LANCZOS, reducing_gap=2.0)
+
+
+def preprocess_deskew(image):
+    """Straighten text photographed at a slight angle"""
+    angle = measured_text(image)[0]
+    if angle == 0:
+        return image
+    image = image.rotate(angle, Image.BICUBIC, expand=True, fillcolor='white')
+    image.info.pop('text_measurement', None)  # Measured before rotating
+    return image
+
+
+def preprocess_binarize(image):
+    """Black text on a white background (adaptive threshold)"""
+    return ImageOps.invert(ink_mask(image.convert('L')))
+
+
+def preprocess_crop(image):
+    """
+    Crop to the text
+    
+    Text rows are those where ink starts and stops often along the row;
+    runs of them thinner than half a text line (ruled lines, page edges)
+    are left out. Text columns are then found the same way within those
+    rows, where vertical lines are unbroken and so do not count.
+    """
+    mask = ink_mask(image.convert('L'))
+    rows = row_profile(ImageChops.difference(mask, ImageChops.offset(mask, 1, 0)))
+    row_runs = text_runs(rows, max(rows) / 5)
+    if not row_runs:
+        return image
+    min_length = statistics.median(end - start for start, end in row_runs) / 2
+    row_runs = [run for run in row_runs if run[1] - run[0] >= min_length]
+    top, bottom = row_runs[0][0], row_runs[-1][1]
+    
+    band = mask.crop((0, top, mask.width, bottom))
+    down = ImageChops.difference(band, ImageChops.offset(band, 0, 1))
+    columns = list(down.resize((down.width, 1), Image.BOX).getdata())
+    column_runs = [run for run in text_runs(columns, max(columns) / 25) if run[1] - run[0] >= min_length]
+    if not column_runs:
+        return image
+    return image.crop((max(0, column_runs[0][0] - OCR_CROP_MARGIN), max(0, top - OCR_CROP_MARGIN),
+                       min(image.width, column_runs[-1][1] + OCR_CROP_MARGIN),
+                       min(image.height, bottom + OCR_CROP_MARGIN)))
+
+
+# OCR preprocessing steps by name (see OCR_PREPROCESS_STEPS)
+OCR_PREPROCESSORS = {
+    'grayscale': preprocess_grayscale,
+    'downscale': preprocess_downscale,
+    'deskew': preprocess_deskew,
+    'binarize': preprocess_binarize,
+    'crop': preprocess_crop,
+}
+
+
+def preprocess_ocr_image(image, steps=OCR_PREPROCESS_STEPS):
+    """
+    Prepare a photo or scan for recognition
+    
+    Args:
+        image (PIL.Image): Image as loaded
+        steps (tuple): Names of the OCR_PREPROCESSORS to apply, in order
+    
+    Returns:
+        PIL.Image: Preprocessed image
+    
+    Raises:
+        ValueError: If a step is unknown
+    """
+    # Apply the camera's orientation tag before anything else
+    image = ImageOps.exif_transpose(image)
+    for step in steps:
+        if step not in OCR_PREPROCESSORS:
+            raise ValueError(f"Unknown OCR preprocessing step: {step}")
+        image = OCR_PREPROCESSORS[step](image)
+    return image
+
+
+def available_ocr_backends():
+    """
+    List the installed OCR backends, fastest first
+    
+    Returns:
+        list: Backend names ('tesserocr', 'pytesseract')
+    """
+    backends = []
+    if tesserocr is not None:
+        backends.append('tesserocr')
+    if pytesseract is not None:
+        backends.append('pytesseract')
+    return backends
+
+
+class OCREngine:
+    """
+    Long-lived OCR engine
+    
+    With tesserocr the Tesseract API is initialized once, loading the
+    language models, and reused for every image. Otherwise each image goes
+    through pytesseract, which starts the tesseract binary (and loads the
+    models) every time. Model load time and recognition time per image are
+    recorded separately.
+    """
+    
+    def __init__(self, languages=OCR_LANGUAGES, tessdata=OCR_TESSDATA_PATH, backend=OCR_ENGINE_BACKEND):
+        """
+        Initialize the engine (models are loaded on first use, or by load())
+        
+        Args:
+            languages (str): Tesseract languages, e.g. 'chi_sim+eng'
+            tessdata (str): Directory holding the models, or None for tesseract's default
+            backend (str): 'auto', 'tesserocr' or 'pytesseract'
+        """
+        self.languages = languages
+        self.tessdata = tessdata
+        self.requested_backend = backend
+        self.backend = None
+        self.api = None
+        self.load_error = None
+        self.lock = threading.Lock()
+        
+        self.load_seconds = None
+        self.image_count = 0
+        self.error_count = 0
+        self.latencies = deque(maxlen=200)  # Seconds per image
+    
+    def load(self):
+        """
+        Choose the backend and load the models if they are not loaded yet
+        
+        Falls back to pytesseract when tesserocr is not installed or cannot
+        load the models.
+        
+        Returns:
+            str: Backend in use
+        
+        Raises:
+            RuntimeError: If no OCR backend is available
+        """
+        with self.lock:
+            if self.backend is not None:
+                return self.backend
+            
+            backends = available_ocr_backends()
+            if self.requested_backend != 'auto':
+                backends = [backend for backend in backends if backend == self.requested_backend]
+            
+            if 'tesserocr' in backends:
+                start = time.perf_counter()
+                try:
+                    kwargs = {'path': self.tessdata} if self.tessdata else {}
+                    self.api = tesserocr.PyTessBaseAPI(lang=self.languages, **kwargs)
+                    self.load_seconds = time.perf_counter() - start
+                    self.backend = 'tesserocr'
+                    return self.backend
+                except RuntimeError as e:
+                    self.load_error = str(e)
+                    print(f"In-process OCR unavailable ({e}), falling back to pytesseract")
+            
+            if 'pytesseract' in backends:
+                self.backend = 'pytesseract'
+                return self.backend
+            raise RuntimeError(self.load_error or "No OCR engine installed (pip3 install tesserocr or pytesseract)")
+    
+    def recognize(self, image):
+        """
+        Recognize the text in an image
+        
+        Args:
+            image (PIL.Image): Image, preferably preprocessed
+        
+        Returns:
+            str: Recognized text
+        
+        Raises:
+            RuntimeError: If no OCR backend is available
+        """
+        backend = self.load()
+        start = time.perf_counter()
+        try:
+            if backend == 'tesserocr':
+                # One API instance: recognitions take turns
+                with self.lock:
+                    self.api.SetImage(image)
+                    text = self.api.GetUTF8Text()
+            else:
+                config = f'--tessdata-dir "{self.tessdata}"' if self.tessdata else ''
+                text = pytesseract.image_to_string(image, lang=self.languages, config=config)
+        except Exception:
+            self.error_count += 1
+            raise
+        self.latencies.append(time.perf_counter() - start)
+        self.image_count += 1
+        return text
+    
+    def close(self):
+        """Release the Tesseract API and its models"""
+        with self.lock:
+            if self.api is not None:
+                self.api.End()
+                self.api = None
+            self.backend = None
+    
+    def metrics(self):
+        """
+        Get the backend, model load time and per-image statistics
+        
+        Returns:
+            dict: Backend, load time and image counts, and latency in milliseconds
+        """
+        latencies = sorted(self.latencies)
+        result = {
+            'backend': self.backend,
+            'images': self.image_count,
+            'errors': self.error_count
+        }
+        if self.load_seconds is not None:
+            result['model_load_ms'] = self.load_seconds * 1000
+        if latencies:
+            result.update({
+                'latency_last_ms': self.latencies[-1] * 1000,
+                'latency_mean_ms': statistics.mean(latencies) * 1000,
+                'latency_p50_ms': latencies[len(latencies) // 2] * 1000,
+                'latency_max_ms': latencies[-1] * 1000
+            })
+        return result
+
+
+# Shared OCR engine (created on first use)
+ocr_engine = None
+
+
+def get_ocr_engine():
+    """
+    Get the shared long-lived OCR engine
+    
+    Returns:
+        OCREngine: The engine
+    """
+    global ocr_engine
+    
+    if ocr_engine is None:
+        ocr_engine = OCREngine(OCR_LANGUAGES, OCR_TESSDATA_PATH, OCR_ENGINE_BACKEND)
+    return ocr_engine
+
+
+def preload_ocr_engine():
+    """Load the OCR models ahead of the first image (errors are reported then)"""
+    try:
+        get_ocr_engine().load()
+    except RuntimeError:
+        pass
+
+
+def join_runs(runs, gap):
+    """Merge (start, end) runs separated by less than gap"""
+    joined = []
+    for start, end in runs:
+        if joined and start - joined[-1][1] < gap:
+            joined[-1] = (joined[-1][0], end)
         else:
-            # Other types, display individually
-            for j, unit in enumerate(units):
-                display_sequence.append((
-                    unit, None, 
-                    descs[j] if j < len(descs) else char, 
-                    None
-                ))
-            i += 1
+            joined.append((start, end))
+    return joined
+
+
+def split_lines(lines, pieces, length):
+    """
+    Split text lines into pieces with about the same number of lines
+    
+    Cuts fall halfway through the gap between two lines.
+    
+    Args:
+        lines (list): (start, end) of each text line
+        pieces (int): Number of pieces
+        length (int): Size of the image along the split
+    
+    Returns:
+        list: (start, end) of each piece
+    """
+    cuts = [0]
+    for k in range(1, pieces):
+        i = round(k * len(lines) / pieces)
+        cuts.append((lines[i - 1][1] + lines[i][0]) // 2)
+    cuts.append(length)
+    return list(zip(cuts, cuts[1:]))
+
+
+def text_regions(image, count):
+    """
+    Split a page into up to count regions of text, in reading order
+    
+    Columns are separated by blank gutters wider than two text lines and
+    read left to right; each column is cut between text lines into
+    pieces of at least OCR_REGION_MIN_LINES lines. Cutting only through
+    blank space keeps every character whole.
+    
+    Args:
+        image (PIL.Image): Preprocessed page
+        count (int): Most regions wanted
+    
+    Returns:
+        list: (left, top, right, bottom) boxes
+    """
+    mask = ink_mask(image.convert('L'))
+    lines = text_runs(row_profile(mask), 0)
+    if len(lines) < 2 * OCR_REGION_MIN_LINES or count < 2:
+        return [(0, 0, image.width, image.height)]
+    line_height = statistics.median(end - start for start, end in lines)
+    
+    columns = list(mask.resize((mask.width, 1), Image.BOX).getdata())
+    column_runs = join_runs(text_runs(columns, 0), 2 * line_height)
+    edges = [0] + [(left_end + right_start) // 2
+                   for (_, left_end), (right_start, _) in zip(column_runs, column_runs[1:])] + [image.width]
+    column_lines = [text_runs(row_profile(mask.crop((left, 0, right, mask.height))), 0)
+                    for left, right in zip(edges, edges[1:])]
+    
+    pieces = max(1, min(count, len(lines) // OCR_REGION_MIN_LINES))
+    total_lines = sum(len(found) for found in column_lines)
+    regions = []
+    for (left, right), found in zip(zip(edges, edges[1:]), column_lines):
+        if not found:
+            continue
+        column_pieces = max(1, min(len(found) // OCR_REGION_MIN_LINES,
+                                   round(pieces * len(found) / total_lines)))
+        regions += [(left, top, right, bottom)
+                    for top, bottom in split_lines(found, column_pieces, image.height)]
+    return regions
+
+
+def iter_scan_pages(path):
+    """
+    Load the pages of a scan or photo
+    
+    Multi-page TIFFs yield each frame. PDF scans yield the largest image
+    on each page (pypdf); pages without an embedded image, or every page
+    when pypdf is not installed, are rendered by pdftoppm (poppler-utils).
+    Pages are loaded one at a time as they are asked for.
+    
+    Args:
+        path (str): Image, TIFF or PDF file path
+    
+    Yields:
+        PIL.Image: Each page
+    
+    Raises:
+        RuntimeError: If a PDF page cannot be read (needs pdftoppm)
+    """
+    if os.path.splitext(path)[1].lower() != '.pdf':
+        with Image.open(path) as image:
+            for frame in ImageSequence.Iterator(image):
+                yield frame.copy()
+        return
+    
+    if PdfReader is None:
+        yield from render_pdf_pages(path)
+        return
+    # An open file, not the path, so pypdf does not read it all into memory
+    # (see iter_pdf_pages)
+    with open(path, 'rb') as f:
+        for number, page in enumerate(PdfReader(f).pages, 1):
+            images = [found.image for found in page.images]
+            if images:
+                yield max(images, key=lambda image: image.width * image.height)
+            else:
+                yield from render_pdf_pages(path, number)
+
+
+def render_pdf_pages(path, page=None):
+    """
+    Render the pages of a PDF with pdftoppm
+    
+    Args:
+        path (str): PDF file path
+        page (int): Number of the one page to render (from 1), or None for all
+    
+    Yields:
+        PIL.Image: Each rendered page, in grayscale
+    
+    Raises:
+        RuntimeError: If pdftoppm is not installed
+    """
+    if shutil.which('pdftoppm') is None:
+        if page is None:
+            raise RuntimeError("PDF scans need pypdf (pip3 install pypdf) or pdftoppm (poppler-utils)")
+        raise RuntimeError(f"PDF page {page} has no scanned image; rendering it needs pdftoppm (poppler-utils)")
+    command = ['pdftoppm', '-r', str(OCR_SCAN_DPI), '-gray']
+    if page is not None:
+        command += ['-f', str(page), '-l', str(page)]
+    with tempfile.TemporaryDirectory() as directory:
+        subprocess.run(command + [path, os.path.join(directory, 'page')],
+                       check=True, stderr=subprocess.DEVNULL)
+        for name in sorted(os.listdir(directory), key=lambda name: (len(name), name)):
+            with Image.open(os.path.join(directory, name)) as rendered:
+                yield rendered.copy()
+
+
+def init_ocr_worker():
+    """Load a fresh OCR engine in a new worker process"""
+    global ocr_engine
+    
+    # An engine inherited from the parent process is not used
+    ocr_engine = None
+    preload_ocr_engine()
+
+
+def ocr_worker_page(image):
+    """Preprocess and recognize one page (runs in a worker process)"""
+    return get_ocr_engine().recognize(preprocess_ocr_image(image))
+
+
+def ocr_worker_region(image):
+    """Recognize one region of a preprocessed page (runs in a worker process)"""
+    return get_ocr_engine().recognize(image)
+
+
+# Shared OCR worker pool (created on first use)
+ocr_pool = None
+
+
+def get_ocr_pool():
+    """
+    Get the shared pool of OCR worker processes
+    
+    Returns:
+        ProcessPoolExecutor: The pool, or None if OCR_WORKERS is 1
+    """
+    global ocr_pool
+    
+    if ocr_pool is None and OCR_WORKERS > 1:
+        ocr_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS, initializer=init_ocr_worker)
+    return ocr_pool
+
+
+def map_ahead(pool, function, items, window):
+    """
+    Like pool.map, but only takes window items from items ahead of the results
+    
+    pool.map submits every item at once, which would load a whole scan
+    into memory; here the next item is only taken as a result is returned.
+    
+    Args:
+        pool (ProcessPoolExecutor): Worker pool
+        function (callable): Function to apply
+        items (iterable): Arguments, read as they are needed
+        window (int): Most items submitted and not yet returned
+    
+    Yields:
+        Each result, in the order of items
+    """
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(function, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def recognize_scan(pages, pool=None):
+    """
+    Recognize the pages of a scan in parallel
+    
+    Several pages are shared out a page per worker, with no more than
+    OCR_PAGES_AHEAD pages per worker loaded at a time. A single page is
+    preprocessed here and its text regions are shared out instead. Text
+    is joined in reading order. Without a pool everything is recognized
+    in this process.
+    
+    Args:
+        pages (iterable): PIL images, one per page (e.g. iter_scan_pages())
+        pool (ProcessPoolExecutor): Worker pool, or None
+    
+    Returns:
+        str: Recognized text
+    
+    Raises:
+        ValueError: If there are no pages
+    """
+    pages = iter(pages)
+    first = list(itertools.islice(pages, 2))
+    if not first:
+        raise ValueError("no pages found in the scan")
+    pages = itertools.chain(first, pages)
+    if pool is None:
+        return '\n'.join(ocr_worker_page(page) for page in pages)
+    if len(first) > 1:
+        return '\n'.join(map_ahead(pool, ocr_worker_page, pages, OCR_WORKERS * OCR_PAGES_AHEAD))
+    
+    page = preprocess_ocr_image(first[0])
+    regions = text_regions(page, OCR_WORKERS)
+    if len(regions) == 1:
+        return get_ocr_engine().recognize(page)
+    return '\n'.join(pool.map(ocr_worker_region, [page.crop(box) for box in regions]))
+
+
+def ocr_from_image(image_path):
+    """
+    Extract text from an image or scan using OCR
+    
+    Args:
+        image_path (str): Path to the image, multi-page TIFF or PDF scan
+    
+    Returns:
+        str: Extracted text
+    """
+    try:
+        text = recognize_scan(iter_scan_pages(image_path), get_ocr_pool())
+        return text.strip()
+    except Exception as e:
+        return f"OCR failed: {str(e)}"
+
+
+# Where a page starts: its position in the source (character offset, byte
+# offset, ...), its character offset in the document text, and the
+# translator state carried into it
+Checkpoint = namedtuple('Checkpoint', ['page', 'position', 'char_offset', 'number_mode'])
+
+# A translated page of a document
+DocumentPage = namedtuple('DocumentPage', ['index', 'text', 'display_sequence',
+                                           'frame_offsets', 'navigation', 'checkpoint'])
+
+
+def find_page_break(text, limit=DOCUMENT_PAGE_CHARS):
+    """
+    Choose where a page ends
+    
+    Pages end after a sentence mark if there is one in the second half of
+    the page, otherwise after a clause mark or at a space, and never inside
+    a run of letters or digits if it can be helped. Letters and digits are
+    paired on the display, so pages then always start with the pairing
+    state reset.
+    
+    Args:
+        text (str): Text from the start of the page
+        limit (int): Maximum page length
+    
+    Returns:
+        int: Length of the page
+    """
+    if len(text) <= limit:
+        return len(text)
+    for marks in (SENTENCE_END_MARKS, CLAUSE_END_MARKS):
+        for i in range(limit, limit // 2, -1):
+            if text[i - 1] in marks:
+                return i
+    for i in range(limit, limit // 2, -1):
+        if text[i - 1].isspace():
+            return i
+    
+    pairable = lambda ch: convert_chinese_char_to_braille_units(ch)[0] in ('english', 'number')
+    i = limit
+    while i > limit // 2 and pairable(text[i - 1]) and pairable(text[i]):
+        i -= 1
+    return i if i > limit // 2 else limit
+
+
+def file_identity(path):
+    """
+    Identify a file by its content, so it is recognized after being moved
+    
+    Args:
+        path (str): File path
+    
+    Returns:
+        str: Hash of the file size and its first and last bytes
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        digest.update(str(size).encode())
+        digest.update(f.read(BOOKMARK_IDENTITY_BYTES))
+        f.seek(max(0, size - BOOKMARK_IDENTITY_BYTES))
+        digest.update(f.read(BOOKMARK_IDENTITY_BYTES))
+    return digest.hexdigest()
+
+
+class Document:
+    """
+    Text source read page by page with lazy translation
+    
+    Subclasses implement read_page and identity. Pages are translated on a
+    background worker when first needed; after each page is handed out the
+    next DOCUMENT_PREFETCH_PAGES are translated ahead, and pages further
+    away are dropped, so only a few pages are ever held in memory.
+    
+    The start of every page found is kept as a Checkpoint. A page is read
+    from the nearest checkpoint before it, so a page far into the document
+    (e.g. a bookmark) can be reached without reading everything before it
+    once its checkpoint is known.
+    """
+    
+    def __init__(self, name, start=0):
+        """
+        Initialize the document
+        
+        Args:
+            name (str): Description of the source (file path, URL, ...)
+            start: Position of the first page in the source
+        """
+        self.name = name
+        self.futures = {}  # Page index -> Future of its DocumentPage
+        self.checkpoints = {0: Checkpoint(0, start, 0, False)}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+    
+    def read_page(self, position):
+        """
+        Read the page starting at a position in the source
+        
+        Args:
+            position: Where the page starts
+        
+        Returns:
+            tuple: (text, next_position), or None past the end of the document
+        """
+        raise NotImplementedError
+    
+    def identity(self):
+        """
+        Identify the document across sessions
+        
+        Returns:
+            str: Hash of the document content, or None if the document
+                 cannot be recognized again (it is then not bookmarked)
+        """
+        raise NotImplementedError
+    
+    def load_page(self, index):
+        """
+        Load the text of a page, finding page starts from the nearest checkpoint
+        
+        Args:
+            index (int): Page number
+        
+        Returns:
+            tuple: (text, checkpoint), or None past the end of the document
+        """
+        with self.lock:
+            checkpoint = self.checkpoints[max(page for page in self.checkpoints if page <= index)]
+        while True:
+            result = self.read_page(checkpoint.position)
+            if result is None:
+                return None
+            text, position = result
+            if text:
+                # Number mode carries on only if the page ends in a digit
+                number_mode = convert_chinese_char_to_braille_units(text[-1])[0] == 'number'
+            else:
+                number_mode = checkpoint.number_mode
+            following = Checkpoint(checkpoint.page + 1, position, checkpoint.char_offset + len(text),
+                                   number_mode)
+            with self.lock:
+                self.checkpoints[following.page] = following
+            if checkpoint.page == index:
+                return text, checkpoint
+            checkpoint = following
+    
+    def translate_page(self, index):
+        """Load and translate a page (runs on the worker)"""
+        loaded = self.load_page(index)
+        if loaded is None:
+            return None
+        text, checkpoint = loaded
+        frame_offsets = []
+        display_sequence, char_data = convert_text_to_display_sequence(text, frame_offsets,
+                                                                       checkpoint.number_mode)
+        return DocumentPage(index, text, display_sequence, frame_offsets,
+                            NavigationIndex(text, frame_offsets), checkpoint)
+    
+    def checkpoint_index(self, current):
+        """
+        Sparse checkpoint index for saving in a bookmark
+        
+        Args:
+            current (int): Page being read (always included)
+        
+        Returns:
+            list: [page, position, char_offset, number_mode] for every
+                  BOOKMARK_CHECKPOINT_PAGES-th known page start
+        """
+        with self.lock:
+            return [list(checkpoint) for page, checkpoint in sorted(self.checkpoints.items())
+                    if page % BOOKMARK_CHECKPOINT_PAGES == 0 or page == current]
+    
+    def add_checkpoints(self, saved):
+        """
+        Add page starts saved in a bookmark
+        
+        Args:
+            saved (list): Output of checkpoint_index (positions as read back from JSON)
+        """
+        with self.lock:
+            for page, position, char_offset, number_mode in saved:
+                if isinstance(position, list):
+                    position = tuple(position)
+                self.checkpoints.setdefault(page, Checkpoint(page, position, char_offset, number_mode))
+    
+    def schedule(self, index):
+        """Start translating a page unless it is already cached or underway"""
+        with self.lock:
+            future = self.futures.get(index)
+            if future is None:
+                future = self.executor.submit(self.translate_page, index)
+                self.futures[index] = future
+            return future
+    
+    def page(self, index):
+        """
+        Get a translated page, and start translating the pages after it
+        
+        Args:
+            index (int): Page number
+        
+        Returns:
+            DocumentPage: The page, or None past the end of the document
+        """
+        if index < 0:
+            return None
+        page = self.schedule(index).result()
+        if page is not None:
+            for ahead in range(1, DOCUMENT_PREFETCH_PAGES + 1):
+                self.schedule(index + ahead)
+        
+        # Keep the previous page (for jumping back) and the prefetched pages
+        with self.lock:
+            for other in list(self.futures):
+                if not index - 1 <= other <= index + DOCUMENT_PREFETCH_PAGES:
+                    self.futures.pop(other).cancel()
+        return page
+    
+    def close(self):
+        """Stop background translation"""
+        with self.lock:
+            for future in self.futures.values():
+                future.cancel()
+            self.futures.clear()
+        self.executor.shutdown(wait=False)
+
+
+class TextDocument(Document):
+    """Document held in memory (typed text, OCR results, web pages)"""
+    
+    def __init__(self, text, name='text'):
+        super().__init__(name)
+        self.text = text
+    
+    def read_page(self, position):
+        if position >= len(self.text):
+            return None
+        length = find_page_break(self.text[position:position + DOCUMENT_PAGE_CHARS + 1], DOCUMENT_PAGE_CHARS)
+        return self.text[position:position + length], position + length
+    
+    def identity(self):
+        return hashlib.sha1(self.text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def detect_text_encoding(sample):
+    """
+    Detect the encoding of a text file from a sample of its first bytes
+    
+    A byte order mark decides. Otherwise BOM-less UTF-16 is recognized by
+    its zero bytes (Latin text) or by decoding to mostly Chinese characters,
+    and the sample is tried as UTF-8, then as GB18030, which also covers
+    GBK and GB2312 files.
+    
+    Args:
+        sample (bytes): Bytes from the start of the file
     
-    return display_sequence, char_data
+    Returns:
+        tuple: (encoding, bom_length)
+    """
+    for bom, encoding in ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'),
+                          (codecs.BOM_UTF16_BE, 'utf-16-be')):
+        if sample.startswith(bom):
+            return encoding, len(bom)
+    
+    def decodes(encoding):
+        # The sample may end in the middle of a character
+        try:
+            return codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        except UnicodeDecodeError:
+            return None
+    
+    pairs = len(sample) // 2
+    utf16 = (('utf-16-le', 1), ('utf-16-be', 0))
+    for encoding, zero_byte in utf16:
+        if pairs and sample[zero_byte:pairs * 2:2].count(0) > pairs * 0.3:
+            return encoding, 0
+    
+    if decodes('utf-8') is not None:
+        return 'utf-8', 0
+    
+    for encoding, zero_byte in utf16:
+        text = decodes(encoding) or ''
+        if sum(1 for ch in text if '\u4e00' <= ch <= '\u9fff') > pairs * 0.5:
+            return encoding, 0
+    
+    if decodes('gb18030') is not None:
+        return 'gb18030', 0
+    return 'utf-8', 0
 
 
-def extract_text_from_url(url):
+def open_text_file(path):
     """
-    Extract text content from a webpage
+    Open a text file for reading line by line in its detected encoding
+    
+    The encoding is detected as for MappedTextFile, so files decode the
+    same way whether they are translated from the command line or read
+    on the device.
     
     Args:
-        url (str): URL to extract text from
+        path (str): File path
     
     Returns:
-        str: Extracted text (limited to 300 characters)
+        io.TextIOWrapper: Text stream, positioned after any byte order mark
     """
+    f = open(path, 'rb')
     try:
-        response = requests.get(url, timeout=10)
-        response.encoding = response.apparent_encoding
-        soup = BeautifulSoup(response.text, 'html.parser')
+        encoding, bom_length = detect_text_encoding(f.read(FILE_ENCODING_SAMPLE_BYTES))
+        f.seek(bom_length)
+    except Exception:
+        f.close()
+        raise
+    return io.TextIOWrapper(f, encoding=encoding, errors='replace')
+
+
+class MappedTextFile:
+    """
+    Memory-mapped text file decoded on demand
+    
+    The file is mapped rather than read and its encoding is detected from
+    a sample, so opening a 500 MB novel costs the same as a 1 KB note. Text
+    is decoded incrementally from any byte offset; offsets inside a
+    character are moved back to its first byte.
+    """
+    
+    def __init__(self, path):
+        """
+        Open a text file
+        
+        Args:
+            path (str): File path
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # Empty files cannot be mapped
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self.encoding, self.bom_length = detect_text_encoding(self.data[:FILE_ENCODING_SAMPLE_BYTES])
+        # Undecodable bytes are kept as escapes (lone surrogates in UTF-16) so
+        # that decoded text encodes back to exactly the bytes it came from
+        self.errors = 'surrogatepass' if self.encoding.startswith('utf-16') else 'surrogateescape'
+    
+    def align(self, offset):
+        """
+        Move a byte offset back to the start of the character it falls in
         
-        # Remove script and style tags
-        for script in soup(["script", "style"]):
-            script.decompose()
+        Args:
+            offset (int): Byte offset
         
-        # Extract text
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        Returns:
+            int: Offset of the first byte of that character
+        """
+        offset = min(max(offset, self.bom_length), self.size)
+        if offset == self.size:
+            return offset
+        data = self.data
         
-        return text[:300]  # Limit length
-    except Exception as e:
-        return f"Extraction failed: {str(e)}"
+        if self.encoding.startswith('utf-16'):
+            offset -= (offset - self.bom_length) % 2
+            # Step back over the high half of a surrogate pair
+            high = data[offset + 1] if self.encoding == 'utf-16-le' else data[offset]
+            if offset - 2 >= self.bom_length and 0xDC <= high <= 0xDF:
+                offset -= 2
+            return offset
+        
+        if self.encoding == 'utf-8':
+            # Continuation bytes are 10xxxxxx
+            start = offset
+            while offset > max(self.bom_length, start - 3) and 0x80 <= data[offset] < 0xC0:
+                offset -= 1
+            return offset
+        
+        # GB18030: bytes below 0x30 are never part of a multi-byte character,
+        # so walk forward from the last one to find the boundary
+        position = offset
+        while position > max(self.bom_length, offset - FILE_RESYNC_BYTES) and data[position - 1] >= 0x30:
+            position -= 1
+        while True:
+            lead = data[position]
+            if 0x81 <= lead <= 0xFE and position + 1 < self.size:
+                length = 4 if 0x30 <= data[position + 1] <= 0x39 else 2
+            else:
+                length = 1
+            if position + length > offset:
+                return position
+            position += length
+    
+    def read(self, start, max_chars=None):
+        """
+        Decode text from a byte offset
+        
+        Args:
+            start (int): Byte offset (moved back to a character boundary)
+            max_chars (int): Maximum characters to decode, or None for the
+                             rest of the file
+        
+        Returns:
+            tuple: (text, end) - decoded text and the byte offset just after it
+        """
+        start = self.align(start)
+        # A character takes at most 4 bytes in all supported encodings
+        stop = self.size if max_chars is None else min(self.size, start + 4 * max_chars)
+        final = stop == self.size
+        if self.encoding.startswith('utf-16'):
+            stop -= (stop - start) % 2
+        
+        decoder = codecs.getincrementaldecoder(self.encoding)(self.errors)
+        text = decoder.decode(self.data[start:stop], final=final)
+        if max_chars is not None:
+            text = text[:max_chars]
+        end = start + len(text.encode(self.encoding, self.errors))
+        if final and end == self.size - 1 and self.encoding.startswith('utf-16'):
+            end = self.size  # Ignore a stray last byte
+        return text.encode(self.encoding, self.errors).decode(self.encoding, 'replace'), end
+    
+    def close(self):
+        """Unmap the file"""
+        if self.size:
+            self.data.close()
 
 
-def extract_text_from_file(filepath):
+class FileDocument(Document):
     """
-    Extract text from a file
+    Text file read page by page
     
-    Args:
-        filepath (str): Path to the file
+    The file is memory-mapped and page starts are byte offsets, so neither
+    opening the file nor memory use depends on its size.
+    """
     
-    Returns:
-        str: Extracted text (limited to 300 characters)
+    def __init__(self, path):
+        """
+        Open a text file
+        
+        Args:
+            path (str): File path
+        """
+        self.file = MappedTextFile(path)
+        super().__init__(path, start=self.file.bom_length)
+    
+    def read_page(self, position):
+        if position >= self.file.size:
+            return None
+        text, end = self.file.read(position, DOCUMENT_PAGE_CHARS + 1)
+        if len(text) > DOCUMENT_PAGE_CHARS:
+            text, end = self.file.read(position, find_page_break(text, DOCUMENT_PAGE_CHARS))
+        return text, end
+    
+    def identity(self):
+        return file_identity(self.name)
+    
+    def close(self):
+        """Stop background translation and unmap the file"""
+        # Unmap once the worker has finished any page it is reading
+        self.executor.submit(self.file.close)
+        super().close()
+
+
+class StreamDocument(Document):
     """
-    try:
-        if filepath.endswith('.txt'):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return f.read()[:300]
-        else:
-            return "Currently only supports .txt files"
-    except Exception as e:
-        return f"File read failed: {str(e)}"
+    Document streamed from an extractor (EPUB chapters, DOCX paragraphs,
+    PDF pages)
+    
+    Sections are pulled from the extractor only as pages are needed, so
+    the first page is ready as soon as the first chapter has been read.
+    Page starts are (section, character offset) pairs; reading from any
+    other place than where the last page ended restarts the extractor at
+    that section.
+    """
+    
+    def __init__(self, extractor, path):
+        """
+        Open a document
+        
+        Args:
+            extractor (callable): Generator function taking the path and the
+                                  number of sections to skip, and yielding
+                                  the text of each section
+            path (str): File path
+        """
+        self.extractor = extractor
+        self.sections = None
+        super().__init__(path, start=(0, 0))
+    
+    def open_sections(self, start):
+        """Restart the extractor at a section"""
+        if self.sections is not None:
+            self.sections.close()
+        self.sections = self.extractor(self.name, start)
+        self.pieces = []           # (section, text) read but not finished with
+        self.next_section = start  # Section the extractor yields next
+        self.exhausted = False
+        self.cursor = (start, 0)   # Where the last page read ended
+    
+    def read_page(self, position):
+        if self.sections is None or position != self.cursor:
+            self.open_sections(position[0])
+        offset = position[1]
+        
+        # Pull sections until there is more than a page of text
+        available = sum(len(text) for section, text in self.pieces) - offset
+        while available <= DOCUMENT_PAGE_CHARS and not self.exhausted:
+            text = next(self.sections, None)
+            if text is None:
+                self.exhausted = True
+            else:
+                text = text + '\n' if text.strip() else ''
+                self.pieces.append((self.next_section, text))
+                self.next_section += 1
+                available += len(text)
+        buffer = ''.join(text for section, text in self.pieces)[offset:offset + DOCUMENT_PAGE_CHARS + 1]
+        if self.exhausted and not buffer.strip():
+            return None
+        
+        # Drop the sections the page used up
+        length = find_page_break(buffer, DOCUMENT_PAGE_CHARS)
+        end = offset + length
+        while self.pieces and end >= len(self.pieces[0][1]):
+            end -= len(self.pieces.pop(0)[1])
+        self.cursor = (self.pieces[0][0], end) if self.pieces else (self.next_section, 0)
+        return buffer[:length], self.cursor
+    
+    def identity(self):
+        return file_identity(self.name)
+    
+    def close(self):
+        """Stop background translation and close the extractor"""
+        if self.sections is not None:
+            # Close on the worker, after any section being read
+            self.executor.submit(self.sections.close)
+        super().close()
 
 
-def ocr_from_image(image_path):
+class ReadingListDocument(Document):
+    """
+    Document of web pages and feed entries fetched concurrently
+    
+    Pages are taken in the order they finish downloading, and each one
+    starts a new document page, so the first article can be read while
+    the rest of the list is still downloading. Page starts are (article,
+    character offset) pairs. Fetched articles are kept, so reading back
+    does not fetch the list again.
+    """
+    
+    def __init__(self, urls):
+        """
+        Start fetching a reading list
+        
+        Args:
+            urls (list): Page or feed URLs
+        """
+        self.results = fetch_reading_list(urls)
+        self.articles = []  # Text of each page, in the order they finished
+        self.errors = []
+        self.exhausted = False
+        super().__init__(' '.join(urls), start=(0, 0))
+    
+    def article(self, index):
+        """
+        Get the text of an article, waiting for it to be fetched
+        
+        Args:
+            index (int): Article number in finishing order
+        
+        Returns:
+            str: Text, or None if the list has fewer articles
+        """
+        while index >= len(self.articles) and not self.exhausted:
+            result = next(self.results, None)
+            if result is None:
+                self.exhausted = True
+                if not self.articles:
+                    self.articles.append(f"Extraction failed: {self.errors[0] if self.errors else 'no pages found'}")
+            elif result['error']:
+                print(f"Skipped {result['url']}: {result['error']}")
+                self.errors.append(result['error'])
+            elif result['text']:
+                text = result['text']
+                self.articles.append(f"{result['title']}：{text}" if result['title'] else text)
+        return self.articles[index] if index < len(self.articles) else None
+    
+    def read_page(self, position):
+        index, offset = position
+        text = self.article(index)
+        if text is None:
+            return None
+        length = find_page_break(text[offset:offset + DOCUMENT_PAGE_CHARS + 1], DOCUMENT_PAGE_CHARS)
+        end = offset + length
+        return text[offset:end], (index, end) if end < len(text) else (index + 1, 0)
+    
+    def identity(self):
+        # Pages arrive in a different order (and feeds change) from one
+        # visit to the next, so a saved position would not fit
+        return None
+    
+    def close(self):
+        """Stop background translation and stop reading the fetch results"""
+        # Close on the worker, after any page being read
+        self.executor.submit(self.results.close)
+        super().close()
+
+
+def open_document(source):
     """
-    Extract text from an image using OCR
+    Open a document from a file path, web page or feed URL(s), or plain text
     
     Args:
-        image_path (str): Path to the image file
+        source (str): Text, an existing file path (text, EPUB, DOCX or PDF),
+                      or space-separated URLs
     
     Returns:
-        str: Extracted text (limited to 300 characters)
+        Document: The document
     """
-    try:
-        image = Image.open(image_path)
-        text = pytesseract.image_to_string(image, lang='chi_sim+eng')
-        return text.strip()[:300]
-    except Exception as e:
-        return f"OCR failed: {str(e)}"
+    if re.match(r'https?://', source):
+        return ReadingListDocument(source.split())
+    if os.path.isfile(source):
+        extractor = DOCUMENT_EXTRACTORS.get(os.path.splitext(source)[1].lower())
+        return StreamDocument(extractor, source) if extractor else FileDocument(source)
+    return TextDocument(source)
+
+
+class BookmarkStore:
+    """
+    Reading positions saved per document
+    
+    Bookmarks are kept in one JSON file, keyed by Document.identity() (a
+    hash of the content, so files are recognized after being moved or
+    renamed). Each records the page, display group and character offset
+    where reading stopped, and the document's sparse checkpoint index, so
+    resuming translates only from the nearest page start instead of the
+    beginning of the document.
+    """
+    
+    def __init__(self, path=BOOKMARKS_PATH):
+        """
+        Initialize the store
+        
+        Args:
+            path (str): Bookmark file
+        """
+        self.path = path
+        self.bookmarks = None  # Loaded on first use
+        self.lock = threading.Lock()
+    
+    def _load(self):
+        """Read the bookmark file (once)"""
+        if self.bookmarks is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.bookmarks = json.load(f)
+            except (OSError, ValueError):
+                self.bookmarks = {}
+        return self.bookmarks
+    
+    def _write(self):
+        """Write the bookmark file atomically"""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.bookmarks, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    
+    def save(self, document, page, frame):
+        """
+        Record the reading position in a document
+        
+        Args:
+            document (Document): Document being read
+            page (DocumentPage): Page being read
+            frame (int): Display group to resume at
+        """
+        offsets = page.frame_offsets
+        record = {
+            'name': document.name,
+            'page': page.index,
+            'frame': frame,
+            'char_offset': page.checkpoint.char_offset + (offsets[frame] if frame < len(offsets) else 0),
+            'checkpoints': document.checkpoint_index(page.index),
+            'saved': time.time()
+        }
+        try:
+            identity = document.identity()
+            if identity is None:
+                return
+            with self.lock:
+                bookmarks = self._load()
+                bookmarks[identity] = record
+                # Drop the oldest bookmarks beyond the limit
+                for old in sorted(bookmarks, key=lambda key: bookmarks[key]['saved'])[:-BOOKMARK_MAX_DOCUMENTS]:
+                    del bookmarks[old]
+                self._write()
+        except OSError as e:
+            print(f"Bookmark not saved: {str(e)}")
+    
+    def restore(self, document):
+        """
+        Add a document's saved checkpoints and get where to resume
+        
+        Args:
+            document (Document): Newly opened document
+        
+        Returns:
+            tuple: (page, frame) to resume at, or None if there is no bookmark
+        """
+        try:
+            identity = document.identity()
+        except OSError:
+            return None
+        if identity is None:
+            return None
+        with self.lock:
+            record = self._load().get(identity)
+        if record is None:
+            return None
+        document.add_checkpoints(record['checkpoints'])
+        return record['page'], record['frame']
+    
+    def forget(self, document):
+        """
+        Remove the bookmark of a document that has been read to the end
+        
+        Args:
+            document (Document): Document
+        """
+        try:
+            identity = document.identity()
+            if identity is None:
+                return
+            with self.lock:
+                if self._load().pop(identity, None) is not None:
+                    self._write()
+        except OSError as e:
+            print(f"Bookmark not removed: {str(e)}")
+
 
+# Global bookmark store
+bookmarks = BookmarkStore()
 
-def voice_prompt(text):
+
+def play_voice_prompt(text, after=None):
+    """
+    Play a voice prompt and wait until it has finished
+    
+    Prompts in the pre-rendered bundle play without any network round trip;
+    anything else falls back to live TTS.
+    
+    Args:
+        text (str): Text to speak
+        after (threading.Thread): Prompt to wait for before starting
+    """
+    if after is not None:
+        after.join()
+    
+    bundle = get_prompt_bundle()
+    audio = bundle.get(text) if bundle is not None else None
+    if audio is not None:
+        try:
+            play_audio(audio, priority=AUDIO_PRIORITY_PROMPT).wait()
+        except Exception as e:
+            print(f"Prompt playback failed: {str(e)}")
+    else:
+        speak_text(text)
+
+
+def voice_prompt(text, block=True):
     """
     Provide voice prompt to user
     
+    With block=False the prompt plays in the background so the input or
+    work it announces can start at once. Prompts never overlap: each one
+    starts after any prompt still playing in the background.
+    
     Args:
         text (str): Text to speak
+        block (bool): Wait until the prompt has been spoken
+    
+    Returns:
+        threading.Thread: Thread playing the prompt, or None if block is True
     """
-    text_to_speech(text)
+    global prompt_thread
+    
+    previous, prompt_thread = prompt_thread, None
+    if not block:
+        prompt_thread = threading.Thread(target=play_voice_prompt, args=(text, previous), daemon=True)
+        prompt_thread.start()
+        return prompt_thread
+    
+    play_voice_prompt(text, previous)
     time.sleep(0.5)
+    return None
 
 
 def get_input_method(buttons):
@@ -787,53 +5618,338 @@ def get_input_method(buttons):
     Returns:
         str: Selected input method ('keyboard', 'web', or 'ocr')
     """
-    voice_prompt("Welcome to SenTranslator. Please select input method. Button 1 for keyboard input, Button 2 for web extraction, Button 3 for image recognition")
+    voice_prompt(VOICE_PROMPTS['welcome'])
     
     while True:
         if buttons['next'].is_pressed:
-            voice_prompt("You selected keyboard input")
+            voice_prompt(VOICE_PROMPTS['selected_keyboard'], block=False)
             buttons['next'].wait_for_release()
             return 'keyboard'
         elif buttons['audio'].is_pressed:
-            voice_prompt("You selected web extraction")
+            voice_prompt(VOICE_PROMPTS['selected_web'], block=False)
             buttons['audio'].wait_for_release()
             return 'web'
         elif buttons['tts'].is_pressed:
-            voice_prompt("You selected image recognition")
+            voice_prompt(VOICE_PROMPTS['selected_ocr'], block=False)
             buttons['tts'].wait_for_release()
             return 'ocr'
         time.sleep(0.1)
 
 
-def get_input_text(input_method):
+def get_input_document(input_method):
     """
-    Get input text based on selected method
+    Get the document to read based on selected method
+    
+    The prompt for each method plays while input is already being read.
+    Typed text that names an existing file opens that file.
     
     Args:
         input_method (str): Selected input method
     
     Returns:
-        str: Input text to be converted
+        Document: Document to be converted, or None if the user typed 'q' to quit
     """
     if input_method == 'keyboard':
-        voice_prompt("Please enter text in the terminal")
-        return input("Please enter text to convert: ")
+        voice_prompt(VOICE_PROMPTS['enter_text'], block=False)
+        text = input("Please enter text (or a text file path) to convert: ")
+        return None if text.strip().lower() == 'q' else open_document(text)
     
     elif input_method == 'web':
-        voice_prompt("Please enter webpage URL in the terminal")
-        url = input("Please enter webpage URL: ")
+        voice_prompt(VOICE_PROMPTS['enter_url'], block=False)
+        urls = input("Please enter webpage or feed URLs: ").split()
         print("Extracting text from webpage...")
-        text = extract_text_from_url(url)
-        print(f"Extracted text: {text[:50]}...")
-        return text
+        # Reading starts as soon as the first page has been fetched
+        return ReadingListDocument(urls)
     
     elif input_method == 'ocr':
-        voice_prompt("Please enter image path in the terminal")
+        voice_prompt(VOICE_PROMPTS['enter_image'], block=False)
+        # Load the OCR models while the path is being typed
+        threading.Thread(target=preload_ocr_engine, daemon=True).start()
         path = input("Please enter image path: ")
         print("Recognizing text from image...")
         text = ocr_from_image(path)
         print(f"Recognized text: {text[:50]}...")
-        return text
+        return TextDocument(text, path)
+
+
+class ReadingPacer:
+    """
+    Adaptive pacing for auto-advance reading mode
+    
+    Learns the reader's pace from the time between a frame finishing its
+    actuation and the next manual advance, and tracks the effective reading
+    speed for the session.
+    """
+    
+    def __init__(self, history_size=AUTO_ADVANCE_HISTORY):
+        """
+        Initialize the pacer
+        
+        Args:
+            history_size (int): Number of recent manual advances to learn from
+        """
+        self.intervals = deque(maxlen=history_size)
+        self.frame_ready_time = None  # When the last frame finished actuating
+        self.session_start = None
+        self.characters_read = 0
+    
+    def frame_displayed(self, char_count):
+        """
+        Record that a frame has finished actuating
+        
+        Args:
+            char_count (int): Number of source characters covered by the frame
+        """
+        now = time.monotonic()
+        if self.session_start is None:
+            self.session_start = now
+        self.frame_ready_time = now
+        self.characters_read += char_count
+    
+    def record_manual_advance(self):
+        """Learn from a manual advance made while the previous frame was shown"""
+        if self.frame_ready_time is None:
+            return
+        interval = time.monotonic() - self.frame_ready_time
+        # Long gaps mean the reader stopped reading, not that they read slowly
+        if interval <= AUTO_ADVANCE_MAX_INTERVAL:
+            self.intervals.append(interval)
+    
+    def interval(self):
+        """
+        Get the current auto-advance period
+        
+        Returns:
+            float: Seconds to show each frame before advancing
+        """
+        if not self.intervals:
+            return AUTO_ADVANCE_DEFAULT_INTERVAL
+        pace = statistics.median(self.intervals)
+        return min(max(pace, AUTO_ADVANCE_MIN_INTERVAL), AUTO_ADVANCE_MAX_INTERVAL)
+    
+    def characters_per_minute(self):
+        """
+        Get the effective reading speed for the session
+        
+        Returns:
+            float: Characters read per minute since the first frame
+        """
+        if self.session_start is None:
+            return 0.0
+        elapsed = time.monotonic() - self.session_start
+        if elapsed <= 0:
+            return 0.0
+        return self.characters_read * 60.0 / elapsed
+
+
+def read_button_gesture(buttons):
+    """
+    Read a button gesture (returns immediately if no button is pressed)
+    
+    A gesture is a short press, a long press of a single button, or a chord
+    of several buttons pressed together.
+    
+    Args:
+        buttons (dict): Dictionary of Button objects
+    
+    Returns:
+        tuple: (gesture, names) - gesture is 'press', 'hold', 'chord' or None,
+               names is a sorted tuple of the button names involved
+    """
+    held = {name for name, button in buttons.items() if button.is_pressed}
+    if not held:
+        return None, ()
+    
+    start = time.monotonic()
+    while True:
+        pressed = {name for name, button in buttons.items() if button.is_pressed}
+        held |= pressed
+        
+        if len(held) > 1:
+            # Chord: wait until every button involved has been released
+            for name in held:
+                buttons[name].wait_for_release()
+            return 'chord', tuple(sorted(held))
+        
+        if not pressed:
+            return 'press', tuple(held)
+        
+        if time.monotonic() - start >= LONG_PRESS_TIME:
+            for name in held:
+                buttons[name].wait_for_release()
+            return 'hold', tuple(held)
+        
+        time.sleep(0.02)
+
+
+def frame_char_count(frame_offsets, index, text_length):
+    """
+    Get the number of source characters covered by a display group
+    
+    Args:
+        frame_offsets (list): Start character index of each display group
+        index (int): Display group index
+        text_length (int): Length of the source text
+    
+    Returns:
+        int: Number of characters from this group up to the next one
+    """
+    end = frame_offsets[index + 1] if index + 1 < len(frame_offsets) else text_length
+    return end - frame_offsets[index]
+
+
+def run_display_session(servos_group1, servos_group2, buttons, document, show_first=False,
+                        start_page=0, start_frame=0):
+    """
+    Show a document page by page, in manual or auto-advance mode
+    
+    Pages are translated as they are reached (see Document); jumps carry
+    on into the neighbouring page at a page boundary. The reading position
+    is bookmarked at every page turn and when the session is interrupted,
+    and the bookmark is removed once the whole document has been read.
+    
+    Button gestures:
+        - Button 1 press: next Braille group (pause/resume in auto-advance mode)
+        - Button 1 long press: switch auto-advance mode on or off
+        - Button 2 press: play audio description
+        - Button 3 press: read the current page
+        - Button 2 / Button 3 long press: jump back / forward one sentence
+        - Buttons 1+2 / Buttons 1+3 together: jump back / forward one clause
+        - Buttons 2+3 together: jump back one word
+    
+    Args:
+        servos_group1 (list): First group of servos (left cell)
+        servos_group2 (list): Second group of servos (right cell)
+        buttons (dict): Dictionary of Button objects
+        document (Document): Document to display
+        show_first (bool): Show the first group straight away instead of
+                           waiting for a button press
+        start_page (int): Page to start at (e.g. from a bookmark)
+        start_frame (int): Display group to start at on that page
+    
+    Returns:
+        DocumentPage: The page shown last
+    """
+    jump_gestures = {
+        ('hold', ('audio',)): ('sentence', -1),
+        ('hold', ('tts',)): ('sentence', 1),
+        ('chord', ('audio', 'next')): ('clause', -1),
+        ('chord', ('next', 'tts')): ('clause', 1),
+        ('chord', ('audio', 'tts')): ('word', -1),
+    }
+    pacer = ReadingPacer()
+    auto_advance = False
+    paused = False
+    next_advance_time = None
+    page = document.page(start_page)
+    current_group = start_frame
+    finished = False
+    
+    try:
+        while page is not None and current_group < len(page.display_sequence):
+            gesture, names = read_button_gesture(buttons)
+            show_next = show_first
+            show_first = False
+        
+            if gesture == 'hold' and names == ('next',):
+                auto_advance = not auto_advance
+                paused = False
+                if auto_advance:
+                    print(f"\nAuto-advance on ({pacer.interval():.1f}s per group)")
+                    voice_prompt(VOICE_PROMPTS['auto_advance_on'])
+                    # Start right away if nothing has been shown yet
+                    next_advance_time = time.monotonic() + (pacer.interval() if current_group else 0)
+                else:
+                    print("\nAuto-advance off")
+                    voice_prompt(VOICE_PROMPTS['auto_advance_off'])
+        
+            elif gesture == 'press' and names == ('next',):
+                if auto_advance:
+                    paused = not paused
+                    print("\nAuto-advance paused" if paused else "\nAuto-advance resumed")
+                    if not paused:
+                        next_advance_time = time.monotonic() + pacer.interval()
+                else:
+                    pacer.record_manual_advance()
+                    show_next = True
+        
+            elif gesture == 'press' and names == ('audio',):
+                play_fixed_audio()
+        
+            elif gesture == 'press' and names == ('tts',):
+                text_to_speech(page.text)
+        
+            elif (gesture, names) in jump_gestures:
+                level, step = jump_gestures[(gesture, names)]
+                target_page = page
+                target = page.navigation.jump(level, current_group - 1, step)
+                if target is None:
+                    # Carry on into the previous or next page
+                    target_page = document.page(page.index + step)
+                    starts = target_page.navigation.starts[level] if target_page is not None else []
+                    target = (starts[-1] if step < 0 else starts[0]) if starts else None
+                if target is None:
+                    print(f"\nNo {level} to jump to")
+                    voice_prompt(VOICE_PROMPTS['beginning_of_text' if step < 0 else 'end_of_text'])
+                else:
+                    print(f"\nJumping {'back' if step < 0 else 'forward'} one {level}")
+                    page, current_group = target_page, target
+                    show_next = True
+        
+            if auto_advance and not paused and time.monotonic() >= next_advance_time:
+                show_next = True
+        
+            if show_next:
+                # Display current group
+                text, frame_offsets = page.text, page.frame_offsets
+                unit1, unit2, desc1, desc2 = page.display_sequence[current_group]
+                print(f"\nDisplaying group {current_group + 1}/{len(page.display_sequence)} "
+                      f"of page {page.index + 1}")
+            
+                # Start speaking the frame's characters together with the dots
+                frame_start = frame_offsets[current_group]
+                frame_chars = text[frame_start:frame_start + frame_char_count(frame_offsets, current_group, len(text))]
+                if FRAME_SPEECH_ENABLED:
+                    speak_frame(frame_chars)
+            
+                # Use optimized display function
+                display_dual_braille_optimized(
+                    servos_group1, servos_group2, 
+                    unit1, unit2,
+                    desc1, desc2
+                )
+            
+                # The next period only starts once actuation has finished
+                pacer.frame_displayed(len(frame_chars))
+                next_advance_time = time.monotonic() + pacer.interval()
+                current_group += 1
+            
+                # Turn the page (it has been translated in the background),
+                # skipping pages with nothing to display
+                while current_group >= len(page.display_sequence):
+                    next_page = document.page(page.index + 1)
+                    if next_page is None:
+                        break
+                    page, current_group = next_page, 0
+                    print(f"\nPage {page.index + 1}")
+                    bookmarks.save(document, page, 0)
+            
+                # Notify when all content is displayed
+                if current_group >= len(page.display_sequence):
+                    finished = True
+                    print("\nAll content has been displayed!")
+                    print(f"Reading speed: {pacer.characters_per_minute():.1f} characters per minute")
+                    voice_prompt(VOICE_PROMPTS['display_complete'])
+        
+            time.sleep(0.1)
+    finally:
+        # Remember where reading stopped, or forget a finished document
+        if finished:
+            bookmarks.forget(document)
+        elif page is not None:
+            bookmarks.save(document, page, current_group)
+    
+    return page
 
 
 def main():
@@ -843,38 +5959,57 @@ def main():
     This function initializes hardware, handles user interaction,
     and manages the main application loop.
     """
+    if GPIO is None or Button is None:
+        print("Error: RPi.GPIO and gpiozero are required to drive the Braille display")
+        print("Use --translate for headless text conversion")
+        return
+    
     try:
         # Initialize hardware components
         servos_group1, servos_group2 = initialize_servos()
         buttons = {name: Button(pin) for name, pin in BUTTON_PINS.items()}
+        if os.path.exists(FIXED_AUDIO_PATH) and get_audio_output() is not None:
+            start_fixed_audio_decode()
         
         while True:  # Main application loop
+            document = None
             try:
                 # Get input method selection from user
                 input_method = get_input_method(buttons)
                 
-                # Get input text based on selected method
-                text = get_input_text(input_method)
+                # Get the document to read based on selected method
+                document = get_input_document(input_method)
                 
                 # Exit condition
-                if text.lower() == 'q':
-                    voice_prompt("Thank you for using SenTranslator. See you next time!")
+                if document is None:
+                    voice_prompt(VOICE_PROMPTS['goodbye'])
                     break
                 
-                # Convert text to display sequence
-                display_sequence, char_data = convert_text_to_display_sequence(text)
+                # Translate the first page (or the bookmarked one); later
+                # pages are translated as they are reached
+                start_page, start_frame = bookmarks.restore(document) or (0, 0)
+                first_page = document.page(start_page)
+                if (start_page or start_frame) and (first_page is None or start_frame >= len(first_page.display_sequence)):
+                    # The bookmark no longer fits the document: start from the beginning
+                    start_page, start_frame = 0, 0
+                    first_page = document.page(0)
 
-                if not display_sequence:
+                if first_page is None or not first_page.display_sequence:
                     print("Error: Unable to convert input text to Braille")
-                    voice_prompt("Conversion failed, please try again")
+                    voice_prompt(VOICE_PROMPTS['conversion_failed'])
                     continue
 
-                voice_prompt("Conversion successful. Now press button 1 to display next Braille group, button 2 to play audio description, button 3 to read input text content")
-                print(f"\nTotal {len(display_sequence)} groups to display")
+                # The first group is raised while the confirmation is spoken
+                if start_page or start_frame:
+                    print(f"\nResuming at page {start_page + 1}, group {start_frame + 1}")
+                    voice_prompt(VOICE_PROMPTS['bookmark_resumed'], block=False)
+                else:
+                    voice_prompt(VOICE_PROMPTS['conversion_successful'], block=False)
+                print(f"\nPage {start_page + 1}: {len(first_page.display_sequence)} groups to display")
                 
                 # Display conversion details
                 print("\nDisplay plan:")
-                for i, (unit1, unit2, desc1, desc2) in enumerate(display_sequence):
+                for i, (unit1, unit2, desc1, desc2) in enumerate(first_page.display_sequence):
                     if unit2 and desc2:
                         print(f"Group {i+1}: {desc1}{unit1} + {desc2}{unit2}")
                     elif desc1:
@@ -882,41 +6017,12 @@ def main():
                     else:
                         print(f"Group {i+1}: {unit1} + Empty")
 
-                current_group = 0
-                print("\nWaiting for button press to start display...")
-                
-                # Display loop - show each Braille group
-                while current_group < len(display_sequence):
-                    if buttons['next'].is_pressed:
-                        # Display current group
-                        unit1, unit2, desc1, desc2 = display_sequence[current_group]
-                        print(f"\nDisplaying group {current_group + 1}/{len(display_sequence)}")
-                        
-                        # Use optimized display function
-                        display_dual_braille_optimized(
-                            servos_group1, servos_group2, 
-                            unit1, unit2,
-                            desc1, desc2
-                        )
-                        
-                        # Wait for button release
-                        buttons['next'].wait_for_release()
-                        current_group += 1
-                        
-                        # Notify when all content is displayed
-                        if current_group >= len(display_sequence):
-                            print("\nAll content has been displayed!")
-                            voice_prompt("Display complete")
-                            
-                    elif buttons['audio'].is_pressed:
-                        play_fixed_audio()
-                        buttons['audio'].wait_for_release()
-                        
-                    elif buttons['tts'].is_pressed:
-                        text_to_speech(text)
-                        buttons['tts'].wait_for_release()
-                        
-                    time.sleep(0.1)
+                # Display each Braille group, manually or in auto-advance mode
+                last_page = run_display_session(
+                    servos_group1, servos_group2, buttons,
+                    document, show_first=True,
+                    start_page=start_page, start_frame=start_frame
+                )
 
                 # Wait for user confirmation before reset
                 print("\nDisplay complete, press any button to reset all servos...")
@@ -925,35 +6031,137 @@ def main():
                         play_fixed_audio()
                         buttons['audio'].wait_for_release()
                     elif buttons['tts'].is_pressed:
-                        text_to_speech(text)
+                        text_to_speech(last_page.text)
                         buttons['tts'].wait_for_release()
                     time.sleep(0.1)
                 
-                # Reset all servos in batches
+                # Stop reading out the old text and reset all servos in batches
+                stop_text_to_speech()
                 reset_all_servos_batch(servos_group1, servos_group2)
                 
                 # Prepare for next round
-                voice_prompt("Welcome to continue using SenTranslator")
+                voice_prompt(VOICE_PROMPTS['continue'])
                 print("\n" + "="*50 + "\n")
                 
             except Exception as e:
                 print(f"\nProcessing error: {str(e)}")
-                voice_prompt("An error occurred, please try again")
+                voice_prompt(VOICE_PROMPTS['error'])
                 continue
+            finally:
+                if document is not None:
+                    document.close()
 
     except KeyboardInterrupt:
         print("\n\nProgram interrupted")
-        voice_prompt("Program interrupted")
+        voice_prompt(VOICE_PROMPTS['interrupted'])
     finally:
         # Cleanup resources
+        stop_text_to_speech()
         if 'servos_group1' in locals() and 'servos_group2' in locals():
             print("Resetting all servos...")
             reset_all_servos_batch(servos_group1, servos_group2)
             for servo in servos_group1 + servos_group2:
                 servo.stop()
+        cache_stats = tts_cache.stats()
+        print(f"TTS cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+              f"{cache_stats['evictions']} evictions")
+        if tts_client is not None:
+            print(f"TTS client: {tts_client.metrics()}")
+        if ocr_engine is not None:
+            print(f"OCR engine: {ocr_engine.metrics()}")
+            ocr_engine.close()
+        if ocr_pool is not None:
+            ocr_pool.shutdown(cancel_futures=True)
+        print(f"TTS backends: {tts_selector.stats()}")
+        print(f"TTS requests: {tts_requests.stats()}")
+        print(f"Web cache: {web_cache.stats()}")
+        if audio_output is not None:
+            print(f"Audio output: {audio_output.stats()}")
+            audio_output.close()
         print("Resources released")
 
 
+def run_command_line(argv):
+    """
+    Command-line entry point
+    
+    Without options the device application (main) is started. With
+    --translate, text is converted headlessly with no GPIO, buttons or TTS
+    (--fetch does the same for web pages and feeds, fetched concurrently),
+    --serve runs the local HTTP translation service, and
+    --build-prompt-bundle and --build-pronunciation-bank pre-render the
+    voice prompts and character pronunciations (install steps).
+    
+    Args:
+        argv (list): Command-line arguments (excluding the program name)
+    
+    Returns:
+        int: Process exit status
+    """
+    parser = argparse.ArgumentParser(
+        description="SenTranslator - Chinese Braille translator"
+    )
+    parser.add_argument('--translate', nargs='*', metavar='FILE',
+                        help="translate text files (or stdin) to Braille without hardware")
+    parser.add_argument('--fetch', nargs='+', metavar='URL',
+                        help="fetch web pages and RSS/Atom feeds concurrently and translate "
+                             "each page (one output line per page) as it arrives")
+    parser.add_argument('--format', choices=['unicode', 'brf', 'json'], default='unicode',
+                        help="output format for --translate and --fetch: Unicode Braille, "
+                             "BRF (ASCII Braille) or one JSON display group per line")
+    parser.add_argument('--progress', action='store_true',
+                        help="report progress and throughput on stderr")
+    parser.add_argument('--serve', nargs='?', const=f"{SERVICE_HOST}:{SERVICE_PORT}",
+                        metavar='HOST:PORT',
+                        help=f"run the local HTTP translation service "
+                             f"(default {SERVICE_HOST}:{SERVICE_PORT})")
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS,
+                        help="translation worker processes for --serve")
+    parser.add_argument('--verbose', action='store_true',
+                        help="log every request handled by --serve")
+    parser.add_argument('--build-prompt-bundle', action='store_true',
+                        help=f"render every voice prompt into {PROMPT_BUNDLE_PATH}")
+    parser.add_argument('--build-pronunciation-bank', action='store_true',
+                        help=f"render every character's pronunciation into {PRONUNCIATION_BANK_PATH}")
+    args = parser.parse_args(argv)
+    
+    if args.build_pronunciation_bank:
+        covered, clips = PronunciationBank.build(PRONUNCIATION_BANK_PATH)
+        print(f"Pronunciation bank written: {covered}/{PronunciationBank.SLOT_COUNT} characters, "
+              f"{clips} clips -> {PRONUNCIATION_BANK_PATH}")
+        return 0 if clips else 1
+    
+    if args.build_prompt_bundle:
+        count = PromptBundle.build(PROMPT_BUNDLE_PATH, list(VOICE_PROMPTS.values()))
+        print(f"Voice prompt bundle written: {count}/{len(VOICE_PROMPTS)} prompts -> {PROMPT_BUNDLE_PATH}")
+        return 0 if count == len(VOICE_PROMPTS) else 1
+    
+    if args.serve is not None:
+        host, _, port = args.serve.rpartition(':')
+        if not port.isdigit() or args.workers < 1:
+            parser.error("--serve expects HOST:PORT and --workers must be at least 1")
+        run_translation_service(host or SERVICE_HOST, int(port), args.workers, args.verbose)
+        return 0
+    
+    if args.translate is not None or args.fetch:
+        if args.fetch:
+            lines = iter_fetched_lines(args.fetch, args.progress)
+        else:
+            lines = iter_input_lines(args.translate)
+        try:
+            translate_stream(lines, args.format, progress=args.progress)
+        except BrokenPipeError:
+            # Output closed early (e.g. piped into head)
+            sys.stderr.close()
+        except OSError as e:
+            print(f"Translation failed: {str(e)}", file=sys.stderr)
+            return 1
+        return 0
+    
+    main()
+    return 0
+
+
 if __name__ == '__main__':
     """
     Program entry point
@@ -963,6 +6171,7 @@ if __name__ == '__main__':
     
     Usage:
         python3 sentranslator_main.py
+        python3 SenTranslator.py --translate book.txt --format brf --progress
     
     Hardware Setup:
         1. Connect 12 linear servo motors to specified GPIO pins
@@ -974,8 +6183,7 @@ if __name__ == '__main__':
         - RPi.GPIO: Raspberry Pi GPIO control
         - gpiozero: Simplified GPIO interface
         - pypinyin: Chinese pinyin conversion
-        - aip: Baidu AI Platform SDK (for TTS)
-        - requests, beautifulsoup4: Web scraping
+        - requests: Baidu TTS REST API and web page download
         - pytesseract, Pillow: OCR functionality
     """
-    main()
\ No newline at end of file
+    sys.exit(run_command_line(sys.argv[1:]))
\ No newline at end of file
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SenTranslator Content Extraction Benchmark
+==========================================
+
+This script compares the HTML parser backends used for web extraction:
+1. Parse time per page for each installed backend (lxml, selectolax, html.parser)
+2. Quality of the extracted main content against reference text
+3. Junk in the first characters read out, compared with reading all
+   visible text (the old get_text() behaviour)
+
+Corpus: a directory of saved pages (*.html / *.htm). A page's reference
+text is read from a .txt file with the same name; pages without one are
+timed but not scored. Without --corpus, a synthetic corpus of news-style
+pages (menus, ads, sidebars, comments and footers around an article) is used.
+
+    python3 "Tests/Content extraction benchmark.py" --corpus saved_pages/
+
+Author: SenTranslator Project
+Version: 1.0.0
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from SenTranslator import ContentScorer, available_parser_backends, create_content_parser
+
+# Sentences for synthetic pages
+ARTICLE_SENTENCES = [
+    "今天上午，市政府召开新闻发布会，介绍了今年的城市建设情况。",
+    "相关负责人表示，今年将新建公园十座，并改造道路二十条。",
+    "盲文是由六个凸点组成的触觉文字系统，视障人士通过触摸来阅读。",
+    "专家认为，无障碍设施的普及能让更多人平等地获取信息。",
+    "该项目从去年开始试点，目前已经覆盖了全市大部分社区。",
+    "据统计，全国视障人士超过一千七百万，阅读需求十分迫切。",
+    "志愿者们利用周末时间，为社区老人讲解智能设备的使用方法。",
+    "记者在现场看到，许多市民排队体验新推出的便民服务。"
+]
+BOILERPLATE_LINKS = ["首页", "新闻", "体育", "财经", "科技", "娱乐", "汽车", "房产",
+                     "登录", "注册", "关于我们", "联系我们", "网站地图", "更多"]
+HEAD_CHARS = 300  # Characters checked for junk at the start of the text
+
+
+def synthetic_page(rng, index):
+    """Build one synthetic news page and its reference text"""
+    paragraphs = [''.join(rng.sample(ARTICLE_SENTENCES, rng.randint(2, 4)))
+                  for _ in range(rng.randint(4, 12))]
+    links = lambda count: ''.join(f'<li><a href="/{i}">{rng.choice(BOILERPLATE_LINKS)}</a></li>'
+                                  for i in range(count))
+    html = f"""<!DOCTYPE html><html><head><meta charset="utf-8"><title>新闻 {index}</title>
+<style>.nav {{ color: red; }}</style><script>var tracking = "<p>不可见</p>";</script></head>
+<body><div id="header"><ul class="nav-menu">{links(12)}</ul></div>
+<div class="ad-banner">热门推荐：限时抢购，全场五折，欢迎选购！点击查看更多优惠活动。</div>
+<div class="wrapper"><div class="main-column"><div class="article-content">
+<h1>第{index}号新闻标题</h1>{''.join(f'<p>{p}</p>' for p in paragraphs)}
+</div><div class="comments"><p>网友评论：说得好，支持！</p><p>网友评论：希望早日实现。</p></div></div>
+<div class="sidebar"><h3>热门排行</h3><ul>{links(10)}</ul></div></div>
+<div class="footer">版权所有 © 2024 示例新闻网，保留所有权利。{links(6)}</div></body></html>"""
+    return html, ''.join(paragraphs)
+
+
+def load_corpus(directory):
+    """Load saved pages and their reference texts"""
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(('.html', '.htm')):
+            continue
+        path = os.path.join(directory, name)
+        with open(path, 'rb') as f:
+            data = f.read()
+        match = re.search(rb'<meta[^>]+charset\s*=\s*["\']?([\w-]+)', data[:4096], re.IGNORECASE)
+        encoding = match.group(1).decode('ascii').lower() if match else 'utf-8'
+        if encoding in ('gb2312', 'gbk'):
+            encoding = 'gb18030'
+        try:
+            html = data.decode(encoding, errors='replace')
+        except LookupError:
+            html = data.decode('utf-8', errors='replace')
+        reference = None
+        reference_path = os.path.splitext(path)[0] + '.txt'
+        if os.path.exists(reference_path):
+            with open(reference_path, 'r', encoding='utf-8') as f:
+                reference = f.read()
+        pages.append((name, html, reference))
+    return pages
+
+
+def bigrams(text):
+    """Character bigrams of text, ignoring whitespace"""
+    text = ''.join(text.split())
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def quality(extracted, reference):
+    """Precision, recall and F1 of extracted text against the reference (bigram overlap)"""
+    got, want = bigrams(extracted), bigrams(reference)
+    if not got or not want:
+        return 0.0, 0.0, 0.0
+    overlap = len(got & want)
+    precision, recall = overlap / len(got), overlap / len(want)
+    f1 = 2 * precision * recall / (precision + recall) if overlap else 0.0
+    return precision, recall, f1
+
+
+def extract(html, backend):
+    """Parse a page with one backend and return the scorer"""
+    scorer = ContentScorer(scan_chars=float('inf'))
+    parser = create_content_parser(scorer, backend)
+    parser.feed(html)
+    parser.close()
+    return scorer
+
+
+def run_benchmark(pages, backends, iterations):
+    """Time every backend and score its output"""
+    print(f"\n📄 {len(pages)} pages, {iterations} iterations, backends: {', '.join(backends)}")
+    results = {}
+    for backend in backends:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for name, html, reference in pages:
+                extract(html, backend)
+        elapsed = time.perf_counter() - start
+
+        scores = {'main': [], 'all': [], 'head_main': [], 'head_all': []}
+        for name, html, reference in pages:
+            if reference is None:
+                continue
+            scorer = extract(html, backend)
+            scores['main'].append(quality(scorer.text(), reference)[2])
+            scores['all'].append(quality(scorer.text(main_only=False), reference)[2])
+            scores['head_main'].append(quality(scorer.text(HEAD_CHARS), reference)[0])
+            scores['head_all'].append(quality(scorer.text(HEAD_CHARS, main_only=False), reference)[0])
+        results[backend] = (elapsed * 1000 / (iterations * len(pages)), scores)
+    return results
+
+
+def print_summary(results):
+    """Print parse time and quality per backend"""
+    print("\n📊 CONTENT EXTRACTION SUMMARY")
+    print("=" * 30)
+    mean = lambda values: sum(values) / len(values) if values else float('nan')
+    reference_backend = 'html.parser' if 'html.parser' in results else next(iter(results))
+    baseline = results[reference_backend][0]
+    for backend, (ms_per_page, scores) in results.items():
+        print(f"\n{backend}:")
+        print(f"   Parse + score:          {ms_per_page:.2f} ms per page "
+              f"({baseline / ms_per_page:.1f}x vs {reference_backend})")
+        if scores['main']:
+            print(f"   F1 main content:        {mean(scores['main']):.3f}  "
+                  f"(all visible text {mean(scores['all']):.3f})")
+            print(f"   First {HEAD_CHARS} chars clean:  {mean(scores['head_main']):.1%}  "
+                  f"(all visible text {mean(scores['head_all']):.1%})")
+
+
+def main():
+    """Main benchmark interface"""
+    parser = argparse.ArgumentParser(description="SenTranslator content extraction benchmark")
+    parser.add_argument('--corpus', help="directory of saved .html pages (with optional .txt references)")
+    parser.add_argument('--pages', type=int, default=50, help="synthetic pages when no corpus is given")
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--backends', nargs='+', choices=['lxml', 'selectolax', 'html.parser'],
+                        help="backends to compare (default: all installed)")
+    args = parser.parse_args()
+
+    print("🎯 SenTranslator Content Extraction Benchmark")
+    print("=" * 45)
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+        if not pages:
+            print(f"❌ No .html pages found in {args.corpus}")
+            return 1
+    else:
+        rng = random.Random(42)
+        pages = [(f"synthetic-{i}", *synthetic_page(rng, i)) for i in range(args.pages)]
+
+    backends = args.backends or available_parser_backends()
+    missing = [backend for backend in backends if backend not in available_parser_backends()]
+    if missing:
+        print(f"⚠️ Not installed, skipped: {', '.join(missing)}")
+        backends = [backend for backend in backends if backend not in missing]
+
+    print_summary(run_benchmark(pages, backends, args.iterations))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SenTranslator Document Extraction Benchmark
+===========================================
+
+This script measures how quickly EPUB, DOCX and PDF documents start
+displaying, and how much memory they take:
+1. Time to first frame: opening the document until the first page is
+   translated and its first Braille group is ready
+2. Peak RSS of the process doing it
+3. Both compared with extracting the whole document first
+
+Every measurement runs in a fresh process so peak RSS is not shared.
+Without file arguments, large sample documents are generated (the sample
+PDF holds Latin text, as Chinese would need an embedded font).
+
+    python3 "Tests/Document extraction benchmark.py" novel.epub report.docx manual.pdf
+
+Author: SenTranslator Project
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Sentences for sample documents
+CHINESE_SENTENCES = [
+    "盲文是由六个凸点组成的触觉文字系统，视障人士通过触摸来阅读。",
+    "今天上午，市政府召开新闻发布会，介绍了今年的城市建设情况。",
+    "他推开窗户，看见院子里的梅花已经开了，空气里有淡淡的香味。",
+    "第3章讲述了主人公在1998年离开家乡，独自前往北京求学的经历。",
+    "志愿者们利用周末时间，为社区老人讲解智能设备的使用方法。"
+]
+LATIN_SENTENCES = [
+    "Braille is a tactile writing system used by people who are visually impaired.",
+    "Each cell has six raised dots arranged in two columns of three.",
+    "The committee met on Tuesday to review the annual budget proposal.",
+    "Chapter 3 describes the journey north through the mountains in 1998."
+]
+
+
+def paragraphs(rng, count, sentences):
+    """Random paragraphs of two to five sentences"""
+    return [''.join(rng.choice(sentences) for _ in range(rng.randint(2, 5))) for _ in range(count)]
+
+
+def write_epub(path, rng, chapters):
+    """Write a sample EPUB with the given number of chapters"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('mimetype', 'application/epub+zip', zipfile.ZIP_STORED)
+        archive.writestr('META-INF/container.xml',
+                         '<?xml version="1.0"?><container version="1.0" '
+                         'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+                         '<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+                         '</rootfiles></container>')
+        items, refs = [], []
+        for i in range(chapters):
+            body = ''.join(f'<p>{escape(p)}</p>' for p in paragraphs(rng, 100, CHINESE_SENTENCES))
+            archive.writestr(f'OEBPS/text/chapter{i}.xhtml',
+                             f'<?xml version="1.0" encoding="utf-8"?><html xmlns="http://www.w3.org/1999/xhtml">'
+                             f'<head><title>第{i + 1}章</title></head><body><h1>第{i + 1}章</h1>{body}</body></html>')
+            items.append(f'<item id="c{i}" href="text/chapter{i}.xhtml" media-type="application/xhtml+xml"/>')
+            refs.append(f'<itemref idref="c{i}"/>')
+        archive.writestr('OEBPS/content.opf',
+                         '<?xml version="1.0"?><package xmlns="http://www.idpf.org/2007/opf" version="3.0">'
+                         f'<manifest>{"".join(items)}</manifest><spine>{"".join(refs)}</spine></package>')
+
+
+def write_docx(path, rng, count):
+    """Write a sample DOCX with the given number of paragraphs"""
+    namespace = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+    body = ''.join(f'<w:p><w:r><w:t>{escape(p)}</w:t></w:r></w:p>'
+                   for p in paragraphs(rng, count, CHINESE_SENTENCES))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml',
+                         '<?xml version="1.0"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                         '<Override PartName="/word/document.xml" ContentType="application/'
+                         'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+        archive.writestr('word/document.xml',
+                         f'<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w="{namespace}">'
+                         f'<w:body>{body}</w:body></w:document>')
+
+
+def write_pdf(path, rng, pages):
+    """Write a sample PDF with the given number of text pages"""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for _ in range(pages):
+        lines = [rng.choice(LATIN_SENTENCES)[:70] for _ in range(45)]
+        text = ' '.join(f'({line}) Tj T*' for line in lines)
+        stream = f'BT /F1 10 Tf 14 TL 50 780 Td {text} ET'.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % kid for kid in kids), len(kids))
+
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.4\n')
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(f.tell())
+            f.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+        xref = f.tell()
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+        f.write(b''.join(b'%010d 00000 n \n' % offset for offset in offsets))
+        f.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+
+
+def build_samples(directory, scale):
+    """Generate sample documents and return their paths"""
+    rng = random.Random(42)
+    samples = [('sample.epub', write_epub, 200), ('sample.docx', write_docx, 20000),
+               ('sample.pdf', write_pdf, 1000)]
+    paths = []
+    for name, writer, count in samples:
+        path = os.path.join(directory, name)
+        writer(path, rng, max(1, int(count * scale)))
+        paths.append(path)
+    return paths
+
+
+def measure(mode, path):
+    """Time to first frame and peak RSS for one document (runs in a child process)"""
+    import SenTranslator
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == 'stream':
+        document = SenTranslator.open_document(path)
+        page = document.page(0)
+        first_group = page.display_sequence[0]
+        document.close()
+    else:
+        # Old approach: extract the whole document, then translate the start
+        text = SenTranslator.extract_text_from_file(path)
+        first_group = SenTranslator.TextDocument(text).page(0).display_sequence[0]
+    seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'seconds': seconds, 'peak_kb': peak_kb, 'added_kb': peak_kb - baseline_kb,
+                      'first_group': str(first_group[0])}))
+
+
+def run_child(mode, path):
+    """Run one measurement in a fresh interpreter"""
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', mode, path],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Main benchmark interface"""
+    parser = argparse.ArgumentParser(description="SenTranslator document extraction benchmark")
+    parser.add_argument('files', nargs='*', help="EPUB, DOCX or PDF files (default: generated samples)")
+    parser.add_argument('--scale', type=float, default=1.0, help="size of the generated samples")
+    parser.add_argument('--measure', nargs=2, metavar=('MODE', 'FILE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return 0
+
+    print("🎯 SenTranslator Document Extraction Benchmark")
+    print("=" * 45)
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = args.files or build_samples(directory, args.scale)
+        print("\n📊 DOCUMENT EXTRACTION SUMMARY")
+        print("=" * 30)
+        for path in files:
+            print(f"\n{os.path.basename(path)} ({os.path.getsize(path) / 2 ** 20:.1f} MB):")
+            try:
+                stream = run_child('stream', path)
+                whole = run_child('whole', path)
+            except subprocess.CalledProcessError as e:
+                print(f"   ❌ Failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+                continue
+            print(f"   Time to first frame:  {stream['seconds'] * 1000:8.1f} ms streamed, "
+                  f"{whole['seconds'] * 1000:8.1f} ms extracting everything first")
+            print(f"   Peak RSS:             {stream['peak_kb'] / 1024:8.1f} MB streamed, "
+                  f"{whole['peak_kb'] / 1024:8.1f} MB extracting everything first")
+            print(f"   Added by the document:{stream['added_kb'] / 1024:8.1f} MB streamed, "
+                  f"{whole['added_kb'] / 1024:8.1f} MB extracting everything first")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
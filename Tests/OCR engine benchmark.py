@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SenTranslator OCR Engine Benchmark
+==================================
+
+This script compares the OCR backends used by OCREngine:
+1. tesserocr: the Tesseract API is initialized once and kept in memory
+2. pytesseract: the tesseract binary is started for every image
+3. tesserocr with the models reloaded for every image, which is what
+   pytesseract does apart from starting a process (useful where the
+   tesseract binary is not installed)
+4. Model load time and recognition time per image, reported separately,
+   and the total time for a run of images with each
+
+Images: a directory of photos or scans (*.png / *.jpg / *.tif). Without
+--images, synthetic text images are generated. Images are preprocessed
+once, before timing, so only recognition is measured.
+
+    python3 "Tests/OCR engine benchmark.py" --images photos/ --languages chi_sim+eng
+
+Author: SenTranslator Project
+Version: 1.0.0
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from SenTranslator import (OCR_LANGUAGES, OCR_TESSDATA_PATH, OCREngine, available_ocr_backends,
+                           preprocess_ocr_image)
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+# Lines for synthetic images
+SAMPLE_LINES = [
+    "Braille is read by touch, one cell at a time.",
+    "The display shows 2 cells of 6 dots each.",
+    "Press Button 1 to move to the next group.",
+    "盲文是由六个凸点组成的触觉文字系统。",
+    "今天天气很好，我们一起去公园散步吧。",
+    "视障人士通过触摸来阅读。"
+]
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp')
+
+
+def synthetic_image(rng):
+    """Render a few lines of text on a white page"""
+    font = ImageFont.load_default(36)
+    lines = rng.sample(SAMPLE_LINES, 4)
+    image = Image.new('L', (1400, 80 + 70 * len(lines)), 255)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((40, 40 + 70 * i), line, font=font, fill=0)
+    return image
+
+
+def load_images(directory):
+    """Load and preprocess the images in a directory"""
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            images.append(preprocess_ocr_image(Image.open(os.path.join(directory, name))))
+    return images
+
+
+def backend_runnable(backend):
+    """Whether a backend can actually run here"""
+    if backend == 'pytesseract':
+        return 'pytesseract' in available_ocr_backends() and shutil.which('tesseract') is not None
+    return backend in available_ocr_backends()
+
+
+def run_benchmark(images, backend, languages, tessdata, reload=False):
+    """
+    Recognize every image with one engine, or with a new engine per image
+
+    Returns (load seconds per engine, recognition seconds per image,
+    total seconds, first text).
+    """
+    load_times, latencies, texts = [], [], []
+    engine = None
+    start_all = time.perf_counter()
+    for image in images:
+        if engine is None:
+            engine = OCREngine(languages, tessdata, backend=backend)
+            start = time.perf_counter()
+            engine.load()
+            load_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        texts.append(engine.recognize(image))
+        latencies.append(time.perf_counter() - start)
+        if reload:
+            engine.close()
+            engine = None
+    total_seconds = time.perf_counter() - start_all
+    if engine is not None:
+        engine.close()
+    return load_times, latencies, total_seconds, texts[0]
+
+
+def print_summary(results, count):
+    """Print load and per-image times per configuration"""
+    print("\n📊 OCR ENGINE SUMMARY")
+    print("=" * 30)
+    for label, (load_times, latencies, total_seconds, text) in results.items():
+        print(f"\n{label}:")
+        print(f"   Model load:         {statistics.mean(load_times) * 1000:8.1f} ms x {len(load_times)}")
+        print(f"   Recognition (p50):  {statistics.median(latencies) * 1000:8.1f} ms per image")
+        print(f"   {count} images:   {total_seconds:12.2f} s ({total_seconds * 1000 / count:.0f} ms per image)")
+        print(f"   First text:         {' '.join(text.split())[:60]}")
+    baseline = results.get('pytesseract') or results.get('tesserocr, reloaded per image')
+    if 'tesserocr' in results and baseline:
+        print(f"\nKeeping the engine loaded is {baseline[2] / results['tesserocr'][2]:.1f}x faster "
+              f"over {count} images")
+
+
+def main():
+    """Main benchmark interface"""
+    parser = argparse.ArgumentParser(description="SenTranslator OCR engine benchmark")
+    parser.add_argument('--images', help="directory of images to recognize")
+    parser.add_argument('--count', type=int, default=10, help="synthetic images when no directory is given")
+    parser.add_argument('--languages', default=OCR_LANGUAGES)
+    parser.add_argument('--tessdata', default=OCR_TESSDATA_PATH, help="directory holding the .traineddata models")
+    args = parser.parse_args()
+
+    print("🎯 SenTranslator OCR Engine Benchmark")
+    print("=" * 40)
+
+    if Image is None:
+        print("❌ Pillow is not installed")
+        return 1
+    if args.images:
+        images = load_images(args.images)
+        if not images:
+            print(f"❌ No images found in {args.images}")
+            return 1
+    else:
+        rng = random.Random(42)
+        images = [synthetic_image(rng) for _ in range(args.count)]
+
+    configurations = [('tesserocr', 'tesserocr', False),
+                      ('tesserocr, reloaded per image', 'tesserocr', True),
+                      ('pytesseract', 'pytesseract', False)]
+    results = {}
+    for label, backend, reload in configurations:
+        if not backend_runnable(backend):
+            print(f"⚠️ {label}: not installed, skipped")
+            continue
+        try:
+            results[label] = run_benchmark(images, backend, args.languages, args.tessdata, reload)
+        except RuntimeError as e:
+            print(f"❌ {label}: {e}")
+    if not results:
+        print("❌ No OCR backend could run (pip3 install tesserocr, or install tesseract for pytesseract)")
+        return 1
+
+    print_summary(results, len(images))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
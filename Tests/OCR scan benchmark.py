@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SenTranslator OCR Scan Benchmark
+================================
+
+This script measures parallel OCR of large pages and multi-page scans:
+1. A full page at 300 DPI, recognized in one call (the single-core path)
+2. The same page split into text regions recognized by a worker pool
+3. A multi-page scan, page by page in one process and a page per worker
+4. Whether the parallel text matches the single-call text, in order
+
+Pass your own scans (images, multi-page TIFFs or PDFs) with --scans;
+otherwise a synthetic page and a multi-page TIFF are generated.
+
+    python3 "Tests/OCR scan benchmark.py" --scans scans/ --workers 4
+
+Author: SenTranslator Project
+Version: 1.0.0
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import SenTranslator
+from SenTranslator import available_ocr_backends, init_ocr_worker, iter_scan_pages, recognize_scan
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+# Words for synthetic pages
+SAMPLE_WORDS = ["braille", "reader", "touch", "cell", "dots", "display", "button", "page",
+                "line", "text", "book", "library", "learn", "盲文", "阅读", "触摸", "点字"]
+PAGE_SIZE = (2480, 3508)  # A4 at 300 DPI
+
+
+def synthetic_page(rng, columns=1):
+    """Render a full page of text lines, in one or two columns"""
+    image = Image.new('L', PAGE_SIZE, 255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(40)
+    width = (PAGE_SIZE[0] - 300) // columns
+    for column in range(columns):
+        for line in range(55):
+            text = ' '.join(rng.choice(SAMPLE_WORDS) for _ in range(14 // columns))
+            draw.text((150 + column * width, 150 + line * 58), text, font=font, fill=0)
+    image.info['dpi'] = (300, 300)
+    return image
+
+
+def synthetic_scans(directory, pages):
+    """Write a single page and a multi-page TIFF"""
+    rng = random.Random(42)
+    page_path = os.path.join(directory, 'page.png')
+    synthetic_page(rng).save(page_path, dpi=(300, 300))
+    tiff_path = os.path.join(directory, 'scan.tif')
+    frames = [synthetic_page(rng, columns=1 + i % 2) for i in range(pages)]
+    frames[0].save(tiff_path, save_all=True, append_images=frames[1:], dpi=(300, 300), compression='tiff_lzw')
+    return [page_path, tiff_path]
+
+
+def words(text):
+    """Text without line breaks and spacing differences"""
+    return ' '.join(text.split())
+
+
+def run_benchmark(paths, pool):
+    """Recognize every scan with and without the pool"""
+    results = []
+    for path in paths:
+        pages = list(iter_scan_pages(path))
+        start = time.perf_counter()
+        single = recognize_scan(pages)
+        single_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        parallel = recognize_scan(pages, pool)
+        parallel_seconds = time.perf_counter() - start
+        results.append((os.path.basename(path), len(pages), single_seconds, parallel_seconds,
+                        words(single) == words(parallel)))
+    return results
+
+
+def print_summary(results, workers):
+    """Print single-call and parallel times per scan"""
+    print("\n📊 OCR SCAN SUMMARY")
+    print("=" * 30)
+    print(f"{'':16} {'pages':>5} {'single':>9} {f'{workers} workers':>10} {'speedup':>8}  same text")
+    for name, pages, single, parallel, same in results:
+        print(f"{name[:16]:16} {pages:5} {single:8.2f}s {parallel:9.2f}s {single / parallel:7.2f}x  "
+              f"{'✅' if same else '❌'}")
+
+
+def main():
+    """Main benchmark interface"""
+    parser = argparse.ArgumentParser(description="SenTranslator OCR scan benchmark")
+    parser.add_argument('--scans', help="directory of scans (images, multi-page TIFFs, PDFs)")
+    parser.add_argument('--pages', type=int, default=4, help="pages in the synthetic TIFF")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--languages', default=SenTranslator.OCR_LANGUAGES)
+    parser.add_argument('--tessdata', default=SenTranslator.OCR_TESSDATA_PATH,
+                        help="directory holding the .traineddata models")
+    args = parser.parse_args()
+
+    print("🎯 SenTranslator OCR Scan Benchmark")
+    print("=" * 40)
+
+    if Image is None or not available_ocr_backends():
+        print("❌ Needs Pillow and tesserocr or pytesseract")
+        return 1
+    # Workers are forked from this process and pick up these settings
+    SenTranslator.OCR_LANGUAGES = args.languages
+    SenTranslator.OCR_TESSDATA_PATH = args.tessdata
+    SenTranslator.OCR_WORKERS = args.workers
+    # pytesseract imports without the tesseract binary and only fails on the
+    # first image (pytesseract.TesseractNotFoundError, an OSError)
+    try:
+        SenTranslator.get_ocr_engine().recognize(Image.new('L', (64, 32), 255))
+    except (RuntimeError, OSError) as e:
+        print(f"⚠️ OCR engine cannot run here, benchmark skipped: {e}")
+        return 1
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    if cores < args.workers:
+        print(f"⚠️ Only {cores} cores available: expect little speedup with {args.workers} workers")
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.scans:
+            paths = [os.path.join(args.scans, name) for name in sorted(os.listdir(args.scans))
+                     if name.lower().endswith(('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.pdf'))]
+        else:
+            paths = synthetic_scans(directory, args.pages)
+        if not paths:
+            print(f"❌ No scans found in {args.scans}")
+            return 1
+
+        # Start the workers (and load their models) before timing
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_ocr_worker) as pool:
+            list(pool.map(abs, range(args.workers * 4)))
+            print(f"\n📄 {len(paths)} scans, {args.workers} workers, {cores} cores")
+            results = run_benchmark(paths, pool)
+
+    print_summary(results, args.workers)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
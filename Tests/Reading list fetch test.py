@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SenTranslator Reading List Fetch Test
+=====================================
+
+This script tests the concurrent reading list / feed fetcher against a
+local HTTP server that serves pages with artificial latency:
+1. RSS and Atom feeds are expanded and every entry is extracted
+2. Pages are fetched in parallel (total time close to the slowest page)
+3. The per-host limit caps the requests the server sees at once
+4. Results arrive in completion order, fastest page first
+5. Slow pages time out without holding up the others
+6. Pages that keep trickling in past the timeout give up their worker
+   threads, so the pages queued behind them still load
+7. A reading list document can be read before the slowest page arrives
+
+No network access is needed.
+
+Author: SenTranslator Project
+Version: 1.0.0
+"""
+
+import os
+import sys
+import time
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from SenTranslator import WEB_CHUNK_BYTES, ReadingListDocument, ReadingListFetcher, fetch_reading_list
+
+SERVER_HOST = '127.0.0.1'
+PAGE_DELAYS = [0.6, 0.2, 0.5, 0.1, 0.4, 0.3, 0.7, 0.15]  # Seconds per feed entry
+SLOW_PAGE_DELAY = 3.0
+TRICKLE_INTERVAL = 0.2       # Seconds between chunks of a trickling page
+
+
+class ServerState:
+    """Counters shared by the fixture server handlers"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+
+class LatencyHandler(BaseHTTPRequestHandler):
+    """
+    Serves feeds and article pages, sleeping ?delay= seconds per page
+
+    /trickle pages send a chunk every TRICKLE_INTERVAL seconds for
+    SLOW_PAGE_DELAY seconds, so no single read ever times out.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, content_type, body):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:
+            pass  # The client gave up
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(url.query)
+
+        if url.path == '/rss.xml':
+            items = ''.join(f"<item><title>文章{i}</title><link>/page/{i}?delay={delay}</link></item>"
+                            for i, delay in enumerate(PAGE_DELAYS))
+            body = f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'
+            self.send_body('application/rss+xml; charset=utf-8', body.encode('utf-8'))
+            return
+
+        if url.path == '/atom.xml':
+            entries = ''.join(f'<entry><title>条目{i}</title><link href="/page/a{i}?delay=0.1"/></entry>'
+                              for i in range(3))
+            body = f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+            self.send_body('application/atom+xml', body.encode('utf-8'))
+            return
+
+        if url.path.startswith('/trickle'):
+            chunks = int(SLOW_PAGE_DELAY / TRICKLE_INTERVAL)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(chunks * WEB_CHUNK_BYTES))
+            self.end_headers()
+            try:
+                for _ in range(chunks):
+                    self.wfile.write(b' ' * WEB_CHUNK_BYTES)
+                    self.wfile.flush()
+                    time.sleep(TRICKLE_INTERVAL)
+            except OSError:
+                pass  # The client gave up
+            return
+
+        state = self.state
+        with state.lock:
+            state.in_flight += 1
+            state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        try:
+            time.sleep(float(query.get('delay', ['0'])[0]))
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+        name = url.path.rsplit('/', 1)[-1]
+        body = (f'<html><body><div class="nav"><a href="/">首页</a></div>'
+                f'<div class="article"><p>这是第{name}篇文章的正文内容，用于测试并发抓取。</p></div>'
+                f'</body></html>')
+        self.send_body('text/html; charset=utf-8', body.encode('utf-8'))
+
+
+def start_server():
+    """Start the fixture server on a free port"""
+    state = ServerState()
+    handler = type('Handler', (LatencyHandler,), {'state': state})
+    server = ThreadingHTTPServer((SERVER_HOST, 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def check(condition, message):
+    """Print a test result"""
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+def main():
+    """Run the fetch tests"""
+    print("📰 SenTranslator Reading List Fetch Test")
+    print("=" * 40)
+    server, state = start_server()
+    base = f"http://{SERVER_HOST}:{server.server_address[1]}"
+    results = []
+
+    # Test 1: RSS feed with per-host limit
+    print("\n📍 Test 1: RSS feed, 8 entries, 3 per host")
+    fetcher = ReadingListFetcher(concurrency=8, per_host=3)
+    start = time.perf_counter()
+    pages = list(fetch_reading_list([f"{base}/rss.xml"], fetcher))
+    elapsed = time.perf_counter() - start
+    for page in pages:
+        print(f"   {page['title']}: {page['seconds']:.2f}s {(page['text'] or page['error'])[:30]}")
+    results.append(check(len(pages) == len(PAGE_DELAYS) and all(page['text'] for page in pages),
+                         f"All {len(PAGE_DELAYS)} entries extracted"))
+    results.append(check(all('正文' in page['text'] and '首页' not in page['text'] for page in pages),
+                         "Main content extracted without navigation"))
+    results.append(check(elapsed < sum(PAGE_DELAYS) / 2,
+                         f"Fetched in parallel ({elapsed:.2f}s vs {sum(PAGE_DELAYS):.2f}s sequential)"))
+    results.append(check(state.max_in_flight <= 3,
+                         f"Per-host limit respected ({state.max_in_flight} requests at once)"))
+    print(f"   Fetcher: {fetcher.stats()}")
+
+    # Test 2: completion order
+    print("\n📍 Test 2: Completion order")
+    urls = [f"{base}/page/{i}?delay={delay}" for i, delay in enumerate([0.6, 0.1, 0.3])]
+    order = [page['url'] for page in fetch_reading_list(urls)]
+    results.append(check(order == [urls[1], urls[2], urls[0]], "Fastest page is handed over first"))
+
+    # Test 3: Atom feed mixed with a page
+    print("\n📍 Test 3: Atom feed and a page together")
+    pages = list(fetch_reading_list([f"{base}/atom.xml", f"{base}/page/x?delay=0.1"]))
+    results.append(check(len(pages) == 4 and all(page['text'] for page in pages),
+                         f"Atom entries and page extracted ({len(pages)} pages)"))
+
+    # Test 4: timeout
+    print("\n📍 Test 4: Per-page timeout")
+    fetcher = ReadingListFetcher(timeout=0.5)
+    start = time.perf_counter()
+    pages = list(fetch_reading_list([f"{base}/page/slow?delay={SLOW_PAGE_DELAY}",
+                                     f"{base}/page/fast?delay=0.1"], fetcher))
+    elapsed = time.perf_counter() - start
+    errors = [page for page in pages if page['error']]
+    results.append(check(len(errors) == 1 and 'timed out' in errors[0]['error'],
+                         "Slow page reported as timed out"))
+    results.append(check(elapsed < SLOW_PAGE_DELAY, f"Timeout did not wait for the slow page ({elapsed:.2f}s)"))
+
+    # Test 5: abandoned fetches must not starve the pages queued behind them
+    print("\n📍 Test 5: Trickling pages filling every worker")
+    fetcher = ReadingListFetcher(concurrency=2, per_host=4, timeout=0.5)
+    urls = [f"{base}/trickle/{i}" for i in range(4)] + [f"{base}/page/late{i}?delay=0.1" for i in range(2)]
+    start = time.perf_counter()
+    pages = list(fetch_reading_list(urls, fetcher))
+    elapsed = time.perf_counter() - start
+    late = [page for page in pages if '/late' in page['url']]
+    results.append(check(all(page['text'] for page in late),
+                         f"Pages queued behind trickling ones still load "
+                         f"({sum(1 for page in late if page['text'])}/{len(late)})"))
+    results.append(check(elapsed < SLOW_PAGE_DELAY,
+                         f"Trickling pages gave up their workers ({elapsed:.2f}s)"))
+
+    # Test 6: reading list document
+    print("\n📍 Test 6: Reading list document")
+    start = time.perf_counter()
+    document = ReadingListDocument([f"{base}/rss.xml"])
+    first_page = document.page(0)
+    first_seconds = time.perf_counter() - start
+    index = 0
+    while document.page(index) is not None:
+        index += 1
+    document.close()
+    results.append(check(first_page is not None and first_seconds < max(PAGE_DELAYS),
+                         f"First page readable after {first_seconds:.2f}s "
+                         f"(slowest page {max(PAGE_DELAYS):.2f}s)"))
+    results.append(check(index >= 1, f"Whole list read ({index} pages)"))
+
+    server.shutdown()
+    print("\n📊 FETCH TEST SUMMARY")
+    print("=" * 30)
+    print(f"{sum(results)}/{len(results)} checks passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SenTranslator TTS Backend Selector Test
+=======================================
+
+This script tests the cloud/local backend selection with stub backends:
+1. With every cloud worker held by a hung request, the local fallback
+   still answers within the latency threshold plus its own synthesis time
+2. Abandoned cloud requests keep running without delaying later phrases
+3. The 'race' policy returns local speech without waiting for the cloud
+
+No Baidu account, network access or espeak-ng is needed.
+
+Author: SenTranslator Project
+Version: 1.0.0
+"""
+
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from SenTranslator import TTS_CLOUD_WORKERS, TTSBackend, TTSBackendSelector
+
+THRESHOLD = 0.2              # Cloud latency threshold for the tests (seconds)
+LOCAL_LATENCY = 0.05         # Simulated local synthesis time
+LATENCY_BOUND = THRESHOLD + 0.5
+
+
+class HungCloudBackend(TTSBackend):
+    """Cloud stub whose requests hang until released"""
+
+    name = 'cloud'
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.started = 0
+
+    def _synthesize(self, text):
+        self.started += 1
+        self.release.wait(30)
+        return b'cloud:' + text.encode('utf-8')
+
+
+class LocalBackend(TTSBackend):
+    """Local stub with a fixed synthesis time"""
+
+    name = 'local'
+
+    def _synthesize(self, text):
+        time.sleep(LOCAL_LATENCY)
+        return b'local:' + text.encode('utf-8')
+
+
+def timed_synthesis(selector, text, policy=None):
+    """Synthesize and return (backend name, seconds)"""
+    start = time.perf_counter()
+    backend, _ = selector.synthesize(text, policy)
+    return backend.name, time.perf_counter() - start
+
+
+def check(condition, message):
+    """Print a test result"""
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+def main():
+    """Run the selector tests"""
+    print("🗣️ SenTranslator TTS Backend Selector Test")
+    print("=" * 40)
+    cloud, local = HungCloudBackend(), LocalBackend()
+    selector = TTSBackendSelector(cloud, local, policy='fallback', threshold=THRESHOLD)
+    results = []
+
+    # Test 1: phrases spoken together while every cloud worker hangs
+    print("\n📍 Test 1: Fallback with every cloud worker busy")
+    count = TTS_CLOUD_WORKERS * 2
+    with ThreadPoolExecutor(max_workers=count) as callers:
+        timings = list(callers.map(lambda i: timed_synthesis(selector, f"句子{i}"), range(count)))
+    worst = max(seconds for _, seconds in timings)
+    results.append(check(all(name == 'local' for name, _ in timings),
+                         f"All {count} phrases fell back to the local backend"))
+    results.append(check(worst < LATENCY_BOUND,
+                         f"Slowest fallback took {worst * 1000:.0f} ms (bound {LATENCY_BOUND * 1000:.0f} ms)"))
+    print(f"   Cloud requests still hanging: {cloud.started}")
+
+    # Test 2: later phrases, with the abandoned cloud requests still running
+    print("\n📍 Test 2: Later phrases")
+    timings = [timed_synthesis(selector, f"后来{i}") for i in range(3)]
+    worst = max(seconds for _, seconds in timings)
+    results.append(check(worst < LATENCY_BOUND,
+                         f"Later fallbacks not delayed by hung requests ({worst * 1000:.0f} ms)"))
+
+    # Test 3: race returns as soon as the local backend has finished
+    print("\n📍 Test 3: Race policy")
+    name, seconds = timed_synthesis(selector, "比赛", policy='race')
+    results.append(check(name == 'local' and seconds < THRESHOLD,
+                         f"Race used {name} speech after {seconds * 1000:.0f} ms"))
+
+    cloud.release.set()
+    print(f"   Stats: {selector.stats()}")
+    print("\n📊 SELECTOR TEST SUMMARY")
+    print("=" * 30)
+    print(f"{sum(results)}/{len(results)} checks passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
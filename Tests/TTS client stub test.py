@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SenTranslator TTS Client Stub Test
+==================================
+
+This script tests the long-lived Baidu TTS client against a local stub
+server that mimics the Baidu token and text2audio endpoints:
+1. Access token is fetched once and reused
+2. HTTP connections are pooled (one TCP connection for many requests)
+3. Expired tokens are refreshed and the request retried
+4. Token failures come back as error results instead of exceptions
+5. Per-request latency metrics, compared with a new client per request
+
+No Baidu account or network access is needed.
+
+Author: SenTranslator Project
+Version: 1.0.0
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from SenTranslator import BaiduTTSClient, TTS_OPTIONS
+
+STUB_HOST = '127.0.0.1'
+STUB_LATENCY = 0.02          # Simulated synthesis time in seconds
+FAKE_AUDIO = b'RIFF' + b'\0' * 2000
+
+
+class StubState:
+    """Counters shared by the stub server handlers"""
+
+    def __init__(self):
+        self.token_requests = 0
+        self.tts_requests = 0
+        self.connections = set()
+        self.valid_token = 'token-1'
+        self.lock = threading.Lock()
+
+
+class BaiduStubHandler(BaseHTTPRequestHandler):
+    """Mimics the Baidu token and text2audio endpoints"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        state = self.state
+        with state.lock:
+            state.connections.add(self.client_address)
+        length = int(self.headers.get('Content-Length', 0))
+        form = urllib.parse.parse_qs(self.rfile.read(length).decode('utf-8'))
+        path = urllib.parse.urlparse(self.path).path
+
+        if path == '/oauth/2.0/token':
+            with state.lock:
+                state.token_requests += 1
+            body = json.dumps({'access_token': state.valid_token, 'expires_in': 2592000})
+            self.send_body(200, 'application/json', body.encode())
+
+        elif path == '/text2audio':
+            with state.lock:
+                state.tts_requests += 1
+            if form.get('tok', [''])[0] != state.valid_token:
+                body = json.dumps({'err_no': 502, 'err_msg': 'access token invalid'})
+                self.send_body(200, 'application/json', body.encode())
+                return
+            text = urllib.parse.unquote_plus(form.get('tex', [''])[0])
+            time.sleep(STUB_LATENCY)
+            self.send_body(200, 'audio/wav', FAKE_AUDIO + text.encode('utf-8'))
+
+        else:
+            self.send_body(404, 'application/json', b'{}')
+
+
+def start_stub_server():
+    """Start the stub server on a free port"""
+    state = StubState()
+    handler = type('Handler', (BaiduStubHandler,), {'state': state})
+    server = ThreadingHTTPServer((STUB_HOST, 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def make_client(server):
+    """Create a TTS client pointing at the stub server"""
+    base = f"http://{STUB_HOST}:{server.server_address[1]}"
+    return BaiduTTSClient('stub-key', 'stub-secret',
+                          token_url=f"{base}/oauth/2.0/token",
+                          tts_url=f"{base}/text2audio")
+
+
+def check(condition, message):
+    """Print a test result"""
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+def main():
+    """Run the stub tests"""
+    print("🗣️ SenTranslator TTS Client Stub Test")
+    print("=" * 40)
+    server, state = start_stub_server()
+    results = []
+
+    # Test 1: token reuse and connection pooling
+    print("\n📍 Test 1: Long-lived client")
+    client = make_client(server)
+    start = time.perf_counter()
+    for i in range(20):
+        audio = client.synthesis(f"测试{i}", 'zh', 1, TTS_OPTIONS)
+    reused_time = time.perf_counter() - start
+    results.append(check(isinstance(audio, bytes) and audio.endswith("测试19".encode()),
+                         "Synthesis returns audio data"))
+    results.append(check(state.token_requests == 1,
+                         f"Access token fetched once ({state.token_requests} token requests)"))
+    results.append(check(len(state.connections) == 1,
+                         f"One pooled connection for 21 requests ({len(state.connections)} used)"))
+    print(f"   Metrics: {client.metrics()}")
+
+    # Test 2: expired token is refreshed and the request retried
+    print("\n📍 Test 2: Token refresh")
+    state.valid_token = 'token-2'
+    audio = client.synthesis("刷新", 'zh', 1, TTS_OPTIONS)
+    results.append(check(isinstance(audio, bytes), "Request succeeds after token refresh"))
+    results.append(check(client.metrics()['token_fetches'] == 2, "Token fetched again only once"))
+
+    # Test 3: token endpoint failures
+    print("\n📍 Test 3: Token failures")
+    base = f"http://{STUB_HOST}:{server.server_address[1]}"
+    broken = BaiduTTSClient('stub-key', 'stub-secret', token_url=f"{base}/missing",
+                            tts_url=f"{base}/text2audio")
+    result = broken.synthesis("测试", 'zh', 1, TTS_OPTIONS)
+    results.append(check(isinstance(result, dict) and result.get('error_code') == 404,
+                         f"Token HTTP error returned as a result ({result.get('error_code')})"))
+    unreachable = BaiduTTSClient('stub-key', 'stub-secret', token_url=f"http://{STUB_HOST}:9/token",
+                                 tts_url=f"{base}/text2audio")
+    result = unreachable.synthesis("测试", 'zh', 1, TTS_OPTIONS)
+    results.append(check(isinstance(result, dict) and result.get('error_code') == 'network',
+                         "Unreachable token endpoint returned as a network error"))
+
+    # Test 4: compare with a new client per request (the old behaviour)
+    print("\n📍 Test 4: New client per request")
+    state.connections.clear()
+    start = time.perf_counter()
+    for i in range(20):
+        make_client(server).synthesis(f"测试{i}", 'zh', 1, TTS_OPTIONS)
+    fresh_time = time.perf_counter() - start
+    print(f"   Long-lived client: {reused_time * 50:.1f} ms per request")
+    print(f"   New client each time: {fresh_time * 50:.1f} ms per request "
+          f"({len(state.connections)} connections)")
+
+    server.shutdown()
+    print("\n📊 STUB TEST SUMMARY")
+    print("=" * 30)
+    print(f"{sum(results)}/{len(results)} checks passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SenTranslator Translation Service Load Test
+===========================================
+
+This script load-tests the local HTTP translation service:
+1. Opens one keep-alive connection per client thread
+2. Sends translation requests for a fixed duration
+3. Reports requests/sec and p50/p99 latency
+
+Start the service first:
+    python3 SenTranslator.py --serve
+
+Author: SenTranslator Project
+Version: 1.0.0
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+
+# Service address from main code
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+
+# Sample texts (mixed Chinese, English, numbers and punctuation)
+SAMPLE_TEXTS = [
+    "今天天气很好，我们一起去公园散步吧。",
+    "SenTranslator让视障人士也能阅读网页和书籍！",
+    "第3章：盲文是由6个点组成的触觉文字系统。",
+    "Hello world 2025，你好世界。"
+]
+
+
+class LoadTester:
+    """Translation service load testing class"""
+
+    def __init__(self, host, port, endpoint, batch_size):
+        self.host = host
+        self.port = port
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.latencies = []
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def build_body(self, index):
+        """Build the JSON request body for the selected endpoint"""
+        if self.endpoint == '/translate':
+            payload = {'text': SAMPLE_TEXTS[index % len(SAMPLE_TEXTS)]}
+        else:
+            payload = {'texts': [SAMPLE_TEXTS[(index + i) % len(SAMPLE_TEXTS)]
+                                 for i in range(self.batch_size)]}
+        return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+    def client_worker(self, deadline):
+        """Send requests over one keep-alive connection until the deadline"""
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        latencies = []
+        errors = 0
+        index = 0
+
+        while time.monotonic() < deadline:
+            body = self.build_body(index)
+            index += 1
+            start = time.perf_counter()
+            try:
+                connection.request('POST', self.endpoint, body=body, headers={
+                    'Content-Type': 'application/json'
+                })
+                response = connection.getresponse()
+                response.read()
+                if response.status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+
+        connection.close()
+        with self.lock:
+            self.latencies.extend(latencies)
+            self.errors += errors
+
+    def run(self, clients, duration):
+        """Run the load test and print a summary"""
+        print(f"\n🚀 Load testing http://{self.host}:{self.port}{self.endpoint}")
+        print(f"   {clients} keep-alive clients for {duration:.0f}s")
+
+        deadline = time.monotonic() + duration
+        threads = [threading.Thread(target=self.client_worker, args=(deadline,))
+                   for _ in range(clients)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        self.print_summary(elapsed)
+
+    def print_summary(self, elapsed):
+        """Print throughput and latency percentiles"""
+        print("\n📊 LOAD TEST SUMMARY")
+        print("=" * 30)
+
+        if not self.latencies:
+            print(f"❌ No successful requests ({self.errors} errors)")
+            print("   Is the service running? python3 SenTranslator.py --serve")
+            return
+
+        latencies = sorted(self.latencies)
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        print(f"Requests:      {len(latencies)} ok, {self.errors} errors")
+        print(f"Throughput:    {len(latencies) / elapsed:.1f} requests/sec")
+        print(f"Latency p50:   {cuts[49] * 1000:.2f} ms")
+        print(f"Latency p99:   {cuts[98] * 1000:.2f} ms")
+        print(f"Latency max:   {latencies[-1] * 1000:.2f} ms")
+
+
+def main():
+    """Main load testing interface"""
+    parser = argparse.ArgumentParser(description="SenTranslator translation service load test")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--clients', type=int, default=8, help="concurrent keep-alive clients")
+    parser.add_argument('--duration', type=float, default=10.0, help="test duration in seconds")
+    parser.add_argument('--endpoint', default='/translate',
+                        choices=['/translate', '/translate/batch', '/translate/stream'])
+    parser.add_argument('--batch-size', type=int, default=8,
+                        help="texts per request for batch and stream endpoints")
+    args = parser.parse_args()
+
+    print("🎯 SenTranslator Translation Service Load Test")
+    print("=" * 45)
+
+    try:
+        tester = LoadTester(args.host, args.port, args.endpoint, args.batch_size)
+        tester.run(args.clients, args.duration)
+    except KeyboardInterrupt:
+        print("\n🛑 Load test interrupted")
+
+
+if __name__ == '__main__':
+    main()